@@ -6,39 +6,57 @@ Prints excluded chunks (with which marker type triggered) and a sample of
 kept chunks, so you can confirm it catches biographical/editorial text
 without discarding real philosophy.
 
+Chunks are read from the Parquet store (stoic_llm.data.store), which
+holds each chunk's filter hits and verdict; new or changed chunk files
+are ingested (and scanned) first. "all" prints per-file counts and the
+most frequent hits for every author.
+
 Run: python scripts/audit_filter.py marcus_aurelius
+     python scripts/audit_filter.py all
 """
 
 import sys
-import json
-from pathlib import Path
-from stoic_llm.data.pair_generator import NeutralPairCreator
-from stoic_llm.config import CHUNKED_DIR  # adjust to where chunked files live
+from collections import Counter
+from stoic_llm.data.store import DatasetStore
 
 author = sys.argv[1] if len(sys.argv) > 1 else "epictetus"
 
-# Map author dir-name -> display name (for the surname check in the filter)
-DISPLAY = {
-    "marcus_aurelius": "Marcus Aurelius",
-    "seneca": "Seneca",
-    "epictetus": "Epictetus",
-}
-
-# Build the creator just to reuse its filter logic — no API key needed,
-# since we never call generate_neutral_text.
-chunks_file = CHUNKED_DIR / author / "enchiridion.json"  # adjust filename
-if not chunks_file.exists():
-    chunks_file = CHUNKED_DIR / f"{author}_chunks.json"
-
-creator = NeutralPairCreator(
-    chunks_file=str(chunks_file),
-    author_name=DISPLAY.get(author, author),
-    api_key="not-needed-for-filtering",
-)
+MIN_CHARS, MAX_CHARS = 150, 1000  # match your create_pairs defaults
 
-chunks = creator.read_chunks()["chunks"]
 
-MIN_CHARS, MAX_CHARS = 150, 1000  # match your create_pairs defaults
+def format_hits(hits):
+    by_cat = {}
+    for hit in hits:
+        cat, _, h = hit.partition(":")
+        by_cat.setdefault(cat, []).append(h)
+    return "; ".join(f"{cat}: {', '.join(h)}" for cat, h in by_cat.items())
+
+
+store = DatasetStore()
+store.sync()
+in_range = [("n_chars", ">=", MIN_CHARS), ("n_chars", "<=", MAX_CHARS)]
+
+if author == "all":
+    table = store.chunks(
+        in_range, columns=["author", "source", "filter_hits", "non_philosophical"]
+    ).to_pylist()
+    by_file = {}
+    for row in table:
+        by_file.setdefault(f"{row['author']}/{row['source']}", []).append(row)
+
+    print(f"\n{'='*70}\nFILTER AUDIT — all authors ({MIN_CHARS}-{MAX_CHARS} chars)\n{'='*70}")
+    print(f"  {'file':<40} {'chunks':>7} {'excluded':>9}")
+    for key, rows in sorted(by_file.items()):
+        n_excluded = sum(r["non_philosophical"] for r in rows)
+        print(f"  {key:<40} {len(rows):>7} {n_excluded:>9}")
+        top = Counter(h for r in rows for h in r["filter_hits"]).most_common(5)
+        if top:
+            print("      top hits: " + ", ".join(f"{h} ({n})" for h, n in top))
+    sys.exit(0)
+
+chunks = store.chunks([("author", "=", author)]).to_pylist()
+if not chunks:
+    sys.exit(f"⚠ {author}: no chunks in the store (run scripts/chunk_generator.py)")
 
 excluded = []
 kept = []
@@ -46,15 +64,14 @@ too_short = []
 too_long = []
 
 for c in chunks:
-    text = c["text"]
-    n = len(text)
+    n = c["n_chars"]
     if n < MIN_CHARS:
         too_short.append(c)
         continue
     if n > MAX_CHARS:
         too_long.append(c)
         continue
-    if creator._is_non_philosophical(text):
+    if c["non_philosophical"]:
         excluded.append(c)
     else:
         kept.append(c)
@@ -74,6 +91,7 @@ print(f"  KEPT              : {len(kept)}")
 print(f"\n{'='*70}\nEXCLUDED CHUNKS (verify these are all junk)\n{'='*70}")
 for c in excluded:
     print(f"\n--- id {c['id']} ({len(c['text'])} chars) " + "-" * 40)
+    print(f"    [{format_hits(c['filter_hits'])}]")
     print(c["text"][:300])
 
 # ---- Sample of kept chunks — confirm real philosophy survived ----
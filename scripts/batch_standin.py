@@ -0,0 +1,152 @@
+"""
+scripts/batch_standin.py — local stand-in for the Message Batches API
+
+Mimics the batch lifecycle (create -> in_progress for a few polls ->
+ended -> JSONL results) with canned responses, so the batch backends of
+NeutralPairCreator and StoicJudge can be exercised end to end without an
+API key or cost. Batches live in memory; restarting the server loses them.
+
+Judge rubric prompts get a fixed JSON score object; anything else gets a
+short deterministic "neutral" rewrite. --error-every N makes every Nth
+request come back errored, to exercise retry-on-next-run paths.
+
+Usage:
+  python scripts/batch_standin.py --port 8765 --ticks 2
+  ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=test \\
+      python scripts/generate_pairs.py --batch
+"""
+
+import argparse
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCORES = {
+    "philosophical_depth": 4,
+    "stoic_alignment": 4,
+    "coherence": 5,
+    "stylistic_authenticity": 3,
+    "reasoning": "stand-in score",
+}
+
+
+def canned_response(params):
+    prompt = params["messages"][-1]["content"]
+    if "Score the following text" in prompt:
+        return json.dumps(SCORES)
+    words = re.findall(r"\w+", prompt)[-12:]
+    return "A plain restatement: " + " ".join(words)
+
+
+def make_handler(batches, ticks, error_every):
+    def now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def batch_object(host, batch):
+        ended = batch["polls"] >= ticks
+        n = len(batch["requests"])
+        errored = sum(1 for i in range(n) if error_every and (i + 1) % error_every == 0)
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else n,
+                "succeeded": n - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": batch["created_at"],
+            "expires_at": batch["created_at"],
+            "ended_at": now() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"http://{host}/v1/messages/batches/{batch['id']}/results" if ended else None
+            ),
+        }
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code, body, content_type="application/json"):
+            data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("content-type", content_type)
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/v1/messages/batches":
+                return self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+            batch = {
+                "id": f"msgbatch_{uuid.uuid4().hex[:20]}",
+                "requests": body["requests"],
+                "polls": 0,
+                "created_at": now(),
+            }
+            batches[batch["id"]] = batch
+            self._send(200, batch_object(self.headers["host"], batch))
+
+        def do_GET(self):
+            m = re.fullmatch(r"/v1/messages/batches/([\w-]+)(/results)?", self.path.split("?")[0])
+            if not m or m.group(1) not in batches:
+                return self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            batch = batches[m.group(1)]
+            if not m.group(2):
+                batch["polls"] += 1
+                return self._send(200, batch_object(self.headers["host"], batch))
+
+            lines = []
+            for i, req in enumerate(batch["requests"]):
+                if error_every and (i + 1) % error_every == 0:
+                    result = {
+                        "type": "errored",
+                        "error": {"type": "error", "error": {"type": "overloaded_error", "message": "stand-in overload"}},
+                    }
+                else:
+                    result = {
+                        "type": "succeeded",
+                        "message": {
+                            "id": f"msg_{uuid.uuid4().hex[:20]}",
+                            "type": "message",
+                            "role": "assistant",
+                            "model": req["params"]["model"],
+                            "content": [{"type": "text", "text": canned_response(req["params"])}],
+                            "stop_reason": "end_turn",
+                            "stop_sequence": None,
+                            "usage": {"input_tokens": 1, "output_tokens": 1},
+                        },
+                    }
+                lines.append(json.dumps({"custom_id": req["custom_id"], "result": result}))
+            self._send(200, "\n".join(lines) + "\n", "application/binary")
+
+    return Handler
+
+
+def serve(port=8765, ticks=2, error_every=0):
+    """Start the stand-in; returns the server (call .shutdown() to stop)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler({}, ticks, error_every))
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Message Batches stand-in.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ticks", type=int, default=2, help="Polls before a batch ends.")
+    parser.add_argument("--error-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.ticks, args.error_every)
+    print(f"Batch stand-in on http://127.0.0.1:{server.server_port} (ticks={args.ticks})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
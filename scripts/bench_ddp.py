@@ -0,0 +1,52 @@
+"""
+scripts/bench_ddp.py — CPU data-parallel LoRA scaling benchmark
+
+Trains one author for a fixed number of steps at 1, 2, 4 and 8 gloo
+workers (each pinned to its own core slice) and prints real tokens/sec,
+speedup and parallel efficiency. Worker counts above the core count are
+skipped. Writes to a scratch output dir so the real adapters are not
+overwritten.
+
+Note: every worker holds its own copy of the base model.
+
+Usage:
+  python scripts/bench_ddp.py                      # 1B, seneca, 20 steps
+  python scripts/bench_ddp.py 3B epictetus 10
+"""
+
+import sys
+from stoic_llm.lora.distributed import available_cores
+from stoic_llm.lora.trainer import LoRATrainer
+from stoic_llm.config import MODELS_DIR
+
+
+def main():
+    model_size = sys.argv[1] if len(sys.argv) > 1 else "1B"
+    author = sys.argv[2] if len(sys.argv) > 2 else "seneca"
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    n_cores = len(available_cores())
+    trainer = LoRATrainer(model_size=model_size, output_dir=MODELS_DIR / "_bench")
+
+    reports = {}
+    for workers in (1, 2, 4, 8):
+        if workers > n_cores:
+            print(f"Skipping {workers} workers: only {n_cores} cores available")
+            continue
+        reports[workers] = trainer.train_author_ddp(
+            author, num_workers=workers, max_steps=steps
+        )
+
+    print(f"\n{'='*60}\nDDP SCALING — {author} ({model_size}, {steps} steps, {n_cores} cores)\n{'='*60}")
+    print(f"  {'workers':>7} {'threads':>8} {'tokens/sec':>11} {'speedup':>8} {'efficiency':>11}")
+    base = reports[1]["tokens_per_sec"]
+    for workers, r in reports.items():
+        speedup = r["tokens_per_sec"] / base
+        print(
+            f"  {workers:>7} {r['threads']:>8} {r['tokens_per_sec']:>11.0f} "
+            f"{speedup:>7.2f}x {speedup / workers:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
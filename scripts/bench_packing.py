@@ -0,0 +1,35 @@
+"""
+scripts/bench_packing.py — padded vs packed LoRA training throughput
+
+Trains a few steps per mode on one author and prints pad-token fraction
+and real tokens/sec side by side. Writes to a scratch output dir so the
+real adapters are not overwritten.
+
+Usage:
+  python scripts/bench_packing.py                  # 1B, seneca, 20 steps
+  python scripts/bench_packing.py 3B epictetus 10
+"""
+
+import sys
+from stoic_llm.lora.trainer import LoRATrainer
+from stoic_llm.config import MODELS_DIR
+
+model_size = sys.argv[1] if len(sys.argv) > 1 else "1B"
+author = sys.argv[2] if len(sys.argv) > 2 else "seneca"
+steps = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+trainer = LoRATrainer(model_size=model_size, output_dir=MODELS_DIR / "_bench")
+
+reports = {}
+for packed in (False, True):
+    reports[packed] = trainer.train_author(author, packed=packed, max_steps=steps)
+
+print(f"\n{'='*60}\nPACKING BENCHMARK — {author} ({model_size}, {steps} steps)\n{'='*60}")
+print(f"  {'mode':<8} {'pad fraction':>13} {'tokens/sec':>11}")
+for packed, r in reports.items():
+    print(
+        f"  {'packed' if packed else 'padded':<8} {r['pad_fraction']:>13.1%} "
+        f"{r['tokens_per_sec']:>11.0f}"
+    )
+speedup = reports[True]["tokens_per_sec"] / reports[False]["tokens_per_sec"]
+print(f"\n  packed / padded throughput: {speedup:.2f}x")
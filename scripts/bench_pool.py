@@ -0,0 +1,90 @@
+"""
+scripts/bench_pool.py — shared-weight model pool scaling benchmark
+
+Loads the model ONCE, then runs the same workload at 1, 2, 4 and 8
+SharedModelPool workers (each pinned to its own core slice) and prints
+throughput, speedup, parallel efficiency and per-worker private memory.
+A worker's private memory should stay far below the model size, because
+the weights are shared, not copied. Worker counts above the core count
+are skipped.
+
+Workloads:
+  extract    activations at 3 layers for every text of an author's pairs
+  dilemma    unsteered p_stoic for every dilemma, 4 dilemmas per task
+
+Usage:
+  python scripts/bench_pool.py                    # 1B, extract, seneca
+  python scripts/bench_pool.py 3B dilemma
+"""
+
+import sys
+import time
+from stoic_llm.config import PROCESSED_DIR
+from stoic_llm.data.store import read_pairs
+from stoic_llm.eval.dilemma import DilemmaEval
+from stoic_llm.lora.distributed import available_cores
+from stoic_llm.model import ModelLoader
+from stoic_llm.model_pool import SharedModelPool, dilemma_task, extract_task
+
+
+def workload(name, model, tokenizer, author="seneca"):
+    """(task fn, items, kwargs) for one workload."""
+    if name == "extract":
+        pairs = read_pairs(PROCESSED_DIR / author / "neutral_pairs.json")
+        texts = [t for p in pairs for t in (p["stoic_text"], p["neutral_text"])]
+        return extract_task, texts, {"layers": [4, 8, 12]}
+    if name == "dilemma":
+        dilemmas = DilemmaEval(model, tokenizer).dilemmas
+        batches = [dilemmas[i : i + 4] for i in range(0, len(dilemmas), 4)]
+        return dilemma_task, batches, {}
+    raise ValueError(f"Unknown workload {name!r}. Use 'extract' or 'dilemma'.")
+
+
+def main():
+    model_size = sys.argv[1] if len(sys.argv) > 1 else "1B"
+    name = sys.argv[2] if len(sys.argv) > 2 else "extract"
+
+    n_cores = len(available_cores())
+    model, tokenizer = ModelLoader(model_size).load()
+    model_mb = sum(p.numel() * p.element_size() for p in model.parameters()) / 2**20
+    fn, items, kwargs = workload(name, model, tokenizer)
+
+    reports = {}
+    for workers in (1, 2, 4, 8):
+        if workers > n_cores:
+            print(f"Skipping {workers} workers: only {n_cores} cores available")
+            continue
+        with SharedModelPool(model, tokenizer, num_workers=workers) as pool:
+            pool.map(fn, items[:workers], **kwargs)  # warm-up
+            t0 = time.time()
+            pool.map(fn, items, **kwargs)
+            elapsed = time.time() - t0
+            memory = pool.memory()
+            threads = pool.info[0]["threads"]
+        private = [m["private_mb"] for rank, m in memory.items() if rank != "parent" and m]
+        reports[workers] = {
+            "items_per_sec": len(items) / elapsed,
+            "threads": threads,
+            "private_mb": max(private) if private else None,
+        }
+
+    print(
+        f"\n{'='*60}\nPOOL SCALING — {name} ({model_size}, {len(items)} tasks, "
+        f"{n_cores} cores, weights {model_mb:.0f} MB)\n{'='*60}"
+    )
+    print(
+        f"  {'workers':>7} {'threads':>8} {'tasks/sec':>10} {'speedup':>8} "
+        f"{'efficiency':>11} {'private MB/worker':>18}"
+    )
+    base = reports[1]["items_per_sec"]
+    for workers, r in reports.items():
+        speedup = r["items_per_sec"] / base
+        private = f"{r['private_mb']:.0f}" if r["private_mb"] is not None else "n/a"
+        print(
+            f"  {workers:>7} {r['threads']:>8} {r['items_per_sec']:>10.2f} "
+            f"{speedup:>7.2f}x {speedup / workers:>10.0%} {private:>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+scripts/build_store.py — mirror chunk and pair JSON files into the Parquet store
+
+Ingests every chunk file under data/chunked and every neutral_pairs*.json
+under data/processed that is new or changed since its last ingest (see
+stoic_llm.data.store), then prints row counts per author.
+
+Usage:
+  python scripts/build_store.py
+  python scripts/build_store.py --force     # re-ingest everything
+"""
+
+import argparse
+from collections import Counter
+from stoic_llm.data.store import DatasetStore
+
+parser = argparse.ArgumentParser(description="Build/refresh the Parquet dataset store.")
+parser.add_argument("--force", action="store_true", help="Re-ingest current files too.")
+args = parser.parse_args()
+
+store = DatasetStore()
+result = store.sync(force=args.force)
+print(f"✅ {len(result['ingested'])} files ingested, {result['current']} already current -> {store.root}")
+
+chunks = store.chunks(columns=["author", "non_philosophical"]).to_pylist()
+pairs = store.pairs(columns=["author", "status"]).to_pylist()
+n_chunks = Counter(r["author"] for r in chunks)
+n_flagged = Counter(r["author"] for r in chunks if r["non_philosophical"])
+n_pairs = Counter((r["author"], r["status"]) for r in pairs)
+
+print(f"\n  {'author':<18}{'chunks':>8}{'flagged':>9}{'raw':>7}{'clean':>7}{'rejected':>10}")
+for author in sorted(set(n_chunks) | {a for a, _ in n_pairs}):
+    print(
+        f"  {author:<18}{n_chunks[author]:>8}{n_flagged[author]:>9}"
+        f"{n_pairs[author, 'raw']:>7}{n_pairs[author, 'clean']:>7}{n_pairs[author, 'rejected']:>10}"
+    )
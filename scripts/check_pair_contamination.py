@@ -1,7 +1,7 @@
-import json
-import re
 from pathlib import Path
 from stoic_llm.config import PROCESSED_DIR  # adjust if your pairs live elsewhere
+from stoic_llm.data.store import read_pairs
+from stoic_llm.data.markers import MarkerMatcher
 
 # Markers grouped by failure type (lowercased matching)
 PREAMBLE = [
@@ -36,11 +36,8 @@ REFUSAL_META = [
 
 AUTHORS = ["marcus_aurelius", "seneca", "epictetus"]
 
-
-def find_markers(text: str, markers: list) -> list:
-    """Return which markers appear in text (lowercased substring match)."""
-    t = text.lower()
-    return [m for m in markers if m in t]
+# Both lists in one lowercased single-pass matcher.
+MATCHER = MarkerMatcher({"preamble": PREAMBLE, "refusal": REFUSAL_META}, ignore_case=True)
 
 
 def check_author(author: str) -> dict:
@@ -52,8 +49,7 @@ def check_author(author: str) -> dict:
         print(f"⚠ {author}: no neutral_pairs.json found (looked in {path})")
         return {}
 
-    with open(path) as f:
-        pairs = json.load(f).get("pairs", [])
+    pairs = read_pairs(path)
 
     total = len(pairs)
     preamble_hits = []
@@ -62,8 +58,8 @@ def check_author(author: str) -> dict:
 
     for p in pairs:
         neutral = p.get("neutral_text", "")
-        pre = find_markers(neutral, PREAMBLE)
-        ref = find_markers(neutral, REFUSAL_META)
+        hits = MATCHER.scan(neutral)
+        pre, ref = hits["preamble"], hits["refusal"]
         if pre:
             preamble_hits.append((p.get("id", "?"), pre, neutral[:80]))
         if ref:
@@ -1,3 +1,18 @@
+"""
+scripts/chunk_generator.py — paragraph chunks for every author
+
+Streams each processed book into CHUNKED_DIR/<author>/<book>.jsonl, one
+process per book. With --max-tokens, paragraphs are merged/split at
+sentence boundaries into chunks of --min-tokens..--max-tokens tokens of
+the model's tokenizer, each recording its "n_tokens".
+
+Usage:
+  python scripts/chunk_generator.py                       # one chunk per paragraph
+  python scripts/chunk_generator.py --max-tokens 384      # token-budget chunks
+  python scripts/chunk_generator.py --format json         # legacy single-document .json
+"""
+
+import argparse
 from stoic_llm.data.processor import TextProcessor
 from stoic_llm.config import PROCESSED_DIR
 
@@ -7,11 +22,31 @@ FILES = {
     "epictetus": "enchiridion.txt",
 }
 
+parser = argparse.ArgumentParser(description="Chunk processed books.")
+parser.add_argument("--format", choices=["jsonl", "json"], default="jsonl")
+parser.add_argument("--workers", type=int, default=None)
+parser.add_argument("--max-tokens", type=int, default=None)
+parser.add_argument("--min-tokens", type=int, default=128)
+parser.add_argument("--model", default="1B", help="Model size whose tokenizer to use.")
+args = parser.parse_args()
+
+token_budget = None
+if args.max_tokens:
+    from stoic_llm.model import MODELS
+
+    token_budget = {
+        "model_name": MODELS[args.model]["name"],
+        "min_tokens": args.min_tokens,
+        "max_tokens": args.max_tokens,
+    }
+
+paths = []
 for author, filename in FILES.items():
     path = PROCESSED_DIR / author / filename
     if not path.exists():
         print(f"⚠ {author}: {path} not found — skipping")
         continue
-    print(f"\nChunking {author} from {path.name}...")
-    processor = TextProcessor(text_path=str(path))
-    processor.chunk_by_paragraph()
+    paths.append(path)
+
+print(f"\nChunking {len(paths)} files ({args.format})...")
+TextProcessor().chunk_files(paths, fmt=args.format, workers=args.workers, token_budget=token_budget)
@@ -4,8 +4,12 @@ scripts/clean_pairs.py — strip preamble, drop refusals, sample for review
 For each philosopher's neutral_pairs.json:
   1. Strip leading chat preamble from neutral_text ("Here's the modern rewrite:", etc.)
   2. Quarantine refusal/meta pairs into a separate _rejected.json for audit
-  3. Write cleaned pairs to _clean.json
-  4. Print a random sample of N cleaned pairs for manual reasoning-vs-style scoring
+  3. Quarantine pairs whose stoic_text near-duplicates an earlier pair's
+     (MinHash LSH, Jaccard >= DEDUP_THRESHOLD); clusters go to
+     pair_dedup_report.json
+  4. Write cleaned pairs to _clean.json (and both outputs to the Parquet
+     store, stoic_llm.data.store)
+  5. Print a random sample of N cleaned pairs for manual reasoning-vs-style scoring
 
 Does NOT regenerate or call any API. Pure local post-processing.
 Originals are never overwritten — outputs go to new files.
@@ -14,10 +18,12 @@ Run: python scripts/clean_pairs.py
 """
 
 import json
-import re
 import random
 from pathlib import Path
-from stoic_llm.config import PROCESSED_DIR  # adjust if needed
+from stoic_llm.config import DEDUP_THRESHOLD, PROCESSED_DIR  # adjust if needed
+from stoic_llm.data.dedup import MinHashDeduper
+from stoic_llm.data.store import DatasetStore, read_pairs
+from stoic_llm.data.markers import MarkerMatcher, strip_leading
 
 AUTHORS = ["marcus_aurelius", "seneca", "epictetus"]
 SAMPLE_N = 15
@@ -58,26 +64,18 @@ REFUSAL_MARKERS = [
     "provide an actual",
 ]
 
+REFUSAL = MarkerMatcher({"refusal": REFUSAL_MARKERS}, ignore_case=True)
+
 
 def strip_preamble(text: str) -> tuple[str, bool]:
     """Remove leading chat preamble. Returns (cleaned, was_stripped).
     Applies patterns repeatedly in case of stacked preamble + blank lines."""
-    original = text
-    t = text.lstrip()
-    changed = True
-    while changed:
-        changed = False
-        for pat in PREAMBLE_PATTERNS:
-            new = re.sub(pat, "", t, count=1, flags=re.IGNORECASE)
-            if new != t:
-                t = new.lstrip()
-                changed = True
-    return t, (t != original.lstrip())
+    t = strip_leading(text, PREAMBLE_PATTERNS)
+    return t, (t != text.lstrip())
 
 
 def is_refusal(text: str) -> bool:
-    t = text.lower()
-    return any(m in t for m in REFUSAL_MARKERS)
+    return bool(REFUSAL.scan(text)["refusal"])
 
 
 def process_author(author: str) -> dict:
@@ -88,8 +86,7 @@ def process_author(author: str) -> dict:
         print(f"⚠ {author}: no neutral_pairs.json found")
         return {}
 
-    with open(path) as f:
-        pairs = json.load(f).get("pairs", [])
+    pairs = read_pairs(path)
 
     clean, rejected = [], []
     stripped_count = 0
@@ -114,6 +111,18 @@ def process_author(author: str) -> dict:
 
         clean.append({**p, "neutral_text": cleaned})
 
+    # Near-duplicate stoic texts would count the same passage twice in the
+    # steering-vector mean — keep the first, quarantine the rest.
+    dedup_path = path.parent / "pair_dedup_report.json"
+    deduped, report = MinHashDeduper(threshold=DEDUP_THRESHOLD).dedup(
+        clean, text_key="stoic_text", report_path=dedup_path
+    )
+    for cluster in report["clusters"]:
+        for d in cluster["dropped"]:
+            reason = f"near-duplicate of id {cluster['kept']['id']} (jaccard {d['jaccard']})"
+            rejected.append({**clean[d["index"]], "_reject_reason": reason})
+    clean = deduped
+
     # Write outputs (never overwrite original)
     out_dir = path.parent
     clean_path = out_dir / "neutral_pairs_clean.json"
@@ -122,6 +131,9 @@ def process_author(author: str) -> dict:
         json.dump(clean, f, indent=2, ensure_ascii=False)
     with open(reject_path, "w") as f:
         json.dump(rejected, f, indent=2, ensure_ascii=False)
+    store = DatasetStore()
+    store.ingest_pairs(clean_path)
+    store.ingest_pairs(reject_path)
 
     return {
         "author": author,
@@ -129,6 +141,7 @@ def process_author(author: str) -> dict:
         "clean": len(clean),
         "rejected": len(rejected),
         "stripped": stripped_count,
+        "duplicates": report["n_dropped"],
         "clean_pairs": clean,
         "clean_path": str(clean_path),
         "reject_path": str(reject_path),
@@ -160,7 +173,8 @@ def main():
         print(f"\n{author}:")
         print(f"  total       : {r['total']}")
         print(f"  preamble stripped : {r['stripped']}")
-        print(f"  rejected (refusal/empty): {r['rejected']}  → {r['reject_path']}")
+        print(f"  rejected (refusal/empty/duplicate): {r['rejected']}  → {r['reject_path']}")
+        print(f"  near-duplicates   : {r['duplicates']}")
         print(f"  clean kept  : {r['clean']}  → {r['clean_path']}")
         summary.append(r)
 
@@ -2,37 +2,58 @@
 scripts/extract_vectors.py — Extract steering vectors
 
 Usage:
-  python scripts/extract_vectors.py          # defaults to 1B
-  python scripts/extract_vectors.py 3B       # uses 3B
+  python scripts/extract_vectors.py                # defaults to 1B
+  python scripts/extract_vectors.py 3B             # uses 3B
+  python scripts/extract_vectors.py 3B --workers 4 # forward passes over 4
+                                                   # workers sharing one copy
+                                                   # of the weights
 """
 
 import sys
 from stoic_llm.model import ModelLoader
+from stoic_llm.model_pool import SharedModelPool
 from stoic_llm.steering.extractor import ActivationExtractor
 from stoic_llm.config import PROCESSED_DIR, VECTORS_DIR
 
-model_size = sys.argv[1] if len(sys.argv) > 1 else "1B"
-
 CANDIDATE_LAYERS = {
     "1B": [4, 6, 8, 10, 12, 14],
     "3B": [4, 8, 12, 16, 20, 24, 26],
 }
-layers = CANDIDATE_LAYERS[model_size]
 
-loader = ModelLoader(model_size)
-model, tokenizer = loader.load()
-extractor = ActivationExtractor(model, tokenizer)
 
-for author in ["marcus_aurelius", "seneca", "epictetus"]:
-    print(f"\n{'='*60}")
-    print(f"Extracting steering vector for {author} ({model_size})")
-    print(f"{'='*60}")
+def main():
+    args = sys.argv[1:]
+    workers = 1
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i : i + 2]
+    model_size = args[0] if args else "1B"
+    layers = CANDIDATE_LAYERS[model_size]
+
+    loader = ModelLoader(model_size)
+    model, tokenizer = loader.load()
+    extractor = ActivationExtractor(model, tokenizer)
+    pool = SharedModelPool(model, tokenizer, num_workers=workers).start() if workers > 1 else None
+
+    try:
+        for author in ["marcus_aurelius", "seneca", "epictetus"]:
+            print(f"\n{'='*60}")
+            print(f"Extracting steering vector for {author} ({model_size})")
+            print(f"{'='*60}")
+
+            pairs_file = PROCESSED_DIR / author / "neutral_pairs.json"
+            output_file = VECTORS_DIR / f"{author}_steering_{model_size}.pt"
+            vectors = extractor.compute_layered_steering_vectors(str(pairs_file), layers, pool=pool)
+            extractor.save_steering_vectors(vectors, output_file)
+
+            print(f"✓ Saved to {output_file}")
+    finally:
+        if pool is not None:
+            pool.close()
 
-    pairs_file = PROCESSED_DIR / author / "neutral_pairs.json"
-    output_file = VECTORS_DIR / f"{author}_steering_{model_size}.pt"
-    vectors = extractor.compute_layered_steering_vectors(str(pairs_file), layers)
-    extractor.save_steering_vectors(vectors, output_file)
+    print("\nDone! All steering vectors extracted.")
 
-    print(f"✓ Saved to {output_file}")
 
-print("\nDone! All steering vectors extracted.")
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,45 @@
+"""
+scripts/file_downloader.py — fetch and clean every source in sources.json
+
+Downloads run concurrently and conditionally (ETag / If-Modified-Since,
+then a content hash), and clean_gutenberg only runs for sources whose raw
+text changed. With --chunk, only the re-cleaned books are re-chunked.
+
+Usage:
+  python scripts/file_downloader.py
+  python scripts/file_downloader.py --chunk      # also re-chunk changed books
+  python scripts/file_downloader.py --force      # re-download and re-clean all
+"""
+
+import argparse
 import json
-from stoic_llm.data.downloader import TextDownloader
+from stoic_llm.data.downloader import sync_sources
 from stoic_llm.config import DATA_DIR  # adjust if sources.json lives elsewhere
 
 SOURCES_PATH = DATA_DIR / "config" / "sources.json"
 
+parser = argparse.ArgumentParser(description="Download and clean corpus sources.")
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--force", action="store_true")
+parser.add_argument("--chunk", action="store_true")
+args = parser.parse_args()
+
 with open(SOURCES_PATH) as f:
     sources = json.load(f)
 
-for key, cfg in sources.items():
-    print(f"\n{'='*60}")
-    print(f"{cfg['author']}  ({key})")
-    print(f"{'='*60}")
+results = sync_sources(sources, max_workers=args.workers, force=args.force)
+
+print(f"\n{'='*60}")
+print(f"  {'source':<20}{'download':>14}{'cleaned':>10}")
+for key, r in results.items():
+    print(f"  {key:<20}{r['status']:>14}{'yes' if r['cleaned'] else 'no':>10}")
+print(f"{'='*60}")
+
+changed = [r["clean_file"] for r in results.values() if r["cleaned"]]
+if args.chunk:
+    if changed:
+        from stoic_llm.data.processor import TextProcessor
 
-    downloader = TextDownloader(cfg)
-    downloader.download()
-    downloader.clean_gutenberg()
+        TextProcessor().chunk_files(changed)
+    else:
+        print("Nothing changed — chunks are up to date.")
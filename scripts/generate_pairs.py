@@ -1,6 +1,17 @@
+"""
+scripts/generate_pairs.py — neutral pairs for all three authors
+
+Usage:
+  python scripts/generate_pairs.py            # concurrent API calls, journaled
+  python scripts/generate_pairs.py --batch    # one Message Batch per author (resumable)
+  python scripts/generate_pairs.py --selected # chunks ranked by scripts/select_chunks.py
+"""
+
 import os
+import sys
 from stoic_llm.config import CHUNKED_DIR
 from stoic_llm.data.pair_generator import NeutralPairCreator
+from stoic_llm.data.processor import find_chunk_files
 
 api_key = os.environ.get("ANTHROPIC_API_KEY")
 if not api_key:
@@ -9,6 +20,8 @@ if not api_key:
 # Equal pair count across all three to control for data QUANTITY —
 # so any cross-philosopher difference reflects pair QUALITY, not volume.
 N_PAIRS = 63
+BACKEND = "batch" if "--batch" in sys.argv else "async"
+SELECTED = "--selected" in sys.argv
 
 # Per-author length bounds: Epictetus min_chars=150 (Enchiridion is short/aphoristic),
 # others 300. max_chars=1000 for all (raise Seneca later if long essays matter).
@@ -28,7 +41,7 @@ for author, cfg in authors.items():
     print(f"min_chars={cfg['min_chars']}, max_chars={cfg['max_chars']}")
     print(f"{'='*60}")
 
-    chunk_files = list((CHUNKED_DIR / author).glob("*.json"))
+    chunk_files = find_chunk_files(CHUNKED_DIR / author)
     if not chunk_files:
         print(f"No chunk files found for {author}, skipping")
         continue
@@ -40,9 +53,9 @@ for author, cfg in authors.items():
     )
 
     # Check available chunks BEFORE generating — bail if too few for N_PAIRS
-    chunks = creator.read_chunks()
+    chunks = creator.dedup_chunks(creator.read_chunks()["chunks"])
     filtered = creator.filter_chunks_by_length(
-        chunks["chunks"],
+        chunks,
         min_chars=cfg["min_chars"],
         max_chars=cfg["max_chars"],
     )
@@ -53,10 +66,18 @@ for author, cfg in authors.items():
             f"Will generate {len(filtered)}."
         )
 
+    chunk_ids = None
+    if SELECTED:
+        chunk_ids = creator.selected_chunk_ids()
+        if chunk_ids is None:
+            print(f"⚠ No {creator.selection_path.name} for {author} — sampling at random")
+
     creator.create_pairs(
         num_pairs=N_PAIRS,
         min_chars=cfg["min_chars"],
         max_chars=cfg["max_chars"],
+        backend=BACKEND,
+        chunk_ids=chunk_ids,
     )
 
 print(f"\n{'='*60}\nDone! All pairs generated.\n{'='*60}")
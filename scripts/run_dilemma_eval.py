@@ -1,4 +1,6 @@
 import argparse
+import json
+from pathlib import Path
 
 
 def main() -> None:
@@ -12,10 +14,40 @@ def main() -> None:
         default="3B",
         help="Base model size (default: 3B; 1B is legacy).",
     )
+    parser.add_argument(
+        "--stream",
+        default=None,
+        help="JSONL dilemma set to stream in batches; per-item rows go to Parquet.",
+    )
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Write the results here (JSON sweep, or the stream's Parquet file).",
+    )
     args = parser.parse_args()
 
     model, tokenizer = ModelLoader(args.model).load()
 
+    if args.stream:
+        ev = DilemmaEval(model, tokenizer, dilemmas_path=args.stream)
+        path = ev.run_stream(
+            {
+                "epictetus": {
+                    "layer": 8,
+                    "coeff": [0.11, 0.2, 0.4, 0.8, 1.5],
+                    "vector_file": f"epictetus_steering_{args.model}.pt",
+                }
+            },
+            out_path=args.out,
+        )
+        summary = ev.summarize_stream(path)
+        for name, row in summary["delta_logit"]["overall"].items():
+            print(
+                f"{name:<16} Δlog-odds {row['mean_delta']:+.3f} "
+                f"[{row['ci_low']:+.3f}, {row['ci_high']:+.3f}]  perm p={row['perm_p']:.4f}"
+            )
+        return
+
     # configs = {
     #     "marcus": {
     #         "layer": 26,
@@ -44,6 +76,12 @@ def main() -> None:
         coefficients=[0.11, 0.2, 0.4, 0.8, 1.5],
     )
     print(ev.summarize_sweep(sweep))
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(sweep, f, indent=2)
+        print(f"Saved -> {out}")
 
 
 if __name__ == "__main__":
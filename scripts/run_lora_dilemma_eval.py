@@ -31,28 +31,43 @@ def main() -> None:
         default="3B",
         help="Base model size (default: 3B; clean adapters are 3B).",
     )
+    parser.add_argument(
+        "--mode",
+        choices=["merged", "unmerged"],
+        default="merged",
+        help="Merge each adapter in place (exact unmerge after) or run it "
+        "unmerged via PEFT set_adapter (default: merged).",
+    )
+    parser.add_argument(
+        "--mixed",
+        action="store_true",
+        help="Run baseline + all adapters in shared mixed-adapter batches.",
+    )
     args = parser.parse_args()
 
+    # ONE base for the whole run; adapters are swapped onto it per author.
     base, tok = ModelLoader(args.model).load()
-    # model_size is threaded to _merged so the per-adapter fresh base matches
-    # the baseline base above.
-    ev = LoRADilemmaEval(base, tok, model_size=args.model)
+    ev = LoRADilemmaEval(base, tok, mode=args.mode)
 
-    results = ev.run_all_lora(ADAPTERS)
+    if args.mixed:
+        results = ev.run_all_lora_mixed(ADAPTERS)
+    else:
+        results = ev.run_all_lora(ADAPTERS)
 
-    # --- base-integrity check (works even without the in-class guard) ---
-    # If merge_and_unload mutated the base in place, the base now carries
-    # merged adapters; recomputing the baseline will drift from the one
-    # reported at the start of the run.
+    # --- base-integrity check (belt and braces) ---
+    # AdapterSwapper already verifies a bit-exact unmerge per author; if the
+    # base still carried an adapter, recomputing the baseline would drift
+    # from the one reported at the start of the run.
     start = results["baseline_mean"]
-    end = sum(ev.eval_condition().values()) / len(ev.dilemmas)
+    reported = [d for d in ev.dilemmas if d["id"] in results["baseline_p_stoic"]]
+    end = sum(ev.eval_condition(dilemmas=reported).values()) / len(reported)
     drift = abs(end - start)
     print(f"\nbase integrity: start {start:.3f} | end {end:.3f} | drift {drift:.4f}")
     if drift >= 0.005:
         print("  ** BASE MUTATED across authors -> results contaminated.")
-        print("     Switch _merged to the fresh-base version and rerun.")
+        print("     Rerun with --mode unmerged.")
     else:
-        print("  OK base intact; reuse-the-base merge is safe.")
+        print("  OK base intact; in-place adapter swapping is safe.")
 
     ev.save_results(results, out_dir=RESULTS_DIR / "lora")
     print()
@@ -0,0 +1,242 @@
+"""
+scripts/run_pipeline.py — download → chunk → pairs → vectors → evals, incrementally
+
+Each stage declares the files it reads and writes; data/pipeline_manifest.json
+records their content hashes, and only stale stages (and whatever their new
+outputs invalidate) run. Per-author stages run in parallel; stages that need
+the model share one copy and take turns.
+
+Stages (per author unless noted):
+  download:<source>   conditional fetch + clean (always checked; cheap when unchanged)
+  chunk:<author>      processed .txt -> chunked .jsonl
+  pairs:<author>      chunks -> neutral_pairs.json          (API; needs ANTHROPIC_API_KEY)
+  clean_pairs         all authors' pairs -> _clean / _rejected
+  vectors:<author>    neutral_pairs.json -> steering vectors (model)
+  sweep:<author>      vectors -> sweeps/full_<author>_<model>.json     (model + judge API)
+  dilemma_eval        epictetus vectors -> dilemma_eval_epictetus_<model>.json (model)
+
+Usage:
+  python scripts/run_pipeline.py --list
+  python scripts/run_pipeline.py --dry-run                 # what is stale, and why
+  python scripts/run_pipeline.py 'vectors:*'               # targets (globs ok) + what they need
+  python scripts/run_pipeline.py --model 3B --force 'sweep:seneca'
+"""
+
+import argparse
+import fnmatch
+import json
+from stoic_llm.config import (
+    CHUNKED_DIR,
+    DATA_DIR,
+    PROCESSED_DIR,
+    RESULTS_DIR,
+    SOURCES_CONFIG,
+    SWEEPS_DIR,
+    VECTORS_DIR,
+)
+from stoic_llm.pipeline import Pipeline, Stage, command
+
+PIPELINE_MANIFEST = DATA_DIR / "pipeline_manifest.json"
+
+# Same settings as generate_pairs.py / extract_vectors.py / run_sweep.py.
+N_PAIRS = 63
+AUTHORS = {
+    "marcus_aurelius": {"display": "Marcus Aurelius", "min_chars": 300, "max_chars": 1000},
+    "seneca": {"display": "Seneca", "min_chars": 300, "max_chars": 1000},
+    "epictetus": {"display": "Epictetus", "min_chars": 150, "max_chars": 1000},
+}
+CANDIDATE_LAYERS = {
+    "1B": [4, 6, 8, 10, 12, 14],
+    "3B": [4, 8, 12, 16, 20, 24, 26],
+}
+
+parser = argparse.ArgumentParser(description="Run the stale parts of the pipeline.")
+parser.add_argument("targets", nargs="*", help="Stage names or globs (default: all).")
+parser.add_argument("--model", choices=["1B", "3B"], default="1B")
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--force", action="append", default=[], help="Stage name/glob to rerun.")
+parser.add_argument("--backend", choices=["async", "batch"], default="async")
+parser.add_argument("--dry-run", action="store_true")
+parser.add_argument("--list", action="store_true")
+args = parser.parse_args()
+
+_model = {}
+
+
+def shared_model():
+    # Only called from stages holding the "model" lock, so one load.
+    if "model" not in _model:
+        from stoic_llm.model import ModelLoader
+
+        _model["model"] = ModelLoader(args.model).load()
+    return _model["model"]
+
+
+def vector_file(author):
+    return VECTORS_DIR / f"{author}_steering_{args.model}.pt"
+
+
+def sweep_file(author):
+    return SWEEPS_DIR / f"full_{author}_{args.model}.json"
+
+
+def dilemma_eval_file():
+    return RESULTS_DIR / "dilemmas-v2" / f"dilemma_eval_epictetus_{args.model}.json"
+
+
+def download_stage(cfg):
+    def run():
+        from stoic_llm.data.downloader import TextDownloader
+
+        TextDownloader(cfg).sync()
+
+    return run
+
+
+def chunk_stage(txt):
+    def run():
+        from stoic_llm.data.processor import TextProcessor
+
+        TextProcessor().chunk_files([txt], workers=1)
+
+    return run
+
+
+def pairs_stage(author, chunks_file, cfg):
+    def run():
+        from stoic_llm.data.pair_generator import NeutralPairCreator
+
+        creator = NeutralPairCreator(chunks_file=chunks_file, author_name=cfg["display"])
+        creator.create_pairs(
+            num_pairs=N_PAIRS,
+            min_chars=cfg["min_chars"],
+            max_chars=cfg["max_chars"],
+            backend=args.backend,
+        )
+
+    return run
+
+
+def vectors_stage(author, layers):
+    def run():
+        from stoic_llm.steering.extractor import ActivationExtractor
+
+        model, tokenizer = shared_model()
+        extractor = ActivationExtractor(model, tokenizer)
+        pairs_file = PROCESSED_DIR / author / "neutral_pairs.json"
+        vectors = extractor.compute_layered_steering_vectors(str(pairs_file), layers)
+        extractor.save_steering_vectors(vectors, vector_file(author))
+
+    return run
+
+
+def sweep_stage(author, layers):
+    def run():
+        from stoic_llm.eval.sweep import SteeringSweep, summarize_sweep
+
+        model, tokenizer = shared_model()
+        sweep = SteeringSweep(model=model, tokenizer=tokenizer, vector_path=str(vector_file(author)))
+        results = sweep.full_sweep(layers=layers, author=author)
+        print(summarize_sweep(results))
+        sweep.save_results(results, filename=sweep_file(author).name)
+
+    return run
+
+
+def build_pipeline():
+    pipeline = Pipeline(PIPELINE_MANIFEST, max_workers=args.workers)
+    layers = CANDIDATE_LAYERS[args.model]
+
+    with open(SOURCES_CONFIG) as f:
+        sources = json.load(f)
+    books = {}
+    for key, cfg in sources.items():
+        author = cfg["author_folder"]
+        txt = PROCESSED_DIR / author / cfg["filename"]
+        books[author] = txt
+        pipeline.add(Stage(f"download:{key}", download_stage(cfg), outputs=[txt], params=cfg, always_run=True))
+
+    pairs_files = []
+    for author, cfg in AUTHORS.items():
+        if author not in books:
+            continue
+        txt = books[author]
+        chunks_file = CHUNKED_DIR / author / (txt.name.replace(".txt", "") + ".jsonl")
+        pairs_file = PROCESSED_DIR / author / "neutral_pairs.json"
+        pairs_files.append(pairs_file)
+
+        pipeline.add(Stage(f"chunk:{author}", chunk_stage(txt), inputs=[txt], outputs=[chunks_file]))
+        pipeline.add(
+            Stage(
+                f"pairs:{author}",
+                pairs_stage(author, chunks_file, cfg),
+                inputs=[chunks_file],
+                outputs=[pairs_file],
+                params={**cfg, "n_pairs": N_PAIRS},
+            )
+        )
+        pipeline.add(
+            Stage(
+                f"vectors:{author}",
+                vectors_stage(author, layers),
+                inputs=[pairs_file],
+                outputs=[vector_file(author)],
+                params={"model": args.model, "layers": layers},
+                lock="model",
+            )
+        )
+        pipeline.add(
+            Stage(
+                f"sweep:{author}",
+                sweep_stage(author, layers),
+                inputs=[vector_file(author)],
+                outputs=[sweep_file(author)],
+                params={"model": args.model, "layers": layers},
+                lock="model",
+            )
+        )
+
+    pipeline.add(
+        Stage(
+            "clean_pairs",
+            command("scripts/clean_pairs.py"),
+            inputs=pairs_files,
+            outputs=[p.with_name(n) for p in pairs_files for n in ("neutral_pairs_clean.json", "neutral_pairs_rejected.json")],
+        )
+    )
+    pipeline.add(
+        Stage(
+            "dilemma_eval",
+            command("scripts/run_dilemma_eval.py", "--model", args.model, "--out", dilemma_eval_file()),
+            inputs=[vector_file("epictetus")],
+            outputs=[dilemma_eval_file()],
+            params={"model": args.model},
+            lock="model",
+        )
+    )
+    return pipeline
+
+
+def expand(patterns, names):
+    out = []
+    for pattern in patterns:
+        matched = fnmatch.filter(names, pattern)
+        if not matched:
+            parser.error(f"No stage matches '{pattern}'")
+        out += [m for m in matched if m not in out]
+    return out
+
+
+pipeline = build_pipeline()
+names = list(pipeline.stages)
+
+if args.list:
+    for name in names:
+        deps = sorted(pipeline.dependencies(name))
+        print(f"  {name:<28} <- {', '.join(deps) if deps else '-'}")
+else:
+    pipeline.run(
+        targets=expand(args.targets, names) if args.targets else None,
+        force=expand(args.force, names),
+        dry_run=args.dry_run,
+    )
@@ -0,0 +1,54 @@
+"""First-order steering sensitivity: shortlist layers before a full sweep.
+
+One forward + backward pass per dilemma batch gives d logit(P(stoic)) / dc
+at every candidate layer. --validate also runs the measured per-layer pass
+at --coeff and reports the rank correlation between the two.
+
+Usage:
+    python scripts/run_sensitivity.py --author epictetus
+    python scripts/run_sensitivity.py --author seneca --validate
+"""
+
+import argparse
+
+
+def main() -> None:
+    import torch
+    from stoic_llm.model import ModelLoader
+    from stoic_llm.eval.sensitivity import SteeringSensitivity
+    from stoic_llm.config import VECTORS_DIR
+
+    parser = argparse.ArgumentParser(description="First-order steering sensitivity.")
+    parser.add_argument("--model", choices=["1B", "3B"], default="3B")
+    parser.add_argument("--author", default="epictetus")
+    parser.add_argument("--coeff", type=float, default=0.11)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Also measure each layer at --coeff and report rank agreement.",
+    )
+    args = parser.parse_args()
+
+    model, tokenizer = ModelLoader(args.model).load()
+    vectors = torch.load(
+        VECTORS_DIR / f"{args.author}_steering_{args.model}.pt",
+        map_location="cpu",
+        weights_only=True,
+    )
+
+    est = SteeringSensitivity(model, tokenizer)
+    table = est.estimate(vectors, batch_size=args.batch_size)
+    print(f"\n{args.author} ({args.model}), {table['runtime_sec']}s")
+    print(est.summarize(table, coefficient=args.coeff))
+
+    if args.validate:
+        measured = est.measure_layers(vectors, coefficient=args.coeff)
+        agree = est.rank_agreement(table, measured)
+        print(f"\nSpearman across layers (mean): {agree['layer_rho']:+.2f}")
+        for L, rho in agree["item_rho"].items():
+            print(f"  layer {L:>2}: per-item Spearman {rho:+.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+scripts/select_chunks.py — rank chunks by activation before paying for pairs
+
+Runs every candidate chunk (after dedup + the length/marker filter) through
+the model once, stopping at --layer, scores it by its projection on a
+steering direction and writes the chosen ids to
+PROCESSED_DIR/<author>/chunk_selection.json, which
+`generate_pairs.py --selected` then uses instead of a random sample.
+
+Direction: the author's existing steering vector by default; or
+--bootstrap PAIRS.json to build one from a small seed set of pairs
+(e.g. neutral_pairs_30.json) before any full generation.
+
+Usage:
+  python scripts/select_chunks.py epictetus --layer 8
+  python scripts/select_chunks.py seneca --layer 4 --k 63 --strategy top
+  python scripts/select_chunks.py seneca --bootstrap data/processed/seneca/neutral_pairs_30.json
+"""
+
+import argparse
+from stoic_llm.config import CHUNKED_DIR, VECTORS_DIR
+from stoic_llm.data.pair_generator import NeutralPairCreator
+from stoic_llm.data.processor import find_chunk_files
+from stoic_llm.model import ModelLoader
+from stoic_llm.steering.extractor import ActivationExtractor
+from stoic_llm.steering.selection import STRATEGIES, ChunkSelector, load_direction
+
+# Same bounds as generate_pairs.py
+AUTHORS = {
+    "marcus_aurelius": {"display": "Marcus Aurelius", "min_chars": 300, "max_chars": 1000},
+    "seneca": {"display": "Seneca", "min_chars": 300, "max_chars": 1000},
+    "epictetus": {"display": "Epictetus", "min_chars": 150, "max_chars": 1000},
+}
+
+parser = argparse.ArgumentParser(description="Activation-ranked chunk selection.")
+parser.add_argument("author", choices=list(AUTHORS))
+parser.add_argument("--model", choices=["1B", "3B"], default="1B")
+parser.add_argument("--layer", type=int, default=8)
+parser.add_argument("--k", type=int, default=63)
+parser.add_argument("--strategy", choices=STRATEGIES, default="mmr")
+parser.add_argument("--diversity", type=float, default=0.3)
+parser.add_argument("--batch-size", type=int, default=16)
+parser.add_argument("--bootstrap", default=None, help="Seed pairs file to build the direction from.")
+args = parser.parse_args()
+
+cfg = AUTHORS[args.author]
+creator = NeutralPairCreator(
+    chunks_file=find_chunk_files(CHUNKED_DIR / args.author)[0],
+    author_name=cfg["display"],
+    api_key="not-needed-for-selection",
+)
+chunks = creator.filter_chunks_by_length(
+    creator.dedup_chunks(creator.read_chunks()["chunks"]),
+    min_chars=cfg["min_chars"],
+    max_chars=cfg["max_chars"],
+)
+
+model, tokenizer = ModelLoader(args.model).load()
+extractor = ActivationExtractor(model, tokenizer)
+source = args.bootstrap or VECTORS_DIR / f"{args.author}_steering_{args.model}.pt"
+direction = load_direction(source, args.layer, extractor)
+
+selector = ChunkSelector(extractor, args.layer, direction, batch_size=args.batch_size)
+selected, report = selector.select(chunks, args.k, strategy=args.strategy, diversity=args.diversity)
+report["direction"] = str(source)
+report["model"] = args.model
+selector.save_report(report, creator.selection_path)
+
+print(
+    f"{args.author}: {len(selected)}/{len(chunks)} chunks, mean projection "
+    f"{report['score_mean_selected']:+.4f} selected vs {report['score_mean_all']:+.4f} all"
+)
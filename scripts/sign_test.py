@@ -1,41 +1,44 @@
 """Sign test on per-item dilemma deltas. Reads the saved Exp 11 results JSON.
 
+All philosophers go through one vectorized stoic_llm.eval.stats call, which
+also reports a bootstrap CI of the mean Δ, a sign-flip permutation p, and
+Holm-adjusted sign-test p across philosophers.
+
 Usage: python scripts/sign_test.py results/dilemmas-v2/lora/dilemma_eval_<timestamp>.json
 """
 
 import json
 import sys
-from math import comb
-
 
-def sign_test(deltas: dict[str, float], tol: float = 1e-9) -> dict:
-    pos = sum(1 for d in deltas.values() if d > tol)
-    neg = sum(1 for d in deltas.values() if d < -tol)
-    ties = len(deltas) - pos - neg
-    n = pos + neg  # ties dropped, standard practice
-    # exact two-sided binomial p under H0: P(item moves +) = 0.5
-    k = max(pos, neg)
-    p = sum(comb(n, i) for i in range(k, n + 1)) / 2**n * 2
-    return {"pos": pos, "neg": neg, "ties": ties, "n": n, "p_two_sided": min(p, 1.0)}
+from stoic_llm.eval.stats import adjust_pvalues, as_rows, delta_matrix, paired_tests
 
 
 def main(path: str) -> None:
     with open(path) as f:
         results = json.load(f)
 
-    print(f"{'philosopher':<12} {'+':>4} {'-':>4} {'ties':>5} {'p (2-sided)':>12}")
-    for name, r in results["philosophers"].items():
-        # log-odds deltas if present, else P-space (sign is identical)
-        deltas = r.get("per_item_delta_logit", r["per_item_delta"])
-        s = sign_test(deltas)
+    # log-odds deltas if present, else P-space (sign is identical)
+    names, _, deltas = delta_matrix(results)
+    stats = paired_tests(deltas)
+    stats["sign_p_holm"] = adjust_pvalues(stats["sign_p"], "holm")
+    rows = as_rows(stats, names)
+
+    print(
+        f"{'philosopher':<12} {'+':>4} {'-':>4} {'ties':>5} {'p (2-sided)':>12} "
+        f"{'p (Holm)':>9} {'mean Δ':>8} {'95% boot CI':>17} {'perm p':>7}"
+    )
+    for name, s in rows.items():
         print(
-            f"{name:<12} {s['pos']:>4} {s['neg']:>4} {s['ties']:>5} {s['p_two_sided']:>12.4f}"
+            f"{name:<12} {s['pos']:>4} {s['neg']:>4} {s['ties']:>5} {s['sign_p']:>12.4f} "
+            f"{s['sign_p_holm']:>9.4f} {s['mean_delta']:>+8.3f} "
+            f"[{s['ci_low']:>+6.3f}, {s['ci_high']:>+6.3f}] {s['perm_p']:>7.4f}"
         )
 
     print("\nRead: for n=40 with no ties, ~27+/40 in one direction gives p<0.05.")
     print(
         "Sign test ignores magnitude — it asks only 'did most items move the same way'."
     )
+    print("Permutation p and the bootstrap CI use magnitude; Holm corrects across philosophers.")
 
 
 if __name__ == "__main__":
@@ -8,18 +8,8 @@ Usage:
 
 import json
 import sys
-from math import comb
 
-
-def sign_test(deltas: list[float], tol: float = 1e-9) -> dict:
-    pos = sum(1 for d in deltas if d > tol)
-    neg = sum(1 for d in deltas if d < -tol)
-    n = pos + neg
-    if n == 0:
-        return {"pos": 0, "neg": 0, "n": 0, "p": 1.0}
-    k = max(pos, neg)
-    p = sum(comb(n, i) for i in range(k, n + 1)) / 2**n * 2
-    return {"pos": pos, "neg": neg, "n": n, "p": min(p, 1.0)}
+from stoic_llm.eval.stats import bucketed_tests, delta_matrix
 
 
 def main(results_path: str, dilemmas_path: str) -> None:
@@ -28,20 +18,22 @@ def main(results_path: str, dilemmas_path: str) -> None:
     with open(dilemmas_path) as f:
         dilemmas = {d["id"]: d for d in json.load(f)["dilemmas"]}
 
-    for name, r in results["philosophers"].items():
-        deltas = r.get("per_item_delta_logit", r["per_item_delta"])
+    names, ids, deltas = delta_matrix(results)
+    by_key = {
+        key: bucketed_tests(deltas, [dilemmas[i][key] for i in ids], names)
+        for key in ("concept", "stoic_stance")
+    }
+
+    for name in names:
         print(f"\n=== {name} ===")
-        for key in ("concept", "stoic_stance"):
+        for key, buckets in by_key.items():
             print(f"  by {key}:")
-            buckets: dict[str, list[float]] = {}
-            for item_id, d in deltas.items():
-                buckets.setdefault(dilemmas[item_id][key], []).append(d)
-            for b, ds in sorted(buckets.items()):
-                s = sign_test(ds)
-                mean = sum(ds) / len(ds)
+            for b, rows in buckets.items():
+                s = rows[name]
                 print(
-                    f"    {b:<26} {s['pos']:>2}+/{s['neg']:<2}- of {s['n']:<2}"
-                    f"  mean Δlo {mean:+.3f}  p={s['p']:.3f}"
+                    f"    {b:<26} {s['pos']:>2}+/{s['neg']:<2}- of {s['pos'] + s['neg']:<2}"
+                    f"  mean Δlo {s['mean_delta']:+.3f}"
+                    f" [{s['ci_low']:+.3f}, {s['ci_high']:+.3f}]  p={s['sign_p']:.3f}"
                 )
     print(
         "\nNote: concept buckets are n=3-6 items — read direction and mean, "
@@ -5,14 +5,22 @@ Usage:
   python scripts/train_lora.py              # defaults to 1B on cpu
   python scripts/train_lora.py 3B           # 3B on cpu
   python scripts/train_lora.py 3B mps       # 3B on Apple GPU
+  python scripts/train_lora.py 3B cpu low_memory   # bf16 + checkpointing + 8-bit optim
+  python scripts/train_lora.py 1B cpu --incremental  # continue adapters on new pairs only
+
+Peak RSS is the process-wide high-water mark, so compare profiles in
+separate runs; each adapter dir gets a training_report.json.
 """
 
 import sys
 from stoic_llm.lora.data_prep import LoRADataPrep
 from stoic_llm.lora.trainer import LoRATrainer
 
-model_size = sys.argv[1] if len(sys.argv) > 1 else "1B"
-device = sys.argv[2] if len(sys.argv) > 2 else "cpu"
+incremental = "--incremental" in sys.argv
+args = [a for a in sys.argv[1:] if a != "--incremental"]
+model_size = args[0] if len(args) > 0 else "1B"
+device = args[1] if len(args) > 1 else "cpu"
+profile = args[2] if len(args) > 2 else "default"
 
 # Step 1: Prepare training data
 print(f"\n{'='*60}")
@@ -24,11 +32,11 @@ prep.prepare_all_authors()
 
 # Step 2: Train LoRA adapters
 print(f"\n{'='*60}")
-print(f"TRAINING LORA ADAPTERS ({model_size})")
+print(f"TRAINING LORA ADAPTERS ({model_size}, {profile} profile)")
 print(f"{'='*60}")
 
 trainer = LoRATrainer(model_size=model_size)
-trainer.train_all_authors(device=device)
+trainer.train_all_authors(device=device, profile=profile, incremental=incremental)
 
 print(f"\n{'='*60}")
 print("Done! All LoRA adapters trained.")
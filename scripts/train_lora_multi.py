@@ -0,0 +1,51 @@
+"""
+scripts/train_lora_multi.py — Train several LoRA adapters concurrently
+
+One frozen base, one forward/backward per step for all adapters; each
+adapter keeps its own optimizer and checkpoints (see
+stoic_llm/lora/multi_train.py). With several --ranks, every author is
+trained at every rank (alpha scales with r, keeping alpha / r fixed).
+
+Usage:
+  python scripts/train_lora_multi.py                          # 3 authors, 1B, cpu
+  python scripts/train_lora_multi.py --authors seneca --ranks 4 8 16
+  python scripts/train_lora_multi.py --model 3B --device mps
+"""
+
+import argparse
+
+
+def main() -> None:
+    from stoic_llm.lora.multi_train import MultiLoRATrainer
+
+    parser = argparse.ArgumentParser(description="Concurrent multi-adapter LoRA training.")
+    parser.add_argument("--model", choices=["1B", "3B"], default="1B")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument(
+        "--authors", nargs="+", default=["marcus_aurelius", "seneca", "epictetus"]
+    )
+    parser.add_argument("--ranks", nargs="+", type=int, default=[8])
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=2, help="Rows per adapter.")
+    parser.add_argument("--max-steps", type=int, default=-1)
+    args = parser.parse_args()
+
+    trainer = MultiLoRATrainer(model_size=args.model)
+    alpha_per_r = trainer._get_lora_config().lora_alpha / trainer._get_lora_config().r
+    adapters = {}
+    for author in args.authors:
+        for r in args.ranks:
+            name = author if len(args.ranks) == 1 else f"{author}_r{r}"
+            adapters[name] = {"author": author, "r": r, "lora_alpha": int(alpha_per_r * r)}
+
+    trainer.train_adapters(
+        adapters,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        device=args.device,
+        max_steps=args.max_steps,
+    )
+
+
+if __name__ == "__main__":
+    main()
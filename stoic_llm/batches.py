@@ -0,0 +1,151 @@
+"""Message Batches backend for bulk offline API jobs.
+
+Generating hundreds of neutral pairs or judging a whole sweep does not
+need low latency, so instead of one request per item we submit ONE batch
+job (half the per-token price, no client-side rate limiting):
+
+    submit      every request packaged with a custom_id ("r00000", ...)
+    persist     batch id + custom_id -> item key mapping written to a state
+                file right after submission
+    poll        retrieve() with exponential backoff until "ended"
+    results     streamed back and mapped to item keys by custom_id
+    resume      a restarted process finds the state file and polls the
+                SAME batch instead of submitting (and paying for) a new one
+
+Works against any endpoint with the Anthropic batch API shape; for tests,
+run scripts/batch_standin.py and point the client at it with
+base_url / ANTHROPIC_BASE_URL.
+
+Usage:
+    job = MessageBatchJob(anthropic.Anthropic(), PROCESSED_DIR / "x.batch.json")
+    out = job.run({"chunk-7": {"model": ..., "max_tokens": ..., "messages": [...]}})
+    out["chunk-7"]            # {"text": "..."} or {"error": "..."}
+    job.clear()               # after the results are safely stored
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class MessageBatchJob:
+    """One provider batch job, persisted so it survives process restarts."""
+
+    def __init__(
+        self,
+        client,
+        state_path,
+        poll_initial: float = 10.0,
+        poll_max: float = 300.0,
+        poll_factor: float = 1.5,
+    ):
+        self.client = client
+        self.state_path = Path(state_path)
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+
+    def load_state(self) -> dict | None:
+        if not self.state_path.exists():
+            return None
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def save_state(self, state: dict) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2)
+        tmp.replace(self.state_path)
+
+    @staticmethod
+    def payload_hash(requests: dict[str, dict]) -> str:
+        """sha256 over every (key, params) pair, to tell whether a saved
+        batch was built from the same requests."""
+        payload = json.dumps(
+            [[str(key), params] for key, params in requests.items()], sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def submit(self, requests: dict[str, dict], meta: dict | None = None) -> dict:
+        """Submit {key: message params} as one batch; returns the state.
+        meta is stored in the state file alongside the batch id."""
+        custom_ids = {f"r{i:05d}": str(key) for i, key in enumerate(requests)}
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": cid, "params": requests[key]}
+                for cid, key in zip(custom_ids, requests)
+            ]
+        )
+        state = {
+            "batch_id": batch.id,
+            "custom_ids": custom_ids,
+            "submitted_at": datetime.now().isoformat(),
+            **(meta or {}),
+        }
+        # Persist before anything else can fail: the batch is already billed.
+        self.save_state(state)
+        print(f"✓ Submitted batch {batch.id} ({len(custom_ids)} requests) -> {self.state_path}")
+        return state
+
+    def wait(self, batch_id: str, timeout: float | None = None):
+        """Poll until the batch has ended, backing off between polls."""
+        delay = self.poll_initial
+        start = time.monotonic()
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            print(
+                f"  batch {batch_id}: {batch.processing_status} "
+                f"(processing {counts.processing}, succeeded {counts.succeeded}, "
+                f"errored {counts.errored})"
+            )
+            if batch.processing_status == "ended":
+                return batch
+            if timeout is not None and time.monotonic() - start > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {batch.processing_status}")
+            time.sleep(delay)
+            delay = min(self.poll_max, delay * self.poll_factor)
+
+    def results(self, state: dict) -> dict[str, dict]:
+        """{key: {"text": ...}} for succeeded, {key: {"error": ...}} otherwise."""
+        out = {}
+        for entry in self.client.messages.batches.results(state["batch_id"]):
+            key = state["custom_ids"].get(entry.custom_id)
+            if key is None:
+                continue
+            result = entry.result
+            if result.type == "succeeded":
+                out[key] = {"text": result.message.content[0].text}
+            elif result.type == "errored":
+                out[key] = {"error": f"errored: {result.error.error.message}"}
+            else:  # canceled / expired
+                out[key] = {"error": result.type}
+        return out
+
+    def run(self, requests: dict[str, dict], timeout: float | None = None) -> dict[str, dict]:
+        """Submit (or resume) the batch, wait for it, return mapped results.
+
+        If state_path already holds a batch, that batch is resumed and only
+        the keys it covers are returned; call clear() once the results are
+        stored, then run again for anything left.
+        """
+        state = self.load_state()
+        if state is None:
+            if not requests:
+                return {}
+            state = self.submit(requests)
+        else:
+            print(f"↻ Resuming batch {state['batch_id']} from {self.state_path}")
+            missing = set(map(str, requests)) - set(state["custom_ids"].values())
+            if missing:
+                print(f"  {len(missing)} requested items are not in this batch; run again after clear()")
+        self.wait(state["batch_id"], timeout=timeout)
+        return self.results(state)
+
+    def clear(self) -> None:
+        self.state_path.unlink(missing_ok=True)
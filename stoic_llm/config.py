@@ -23,6 +23,8 @@ PROCESSED_DIR = DATA_DIR / "processed"
 CHUNKED_DIR = DATA_DIR / "chunked"
 VECTORS_DIR = DATA_DIR / "steering_vectors"
 LORA_TRAINING_DIR = DATA_DIR / "lora_training"
+TOKENIZED_CACHE_DIR = DATA_DIR / "cache" / "tokenized"
+STORE_DIR = DATA_DIR / "store"  # Parquet mirror of chunks + pairs (stoic_llm.data.store)
 
 # Model Paths
 MODELS_DIR = PROJECT_ROOT / "models"
@@ -36,6 +38,10 @@ JUDGES_DIR = RESULTS_DIR / "judges"
 # Sources Config
 SOURCES_CONFIG = CONFIG_DIR / "sources.json"
 
+# Near-duplicate removal (MinHash LSH, stoic_llm.data.dedup): Jaccard
+# similarity of word 5-gram shingles above which a later text is dropped.
+DEDUP_THRESHOLD = 0.8
+
 # Steering Defaults
 LAYER_IDX = 12
 COEFFICIENT = 0.11
@@ -70,6 +76,8 @@ for d in [
     CHUNKED_DIR,
     VECTORS_DIR,
     LORA_TRAINING_DIR,
+    TOKENIZED_CACHE_DIR,
+    STORE_DIR,
     MODELS_DIR,
     RESULTS_DIR,
     SWEEPS_DIR,
@@ -0,0 +1,157 @@
+"""Near-duplicate detection for chunks and pairs with MinHash LSH.
+
+Overlapping translations, repeated letters and boilerplate give chunks
+that are almost the same text; each costs an API call and pulls the
+steering-vector mean toward itself. Comparing every pair of chunks is
+quadratic, so:
+
+    shingles    word n-grams (lowercased), hashed to 32 bits
+    minhash     num_perm multiply-shift hashes; the fraction of equal
+                signature rows estimates the Jaccard similarity
+    LSH         signatures cut into bands; texts sharing any band bucket
+                become candidates (bands/rows chosen for the threshold,
+                biased toward recall)
+    verify      exact Jaccard of the shingle sets for candidates only
+    keep        first occurrence wins; a later text is dropped when it is
+                >= threshold similar to a KEPT text (no chaining)
+
+Usage:
+    deduper = MinHashDeduper(threshold=0.8)
+    kept, report = deduper.dedup(chunks, report_path="dedup_report.json")
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+WORD_RE = re.compile(r"\w+")
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+def _lsh_params(threshold: float, num_perm: int, fp_weight: float) -> tuple[int, int]:
+    """(bands, rows) minimising the weighted false-positive + false-negative
+    area around the threshold for the S-curve 1 - (1 - s**rows)**bands."""
+    best, best_err = (1, num_perm), float("inf")
+    lo, hi = np.linspace(0, threshold, 64), np.linspace(threshold, 1, 64)
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            fp = np.trapezoid(1 - (1 - lo**rows) ** bands, lo)
+            fn = np.trapezoid((1 - hi**rows) ** bands, hi)
+            err = fp_weight * fp + (1 - fp_weight) * fn
+            if err < best_err:
+                best, best_err = (bands, rows), err
+    return best
+
+
+class MinHashDeduper:
+    """Drop near-duplicate texts above a Jaccard threshold."""
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=5, fp_weight=0.05, seed=1):
+        """fp_weight: weight of LSH false positives vs false negatives when
+        choosing bands/rows. Candidates are verified exactly, so a false
+        positive only costs one set comparison; the low default buys recall
+        (~95% of pairs right at the threshold, ~100% above 0.85)."""
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _lsh_params(threshold, num_perm, fp_weight)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: h(x) = (a*x + b mod 2**64) >> 32, a odd.
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set[int]:
+        words = WORD_RE.findall(text.lower())
+        k = self.shingle_size
+        grams = [" ".join(words[i : i + k]) for i in range(max(1, len(words) - k + 1))]
+        return {zlib.crc32(g.encode()) for g in grams if g}
+
+    def signature(self, shingles: set[int]) -> np.ndarray:
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        with np.errstate(over="ignore"):
+            h = (self._a[:, None] * x[None, :] + self._b[:, None]) >> np.uint64(32)
+        return h.min(axis=1).astype(np.uint32)
+
+    def duplicates(self, texts: list[str]) -> dict[int, list[tuple[int, float]]]:
+        """{kept index: [(dropped index, jaccard), ...]} for texts in order."""
+        sets = [self.shingles(t) for t in texts]
+        sigs = np.stack([self.signature(s) for s in sets]) if sets else np.zeros((0, self.num_perm))
+
+        buckets: dict[tuple[int, bytes], list[int]] = {}
+        keys = []
+        for i, sig in enumerate(sigs):
+            if not sets[i]:
+                keys.append([])
+                continue
+            row_keys = [
+                (band, sig[band * self.rows : (band + 1) * self.rows].tobytes())
+                for band in range(self.bands)
+            ]
+            keys.append(row_keys)
+            for key in row_keys:
+                buckets.setdefault(key, []).append(i)
+
+        dropped: set[int] = set()
+        clusters: dict[int, list[tuple[int, float]]] = {}
+        for i in range(len(texts)):
+            if i in dropped:
+                continue
+            seen = {i}
+            for key in keys[i]:
+                for j in buckets[key]:
+                    if j <= i or j in seen or j in dropped:
+                        continue
+                    seen.add(j)
+                    jaccard = len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+                    if jaccard >= self.threshold:
+                        dropped.add(j)
+                        clusters.setdefault(i, []).append((j, round(jaccard, 4)))
+        return clusters
+
+    def dedup(self, items, text_key="text", id_key="id", report_path=None):
+        """(kept items, report) — items are dicts with a text field.
+
+        The report lists every cluster: the kept item and each dropped one
+        with its Jaccard similarity to it. Written as JSON to report_path
+        if given.
+        """
+        items = list(items)
+        clusters = self.duplicates([it[text_key] for it in items])
+        drop = {j for members in clusters.values() for j, _ in members}
+        kept = [it for i, it in enumerate(items) if i not in drop]
+
+        def brief(i):
+            return {"index": i, "id": items[i].get(id_key), "preview": items[i][text_key][:160]}
+
+        report = {
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "shingle_size": self.shingle_size,
+            "n_input": len(items),
+            "n_kept": len(kept),
+            "n_dropped": len(drop),
+            "clusters": [
+                {
+                    "kept": brief(i),
+                    "dropped": [{**brief(j), "jaccard": jac} for j, jac in members],
+                }
+                for i, members in sorted(clusters.items(), key=lambda kv: -len(kv[1]))
+            ],
+        }
+        if report_path is not None:
+            report_path = Path(report_path)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, "w") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return kept, report
@@ -1,5 +1,11 @@
-import urllib.request
+import hashlib
+import json
+import os
 import re
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from stoic_llm.config import RAW_DIR, PROCESSED_DIR
 
 
@@ -25,12 +31,108 @@ class TextDownloader:
         self.content_start = source_config.get("content_start")
         self.content_end = source_config.get("content_end")
 
-    def download(self):
-        """Download the file from URL"""
+    @property
+    def meta_path(self):
+        """ETag / Last-Modified / content hashes of the last download and clean."""
+        return self.raw_filename.with_name(self.raw_filename.name + ".meta.json")
+
+    def _load_meta(self):
+        if not self.meta_path.exists():
+            return {}
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    def _save_meta(self, meta):
+        tmp = self.meta_path.with_name(self.meta_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        tmp.replace(self.meta_path)
+
+    def download(self, force=False, timeout=60):
+        """Download the file from URL, conditionally.
+
+        Sends If-None-Match / If-Modified-Since from the previous download
+        and hashes the body as it streams to disk. Returns "not_modified"
+        (server said 304), "unchanged" (same content hash, e.g. file:// URLs
+        or servers without validators) or "changed"; the raw file is only
+        replaced when the content changed.
+        """
+        meta = self._load_meta()
+        have_raw = self.raw_filename.exists()
+        if not have_raw or meta.get("url") != self.url:
+            meta = {}
+
+        request = urllib.request.Request(self.url)
+        if not force and meta.get("etag"):
+            request.add_header("If-None-Match", meta["etag"])
+        if not force and meta.get("last_modified"):
+            request.add_header("If-Modified-Since", meta["last_modified"])
+
         print(f"Downloading from {self.url}...")
-        urllib.request.urlretrieve(self.url, self.raw_filename)
-        print(f"✓ Saved to {self.raw_filename}")
-        return self.raw_filename
+        tmp = self.raw_filename.with_name(self.raw_filename.name + f".part{os.getpid()}")
+        h = hashlib.sha256()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp, open(tmp, "wb") as f:
+                headers = resp.headers
+                while block := resp.read(1 << 16):
+                    h.update(block)
+                    f.write(block)
+        except urllib.error.HTTPError as e:
+            tmp.unlink(missing_ok=True)
+            if e.code == 304:
+                print(f"✓ Not modified: {self.raw_filename.name}")
+                return "not_modified"
+            raise
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        sha256 = h.hexdigest()
+        status = "unchanged" if not force and sha256 == meta.get("sha256") else "changed"
+        if status == "changed":
+            tmp.replace(self.raw_filename)
+            print(f"✓ Saved to {self.raw_filename}")
+        else:
+            tmp.unlink()
+            print(f"✓ Unchanged: {self.raw_filename.name} (same content hash)")
+        meta.update(
+            {
+                "url": self.url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "sha256": sha256,
+                "fetched_at": datetime.now().isoformat(),
+            }
+        )
+        self._save_meta(meta)
+        return status
+
+    @property
+    def boundaries_sha256(self):
+        """Hash of the content_start / content_end regexes the clean uses."""
+        payload = json.dumps([self.content_start, self.content_end])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def needs_cleaning(self):
+        """True when the cleaned file is missing, or was cleaned from a
+        different raw file or with different content boundaries than now."""
+        meta = self._load_meta()
+        return (
+            not self.clean_filename.exists()
+            or meta.get("cleaned_sha256") != meta.get("sha256")
+            or meta.get("cleaned_boundaries_sha256") != self.boundaries_sha256
+        )
+
+    def sync(self, force=False):
+        """Conditional download, then clean only if the content changed.
+        Returns {"status": ..., "cleaned": bool}."""
+        status = self.download(force=force)
+        cleaned = force or self.needs_cleaning()
+        if cleaned:
+            self.clean_gutenberg()
+        else:
+            print(f"  ↷ Skipping clean for {self.clean_filename.name}: raw content and boundaries unchanged")
+        return {"status": status, "cleaned": cleaned}
 
     def clean_gutenberg(self):
         """Strip Gutenberg license wrapper, then narrow to the work proper
@@ -60,6 +162,12 @@ class TextDownloader:
             f.write(clean_text)
         print(f"✓ Saved to {self.clean_filename}")
 
+        meta = self._load_meta()
+        if meta.get("sha256"):
+            meta["cleaned_sha256"] = meta["sha256"]
+            meta["cleaned_boundaries_sha256"] = self.boundaries_sha256
+            self._save_meta(meta)
+
     def _find_content_boundaries(self, text):
         """Three-stage boundary detection:
         1. Gutenberg license wrapper (always).
@@ -107,3 +215,22 @@ class TextDownloader:
                 )
 
         return inner_start + start_offset, inner_start + end_offset
+
+
+def sync_sources(sources, max_workers=4, force=False):
+    """TextDownloader.sync for every source in sources.json, concurrently
+    (threads; the work is network-bound). Returns {key: result} where
+    result also has "clean_file", or "error" if that source failed."""
+
+    def one(cfg):
+        downloader = TextDownloader(cfg)
+        try:
+            result = downloader.sync(force=force)
+        except Exception as e:
+            print(f"✗ {cfg.get('url')}: {e}")
+            return {"status": "error", "cleaned": False, "error": f"{type(e).__name__}: {e}"}
+        return {**result, "clean_file": str(downloader.clean_filename)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = dict(zip(sources, pool.map(one, sources.values())))
+    return results
@@ -0,0 +1,150 @@
+"""Async, resumable API job runner with a crash-safe JSONL journal.
+
+Pair generation used to make one API call per chunk, serially, and only
+wrote its output at the very end, so a crash near the end lost the whole
+run. Here:
+
+    concurrency     at most `concurrency` requests in flight (semaphore)
+    rate limit      at most `requests_per_minute` request starts per minute
+    retries         exponential backoff + jitter on 429 / 5xx / connection
+                    errors; other errors are journaled as failures
+    journal         every result (ok or failed) is appended to a JSONL file
+                    and fsync'ed as it arrives
+    resume          a re-run skips ids already journaled as ok and retries
+                    the failed ones
+
+Usage:
+    async def work(item):
+        return {"id": item["id"], "out": await call_api(item)}
+
+    asyncio.run(run_jobs(items, work, "out.journal.jsonl", concurrency=8))
+    done = read_journal("out.journal.jsonl")      # {id: record}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Rate limits, overload/server errors and dropped connections."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    name = type(exc).__name__
+    return "Connection" in name or "Timeout" in name or isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def read_journal(path) -> dict[str, dict]:
+    """{id: latest record}. A torn final line (crash mid-write) is ignored."""
+    path = Path(path)
+    records: dict[str, dict] = {}
+    if not path.exists():
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[str(rec["id"])] = rec
+    return records
+
+
+def append_records(path, records) -> None:
+    """Append finished records (each with an "id") to a journal, fsync'ed."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class RateLimiter:
+    """Spaces request starts evenly: at most `per_minute` per 60 seconds."""
+
+    def __init__(self, per_minute: float | None):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def run_jobs(
+    items,
+    worker,
+    journal_path,
+    concurrency: int = 8,
+    requests_per_minute: float | None = 50,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> dict[str, dict]:
+    """Run `await worker(item)` for every item not yet journaled as ok.
+
+    Items need an "id"; worker returns a JSON-serializable dict (its "id"
+    is set from the item). Returns the full journal after the run.
+    """
+    journal_path = Path(journal_path)
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    done = {i for i, rec in read_journal(journal_path).items() if not rec.get("error")}
+    todo = [it for it in items if str(it["id"]) not in done]
+    print(f"Journal {journal_path.name}: {len(done)} done, {len(todo)} to run")
+    if not todo:
+        return read_journal(journal_path)
+
+    sem = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(requests_per_minute)
+    counts = {"ok": 0, "failed": 0}
+
+    with open(journal_path, "a") as journal:
+
+        def append(record: dict) -> None:
+            journal.write(json.dumps(record) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+        async def one(item):
+            async with sem:
+                for attempt in range(max_retries + 1):
+                    await limiter.wait()
+                    try:
+                        record = await worker(item)
+                        break
+                    except Exception as e:
+                        if attempt < max_retries and is_retryable(e):
+                            delay = min(max_delay, base_delay * 2**attempt)
+                            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                            continue
+                        counts["failed"] += 1
+                        print(f"  ✗ {item['id']}: {e}")
+                        append({"id": item["id"], "error": f"{type(e).__name__}: {e}"})
+                        return
+                record["id"] = item["id"]
+                append(record)
+                counts["ok"] += 1
+                n = counts["ok"] + counts["failed"]
+                print(f"  [{n}/{len(todo)}] ✓ {item['id']}")
+
+        await asyncio.gather(*(one(it) for it in todo))
+
+    print(f"✓ {counts['ok']} ok, {counts['failed']} failed this run")
+    return read_journal(journal_path)
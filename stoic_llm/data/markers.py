@@ -0,0 +1,149 @@
+"""Single-pass multi-pattern matcher for corpus hygiene.
+
+The chunk filter and the pair audit scripts each looped over their marker
+lists (`any(m in text for m in markers)`, one substring scan per marker)
+plus a few regexes and chained re.sub passes. MarkerMatcher compiles every
+category into ONE regex and finds all hits, by category, in one pass:
+
+    (?=A|B|...)(?=(?P<cat_0>...))?(?=(?P<cat_1>...))?...
+
+Every group is a zero-width lookahead, so at each position where anything
+matches, every category is tested at once and overlapping hits from
+different categories are all seen. Within a category the alternation is
+longest-first, and markers that are prefixes of the hit are credited too,
+so the result equals the old "which markers occur anywhere" semantics.
+
+Usage:
+    m = MarkerMatcher({"refusal": ["i cannot", "as an ai"]}, ignore_case=True)
+    m.scan(text)          # {"refusal": ["as an ai"]}
+    scan_many(m, texts)   # process pool over a whole corpus
+    scan_corpus({"seneca": (m1, texts1), "epictetus": (m2, texts2)})
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+
+class MarkerMatcher:
+    """Literal marker lists and regexes per category, matched in one pass."""
+
+    def __init__(
+        self,
+        markers: dict[str, list[str]],
+        regexes: dict[str, str] | None = None,
+        ignore_case: bool = False,
+    ):
+        self.ignore_case = ignore_case
+        self.markers = {
+            cat: [m.lower() for m in ms] if ignore_case else list(ms)
+            for cat, ms in markers.items()
+        }
+        self.regexes = dict(regexes or {})
+        self.categories = list(self.markers) + list(self.regexes)
+
+        # marker -> markers in the same category that are prefixes of it
+        self._prefixes = {
+            cat: {m: [p for p in ms if p != m and m.startswith(p)] for m in ms}
+            for cat, ms in self.markers.items()
+        }
+        # marker -> position in its list, to report hits in list order
+        self._order = {cat: {m: i for i, m in enumerate(ms)} for cat, ms in self.markers.items()}
+
+        self._groups = {f"g{i}": cat for i, cat in enumerate(self.categories)}
+        alternatives = {}
+        for group, cat in self._groups.items():
+            if cat in self.markers:
+                ms = sorted(set(self.markers[cat]), key=len, reverse=True)
+                alternatives[group] = "|".join(re.escape(m) for m in ms)
+            else:
+                alternatives[group] = self.regexes[cat]
+        alternatives = {g: a for g, a in alternatives.items() if a}
+        any_hit = "|".join(f"(?:{a})" for a in alternatives.values())
+        per_group = "".join(f"(?=(?P<{g}>{a}))?" for g, a in alternatives.items())
+        self._pattern = re.compile(f"(?=(?:{any_hit})){per_group}") if alternatives else None
+
+    def scan(self, text: str) -> dict[str, list[str]]:
+        """{category: distinct hits}; marker hits in marker-list order,
+        regex hits in text order."""
+        found: dict[str, dict[str, None]] = {cat: {} for cat in self.categories}
+        if self._pattern is None:
+            return {cat: [] for cat in self.categories}
+        t = text.lower() if self.ignore_case else text
+        for m in self._pattern.finditer(t):
+            for group, hit in m.groupdict().items():
+                if hit is None:
+                    continue
+                cat = self._groups[group]
+                found[cat][hit] = None
+                for p in self._prefixes.get(cat, {}).get(hit, ()):
+                    found[cat][p] = None
+        out = {}
+        for cat, hits in found.items():
+            if cat in self._order:
+                out[cat] = sorted(hits, key=self._order[cat].__getitem__)
+            else:
+                out[cat] = list(hits)
+        return out
+
+    def fingerprint(self) -> str:
+        """sha256 of the marker lists, regexes and case mode: equal
+        fingerprints scan every text the same way."""
+        payload = json.dumps([self.markers, self.regexes, self.ignore_case], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def counts(self, text: str) -> dict[str, int]:
+        return {cat: len(hits) for cat, hits in self.scan(text).items()}
+
+
+def strip_leading(text: str, patterns: list[str], flags=re.IGNORECASE) -> str:
+    """Repeatedly strip any of `patterns` (tried in order) from the start of
+    text, one combined regex instead of one re.sub per pattern."""
+    combined = re.compile("|".join(f"(?:{p.lstrip('^')})" for p in patterns), flags)
+    t = text.lstrip()
+    while True:
+        m = combined.match(t)
+        if not m or not m.end():
+            return t
+        t = t[m.end() :].lstrip()
+
+
+def _scan_batch(job) -> list[dict[str, list[str]]]:
+    matcher, texts = job
+    return [matcher.scan(t) for t in texts]
+
+
+def scan_corpus(
+    jobs: dict, processes: int | None = None, chunksize: int = 64
+) -> dict[str, list[dict[str, list[str]]]]:
+    """Scan several corpora in ONE process pool.
+
+    jobs: {key: (matcher, texts)} — e.g. one entry per author, each with
+    its own matcher. Texts go to workers in chunks of `chunksize` (the
+    matcher is pickled with each chunk and recompiled there). Returns
+    {key: [scan(text) for text in texts]}.
+    """
+    batches = [
+        (key, (matcher, texts[i : i + chunksize]))
+        for key, (matcher, texts) in jobs.items()
+        for i in range(0, len(texts), chunksize)
+    ]
+    out = {key: [] for key in jobs}
+    if processes == 1 or len(batches) <= 1:
+        for key, job in batches:
+            out[key] += _scan_batch(job)
+        return out
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for (key, _), hits in zip(batches, pool.map(_scan_batch, [j for _, j in batches])):
+            out[key] += hits
+    return out
+
+
+def scan_many(
+    matcher: MarkerMatcher, texts: list[str], processes: int | None = None, chunksize: int = 64
+) -> list[dict[str, list[str]]]:
+    """matcher.scan over many texts in a process pool (serial if processes=1)."""
+    return scan_corpus({"texts": (matcher, texts)}, processes, chunksize)["texts"]
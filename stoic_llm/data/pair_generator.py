@@ -1,10 +1,75 @@
+import asyncio
+import hashlib
 import json
-import re
 import random
-import time
 import anthropic
 from pathlib import Path
-from stoic_llm.config import PROCESSED_DIR, NEUTRAL_PAIR_PROMPT
+from stoic_llm.config import DEDUP_THRESHOLD, PROCESSED_DIR, NEUTRAL_PAIR_PROMPT
+from stoic_llm.data.journal import append_records, read_journal, run_jobs
+from stoic_llm.data.markers import MarkerMatcher
+from stoic_llm.data.processor import read_chunks_file
+from stoic_llm.data.store import DatasetStore
+
+BIBLIO_MARKERS = [
+    "pp.",
+    "Vol.",
+    "ISBN",
+    "Published",
+    "published",
+    "Editor",
+    "Reprinted",
+    "translation",
+    "emendation",
+    "corrupt",
+    "Casaubon",
+]
+BIOGRAPHICAL_MARKERS = [
+    "was born",
+    "his death",
+    "his life",
+    "his daily life",
+    "we meet with",
+    "translator",
+    "preface",
+    "biography",
+    "the author",
+    "his reign",
+    "Faustina",
+    "Commodus",
+    "Hadrian",
+    "A.D.",
+    "B.C.",
+    "born in",
+    "died in",
+    "rhetorician",
+    "bestseller",
+    "vernacular",
+    "founder of",
+    "Cyprus",
+    "present century",
+]
+
+
+def build_filter_matcher(author_name):
+    """The chunk filter's matcher for one author (display name, e.g.
+    "Marcus Aurelius"): marker lists, the author's surname, and the
+    citation / page-range regexes, in one compiled pass per chunk (see
+    stoic_llm.data.markers)."""
+    return MarkerMatcher(
+        {
+            "biblio": BIBLIO_MARKERS,
+            "biographical": BIOGRAPHICAL_MARKERS,
+            "names_self": [author_name.split()[-1]],
+        },
+        regexes={
+            # Citation pattern: "Word, 1933." / "New York, 1955" —
+            # city/publisher + year. Catches bibliography entries
+            # regardless of length.
+            "citation": r",\s+\d{4}\b",
+            # "pp. 153-162" page ranges
+            "pages": r"pp\.\s*\d+",
+        },
+    )
 
 
 class NeutralPairCreator:
@@ -12,14 +77,14 @@ class NeutralPairCreator:
         self.chunks_file = chunks_file
         self.author_name = author_name
         self.neutral_pair_path = PROCESSED_DIR
+        self.api_key = api_key
         self.client = anthropic.Anthropic(api_key=api_key)
+        self._async_client = None
+        self._filter_matcher = None
 
     def read_chunks(self):
-        """Read file and its chunks"""
-        chunks_file = Path(self.chunks_file)
-        with open(chunks_file) as f:
-            chunks = json.load(f)
-        return chunks
+        """Read file and its chunks (.json or streamed .jsonl)"""
+        return read_chunks_file(self.chunks_file)
 
     def _is_non_philosophical(self, text):
         """Flag chunks that are citations or biographical/editorial prose ABOUT
@@ -30,87 +95,190 @@ class NeutralPairCreator:
         not contamination. Filtering on them amputates real Meditations content
         (e.g. Book II opening). Only biographical/editorial markers remain.
         """
-        biblio_markers = [
-            "pp.",
-            "Vol.",
-            "ISBN",
-            "Published",
-            "published",
-            "Editor",
-            "Reprinted",
-            "translation",
-            "emendation",
-            "corrupt",
-            "Casaubon",
-        ]
-        biographical_markers = [
-            "was born",
-            "his death",
-            "his life",
-            "his daily life",
-            "we meet with",
-            "translator",
-            "preface",
-            "biography",
-            "the author",
-            "his reign",
-            "Faustina",
-            "Commodus",
-            "Hadrian",
-            "A.D.",
-            "B.C.",
-            "born in",
-            "died in",
-            "rhetorician",
-            "bestseller",
-            "vernacular",
-            "founder of",
-            "Cyprus",
-            "present century",
-        ]
-
-        # Citation pattern: "Word, 1933." / "New York, 1955" — city/publisher + year.
-        # Catches bibliography entries regardless of length.
-        has_citation = bool(re.search(r",\s+\d{4}\b", text))
-
-        # "pp. 153-162" page ranges
-        has_pages = bool(re.search(r"pp\.\s*\d+", text))
+        return self._non_philosophical_verdict(self.filter_hits(text))
 
-        biblio_count = sum(1 for m in biblio_markers if m in text)
-        biographical_count = sum(1 for m in biographical_markers if m in text)
+    @property
+    def filter_matcher(self):
+        if self._filter_matcher is None:
+            self._filter_matcher = build_filter_matcher(self.author_name)
+        return self._filter_matcher
 
-        surname = self.author_name.split()[-1]
-        names_self = surname in text
+    def filter_hits(self, text):
+        """Which filter markers occur in text, by category."""
+        return self.filter_matcher.scan(text)
 
+    @staticmethod
+    def _non_philosophical_verdict(hits):
+        biblio_count = len(hits["biblio"])
+        biographical_count = len(hits["biographical"])
         return (
             biblio_count >= 2
             or biographical_count >= 2
-            or (names_self and biographical_count >= 1)
+            or (bool(hits["names_self"]) and biographical_count >= 1)
         )
 
-    def filter_chunks_by_length(self, chunks, min_chars=300, max_chars=1000):
-        """Keep chunks within character count range, excluding non-philosophical text."""
+    def dedup_chunks(self, chunks, threshold=DEDUP_THRESHOLD):
+        """Drop near-duplicate chunks (MinHash LSH, first occurrence kept).
+        Dropped clusters are reported in chunk_dedup_report.json."""
+        from stoic_llm.data.dedup import MinHashDeduper
+
+        author = Path(self.chunks_file).parent.name
+        report_path = self.neutral_pair_path / author / "chunk_dedup_report.json"
+        kept, report = MinHashDeduper(threshold=threshold).dedup(chunks, report_path=report_path)
+        print(
+            f"Dedup (Jaccard >= {threshold}): dropped {report['n_dropped']} of "
+            f"{report['n_input']} chunks in {len(report['clusters'])} clusters -> {report_path}"
+        )
+        return kept
+
+    def filter_chunks_by_length(
+        self, chunks, min_chars=300, max_chars=1000, min_tokens=None, max_tokens=None
+    ):
+        """Keep chunks within character count range, excluding non-philosophical text.
+
+        min_tokens/max_tokens additionally bound the recorded "n_tokens" of
+        token-budget chunks (see TokenBudgetChunker); chunks without a count
+        pass that check.
+        """
+        def tokens_ok(c):
+            n = c.get("n_tokens")
+            if n is None:
+                return True
+            return (min_tokens is None or n >= min_tokens) and (max_tokens is None or n <= max_tokens)
+
         return [
             c
             for c in chunks
             if min_chars <= len(c["text"]) <= max_chars
+            and tokens_ok(c)
             and not self._is_non_philosophical(c["text"])
         ]
 
+    def _message_params(self, stoic_text, max_tokens=1000, model="claude-sonnet-4-20250514"):
+        prompt = NEUTRAL_PAIR_PROMPT.format(
+            author_name=self.author_name, stoic_text=stoic_text
+        )
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
     def generate_neutral_text(
         self, stoic_text, max_tokens=1000, model="claude-sonnet-4-20250514"
     ):
         """Generate neutral version using Claude API with contrastive prompt"""
-        prompt = NEUTRAL_PAIR_PROMPT.format(
-            author_name=self.author_name, stoic_text=stoic_text
-        )
         msg = self.client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
+            **self._message_params(stoic_text, max_tokens, model)
+        )
+        return msg.content[0].text
+
+    @property
+    def async_client(self):
+        # Retries are handled by run_jobs (with the journal), not the SDK.
+        if self._async_client is None:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0)
+        return self._async_client
+
+    async def agenerate_neutral_text(
+        self, stoic_text, max_tokens=1000, model="claude-sonnet-4-20250514"
+    ):
+        """Async generate_neutral_text, for concurrent pair generation."""
+        msg = await self.async_client.messages.create(
+            **self._message_params(stoic_text, max_tokens, model)
         )
         return msg.content[0].text
 
+    @property
+    def journal_path(self):
+        """Append-only record of every generated pair for this author."""
+        author = Path(self.chunks_file).parent.name
+        return self.neutral_pair_path / author / "neutral_pairs.journal.jsonl"
+
+    @staticmethod
+    def journal_key(chunk):
+        """Journal id for a chunk: its id plus a hash of its text, so a
+        rechunked file never reuses a pair made from different text."""
+        digest = hashlib.sha256(chunk["text"].encode()).hexdigest()[:12]
+        return f"{chunk['id']}-{digest}"
+
+    @property
+    def selection_path(self):
+        """Activation-ranked chunk choice (scripts/select_chunks.py)."""
+        author = Path(self.chunks_file).parent.name
+        return self.neutral_pair_path / author / "chunk_selection.json"
+
+    def selected_chunk_ids(self):
+        """Chunk ids from selection_path in rank order, or None if absent."""
+        if not self.selection_path.exists():
+            return None
+        with open(self.selection_path) as f:
+            return [s["id"] for s in json.load(f)["selected"]]
+
+    def _generate_batch(self, to_process, poll_initial=10.0):
+        """Submit every chunk not yet in the journal as ONE Message Batch.
+
+        The batch id and each request's chunk (id + text) are persisted next
+        to the journal, so a restarted run resumes polling the same batch
+        and journals every result it returns, even when this run asked for
+        a different set of chunks; any chunks still missing then go into a
+        new batch. The batch state is cleared only once every result is
+        journaled (errors included).
+        """
+        from stoic_llm.batches import MessageBatchJob
+
+        state_path = self.journal_path.with_name("neutral_pairs.batch.json")
+        job = MessageBatchJob(self.client, state_path, poll_initial=poll_initial)
+        while True:
+            journal = read_journal(self.journal_path)
+            done = {i for i, rec in journal.items() if not rec.get("error")}
+            todo = {self.journal_key(c): c for c in to_process if self.journal_key(c) not in done}
+            print(f"Journal {self.journal_path.name}: {len(done)} done, {len(todo)} to batch")
+
+            state = job.load_state()
+            resumed = state is not None
+            if resumed:
+                print(f"↻ Resuming batch {state['batch_id']} from {state_path}")
+            elif not todo:
+                return journal
+            else:
+                state = job.submit(
+                    {key: self._message_params(c["text"]) for key, c in todo.items()},
+                    meta={"chunks": {key: {"id": c["id"], "text": c["text"]} for key, c in todo.items()}},
+                )
+            job.wait(state["batch_id"])
+
+            chunks = state.get("chunks", {})
+            records, unaccounted = [], []
+            for key, res in job.results(state).items():
+                chunk = chunks.get(key)
+                if chunk is None:
+                    unaccounted.append(key)
+                elif "error" in res:
+                    records.append({"id": key, "chunk_id": chunk["id"], "error": res["error"]})
+                else:
+                    records.append(
+                        {
+                            "id": key,
+                            "chunk_id": chunk["id"],
+                            "stoic_text": chunk["text"],
+                            "neutral_text": res["text"],
+                        }
+                    )
+            append_records(self.journal_path, records)
+            n_err = sum(1 for r in records if "error" in r)
+            print(f"✓ Batch done: {len(records) - n_err} ok, {n_err} errored (re-run to retry)")
+            if unaccounted:
+                # e.g. a batch submitted before chunk texts were stored in
+                # the state: keep it rather than discard paid results.
+                raise RuntimeError(
+                    f"{len(unaccounted)} results of batch {state['batch_id']} have no recorded "
+                    f"chunk; kept {state_path}. Recover them, or delete it to submit new batches."
+                )
+            job.clear()
+            if not resumed:
+                return read_journal(self.journal_path)
+
     def save_neutral_pairs(self, pairs):
         author = Path(self.chunks_file).parent.name
         out = self.neutral_pair_path / author / "neutral_pairs.json"
@@ -118,15 +286,66 @@ class NeutralPairCreator:
         with open(out, "w") as f:
             json.dump({"pairs": pairs}, f, indent=2)
         print(f"Saved {len(pairs)} pairs to {out}")
+        DatasetStore().ingest_pairs(out)
+
+    def pairs_from_journal(self, chunks=None, journal=None):
+        """Successful pairs from the journal for these chunks, in order
+        (default: every journal entry, in journal order)."""
+        journal = read_journal(self.journal_path) if journal is None else journal
+        keys = [self.journal_key(c) for c in chunks] if chunks is not None else list(journal)
+        pairs = []
+        for key in keys:
+            rec = journal.get(key)
+            if rec is None or rec.get("error"):
+                continue
+            pairs.append(
+                {
+                    "id": rec.get("chunk_id", rec["id"]),
+                    "stoic_text": rec["stoic_text"],
+                    "neutral_text": rec["neutral_text"],
+                }
+            )
+        return pairs
+
+    def create_pairs(
+        self,
+        num_pairs=100,
+        min_chars=300,
+        max_chars=1000,
+        seed=613,
+        concurrency=8,
+        requests_per_minute=50,
+        max_retries=5,
+        backend="async",
+        dedup_threshold=DEDUP_THRESHOLD,
+        chunk_ids=None,
+    ):
+        """Generate N pairs concurrently and save to file.
 
-    def create_pairs(self, num_pairs=100, min_chars=300, max_chars=1000, seed=613):
-        """Generate N pairs and save to file"""
-        chunks = self.read_chunks()
+        Resumable: results go to journal_path as they arrive and the final
+        neutral_pairs.json is built from the journal.
+
+        backend="batch" submits all pending chunks as one Message Batch
+        instead (cheaper, not interactive; see stoic_llm.batches).
+        dedup_threshold=None skips near-duplicate removal.
+        chunk_ids: generate for these chunks (in this order, first num_pairs
+        that pass the filters) instead of a random sample, e.g.
+        selected_chunk_ids().
+        """
+        if backend not in ("async", "batch"):
+            raise ValueError(f"Unknown backend {backend!r}. Use 'async' or 'batch'.")
+        chunks = self.read_chunks()["chunks"]
+        if dedup_threshold is not None:
+            chunks = self.dedup_chunks(chunks, threshold=dedup_threshold)
         filtered = self.filter_chunks_by_length(
-            chunks["chunks"], min_chars=min_chars, max_chars=max_chars
+            chunks, min_chars=min_chars, max_chars=max_chars
         )
 
-        if len(filtered) > num_pairs:
+        if chunk_ids is not None:
+            by_id = {c["id"]: c for c in filtered}
+            to_process = [by_id[i] for i in chunk_ids if i in by_id][:num_pairs]
+            print(f"Using {len(to_process)} pre-selected chunks")
+        elif len(filtered) > num_pairs:
             random.seed(seed)
             to_process = random.sample(filtered, num_pairs)
         else:
@@ -136,26 +355,31 @@ class NeutralPairCreator:
                     f"⚠ Only {len(filtered)} chunks available (requested {num_pairs})"
                 )
 
-        pairs = []
         print(f"Found {len(filtered)} filtered chunks")
         print(f"Generating {len(to_process)} neutral pairs for {self.author_name}...\n")
 
-        for i, chunk in enumerate(to_process, 1):
-            print(f"[{i}/{len(to_process)}] Chunk {chunk['id']}...")
-            try:
-                original = chunk["text"]
-                neutral = self.generate_neutral_text(original)
-                pairs.append(
-                    {
-                        "id": chunk["id"],
-                        "stoic_text": original,
-                        "neutral_text": neutral,
-                    }
+        async def make_pair(job):
+            chunk = job["chunk"]
+            neutral = await self.agenerate_neutral_text(chunk["text"])
+            return {"chunk_id": chunk["id"], "stoic_text": chunk["text"], "neutral_text": neutral}
+
+        # Each pair is journaled as it arrives, keyed by chunk id + text
+        # hash; a re-run skips chunks already there, so a crash costs only
+        # the in-flight requests, and rechunked text is regenerated.
+        if backend == "batch":
+            journal = self._generate_batch(to_process)
+        else:
+            journal = asyncio.run(
+                run_jobs(
+                    [{"id": self.journal_key(c), "chunk": c} for c in to_process],
+                    make_pair,
+                    self.journal_path,
+                    concurrency=concurrency,
+                    requests_per_minute=requests_per_minute,
+                    max_retries=max_retries,
                 )
-            except Exception as e:
-                print(f"  ✗ Failed: {e}")
-                continue
-            time.sleep(0.5)
+            )
+        pairs = self.pairs_from_journal(to_process, journal)
 
         print(f"\n✓ Generated {len(pairs)} pairs for {self.author_name}!")
         self.save_neutral_pairs(pairs)
@@ -1,8 +1,236 @@
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from stoic_llm.config import CHUNKED_DIR, PROCESSED_DIR
 
+FOOTNOTE_RE = re.compile(r"\[\d+\]")
+
+
+def iter_paragraphs(file_path, encoding="utf-8"):
+    """Yield the paragraphs of a text file, reading it line by line.
+
+    Same split as the old whole-file version (footnote markers like "[12]"
+    removed, blank lines separate paragraphs, whitespace stripped), but only
+    the current paragraph is held in memory.
+    """
+    buf = []
+    with open(file_path, "r", encoding=encoding) as f:
+        for line in f:
+            line = FOOTNOTE_RE.sub("", line)
+            if line == "\n":
+                para = "".join(buf).strip()
+                if para:
+                    yield para
+                buf = []
+            else:
+                buf.append(line)
+    para = "".join(buf).strip()
+    if para:
+        yield para
+
+
+def chunk_uid(author, file_name, chunk_id):
+    """Stable id of a chunk across runs: author/file/position."""
+    return f"{author}/{file_name}/{chunk_id:05d}"
+
+
+def iter_chunks(chunks_file):
+    """Yield chunk dicts from a chunked .jsonl (streamed) or .json file."""
+    chunks_file = Path(chunks_file)
+    with open(chunks_file, encoding="utf-8") as f:
+        if chunks_file.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)["chunks"]
+
+
+def read_chunks_file(chunks_file):
+    """Load a chunked .json or .jsonl file in the .json layout
+    ({"source_file", "author", "total_chunks", "chunks"})."""
+    chunks_file = Path(chunks_file)
+    if chunks_file.suffix != ".jsonl":
+        with open(chunks_file, encoding="utf-8") as f:
+            return json.load(f)
+    chunks = list(iter_chunks(chunks_file))
+    return {
+        "source_file": str(chunks_file),
+        "author": chunks_file.parent.name,
+        "total_chunks": len(chunks),
+        "chunks": chunks,
+    }
+
+
+def find_chunk_files(author_dir):
+    """Chunk files of one author, one per book; .jsonl wins over .json."""
+    files = {}
+    for path in sorted(Path(author_dir).glob("*.json")) + sorted(Path(author_dir).glob("*.jsonl")):
+        files[path.stem] = path
+    return [files[stem] for stem in sorted(files)]
+
+
+# Sentence end: terminal punctuation, optional closing quote/bracket, space.
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])([\"'\u201d\u2019)\]]*)\s+")
+
+
+def sentence_spans(text):
+    """(start, end) character spans of the sentences in text."""
+    spans, start = [], 0
+    for m in SENTENCE_END_RE.finditer(text):
+        spans.append((start, m.end(1)))
+        start = m.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return [(a, b) for a, b in spans if text[a:b].strip()]
+
+
+class TokenBudgetChunker:
+    """Merge/split paragraphs into chunks of min_tokens..max_tokens tokens.
+
+    Paragraphs are tokenized in batches (one fast-tokenizer call per
+    batch). Paragraphs over max_tokens are split at sentence boundaries
+    (and a single over-long sentence at token boundaries); consecutive
+    pieces under min_tokens are merged, never past max_tokens. Every chunk
+    gets its exact token count (no special tokens), so downstream batching
+    can bucket by length without tokenizing again.
+    """
+
+    def __init__(self, tokenizer, min_tokens=128, max_tokens=384, batch_size=256, joiner="\n\n"):
+        if not getattr(tokenizer, "is_fast", False):
+            raise ValueError("TokenBudgetChunker needs a fast tokenizer (offset mapping)")
+        if not 0 < min_tokens <= max_tokens:
+            raise ValueError(f"Need 0 < min_tokens <= max_tokens, got {min_tokens}, {max_tokens}")
+        self.tokenizer = tokenizer
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.batch_size = batch_size
+        self.joiner = joiner
+
+    def count(self, texts):
+        """Token counts of texts, one batched call."""
+        if not texts:
+            return []
+        ids = self.tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+        return [len(x) for x in ids]
+
+    def _hard_split(self, text):
+        """Cut one over-long sentence every max_tokens tokens."""
+        enc = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = enc["offset_mapping"]
+        pieces = []
+        for i in range(0, len(offsets), self.max_tokens):
+            window = offsets[i : i + self.max_tokens]
+            end = offsets[i + self.max_tokens][0] if i + self.max_tokens < len(offsets) else len(text)
+            piece = text[window[0][0] : end].strip()
+            if piece:
+                pieces.append(piece)
+        return pieces
+
+    def _split(self, paragraph):
+        """Sentence groups of one over-long paragraph, each <= max_tokens."""
+        sentences = [paragraph[a:b].strip() for a, b in sentence_spans(paragraph)]
+        pieces = []
+        for sent, n in zip(sentences, self.count(sentences)):
+            if n > self.max_tokens:
+                pieces += self._hard_split(sent)
+            else:
+                pieces.append(sent)
+        groups = self._pack(pieces, self.count(pieces), target=self.max_tokens)
+        return [text for text, _ in self._fit(groups, " ")]
+
+    def _pack(self, pieces, counts, target):
+        """Greedily group consecutive pieces until `target` tokens (summed
+        piece counts), never past max_tokens. A group cut short by a large
+        next piece is folded into the previous group when that still fits."""
+        groups, sizes, buf, buf_n = [], [], [], 0
+        for piece, n in zip(pieces, counts):
+            if buf and buf_n + n > self.max_tokens:
+                if buf_n < self.min_tokens and sizes and sizes[-1] + buf_n <= self.max_tokens:
+                    groups[-1] += buf
+                    sizes[-1] += buf_n
+                else:
+                    groups.append(buf)
+                    sizes.append(buf_n)
+                buf, buf_n = [], 0
+            buf.append(piece)
+            buf_n += n
+            if buf_n >= target:
+                groups.append(buf)
+                sizes.append(buf_n)
+                buf, buf_n = [], 0
+        if buf:
+            groups.append(buf)
+        return groups
+
+    def _fit(self, groups, joiner):
+        """[(text, exact n_tokens)] for joined groups. Token counts are not
+        exactly additive across a join, so a group that tokenizes past
+        max_tokens gives up its last piece to a group of its own."""
+        texts = [joiner.join(g) for g in groups]
+        out = []
+        for group, text, n in zip(groups, texts, self.count(texts)):
+            if n <= self.max_tokens or len(group) == 1:
+                out.append((text, n))
+            else:
+                out += self._fit([group[:-1], group[-1:]], joiner)
+        return out
+
+    def chunk(self, paragraphs):
+        """Yield (text, n_tokens) chunks from an iterable of paragraphs."""
+        batch = []
+        carry = []  # pieces of a short last chunk, merged into the next batch
+        for para in paragraphs:
+            batch.append(para)
+            if len(batch) >= self.batch_size:
+                done, carry = self._chunk_batch(carry, batch)
+                yield from done
+                batch = []
+        done, carry = self._chunk_batch(carry, batch)
+        yield from done
+        if carry:
+            yield from self._fit([carry], self.joiner)
+
+    def _chunk_batch(self, carry, paragraphs):
+        pieces = list(carry)
+        for para, n in zip(paragraphs, self.count(paragraphs)):
+            pieces += self._split(para) if n > self.max_tokens else [para]
+        groups = self._pack(pieces, self.count(pieces), target=self.min_tokens)
+        if groups and sum(self.count(groups[-1])) < self.min_tokens:
+            # Hold a short last group back: it may merge with the next batch.
+            return self._fit(groups[:-1], self.joiner), groups[-1]
+        return self._fit(groups, self.joiner), []
+
+
+_tokenizers = {}
+
+
+def _load_tokenizer(model_name):
+    # One tokenizer per worker process, reused across files.
+    if model_name not in _tokenizers:
+        from transformers import AutoTokenizer
+
+        _tokenizers[model_name] = AutoTokenizer.from_pretrained(model_name)
+    return _tokenizers[model_name]
+
+
+def length_buckets(chunks, width=64):
+    """{bucket: [chunks]} by recorded n_tokens, bucket = n_tokens // width,
+    for length-bucketed batching without re-tokenizing."""
+    buckets = {}
+    for c in chunks:
+        buckets.setdefault(c["n_tokens"] // width, []).append(c)
+    return dict(sorted(buckets.items()))
+
+
+def _chunk_job(job):
+    author, file_path, file_name, fmt, token_budget = job
+    processor = TextProcessor()
+    if fmt == "jsonl":
+        return processor._stream_single_file(author, file_path, file_name, token_budget)
+    return processor._chunk_single_file(author, file_path, file_name, token_budget)
+
 
 class TextProcessor:
     def __init__(self, text_path=None):
@@ -12,38 +240,82 @@ class TextProcessor:
         """
         self.text_path = Path(text_path) if text_path else None
 
-    def chunk_by_paragraph(self):
-        """Chunk text(s) into paragraphs"""
+    def chunk_by_paragraph(self, fmt="jsonl", workers=None, token_budget=None):
+        """Chunk text(s) into paragraphs.
+
+        Args:
+            fmt: "jsonl" (streamed, one chunk per line) or "json" (one document)
+            workers: processes for multi-file runs (None = all cores, 1 = serial)
+            token_budget: merge/split paragraphs to a token window (see chunk_files)
+        """
         if self.text_path:
             # Process single file
-            author = self.text_path.parent.name
-            file_name = str(self.text_path.name).replace(".txt", "")
-            self._chunk_single_file(author, self.text_path, file_name)
+            files = [self.text_path]
         else:
             # Process all files in PROCESSED_DIR
-            all_files = list(PROCESSED_DIR.rglob("*.txt"))
-            for file_path in all_files:
-                author = file_path.parent.name
-                file_name = str(file_path.name).replace(".txt", "")
-                self._chunk_single_file(author, file_path, file_name)
+            files = sorted(PROCESSED_DIR.rglob("*.txt"))
+        return self.chunk_files(files, fmt=fmt, workers=workers, token_budget=token_budget)
 
-    def _chunk_single_file(self, author, file_path, file_name):
-        """Chunk a single file and save to CHUNKED_DIR"""
-        # Read file
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
+    def chunk_files(self, files, fmt="jsonl", workers=None, token_budget=None):
+        """Chunk several text files in parallel (one process per file).
+        Returns [(chunked_file_path, n_chunks)] in input order.
+
+        token_budget: None for one chunk per paragraph, or a dict like
+        {"model_name": ..., "min_tokens": 128, "max_tokens": 384} for
+        TokenBudgetChunker chunks with an "n_tokens" field.
+        """
+        if fmt not in ("jsonl", "json"):
+            raise ValueError(f"Unknown format '{fmt}'. Choose 'jsonl' or 'json'.")
+        jobs = [
+            (Path(p).parent.name, Path(p), str(Path(p).name).replace(".txt", ""), fmt, token_budget)
+            for p in files
+        ]
+        if workers == 1 or len(jobs) <= 1:
+            return [_chunk_job(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_chunk_job, jobs))
+
+    def _iter_chunk_records(self, author, file_path, file_name, token_budget=None):
+        """Yield {"id", "uid", "text"[, "n_tokens"]} for one file, streamed."""
+        if token_budget is None:
+            for i, para in enumerate(iter_paragraphs(file_path), 1):
+                yield {"id": i, "uid": chunk_uid(author, file_name, i), "text": para}
+            return
+        budget = dict(token_budget)
+        tokenizer = _load_tokenizer(budget.pop("model_name"))
+        chunker = TokenBudgetChunker(tokenizer, **budget)
+        for i, (text, n) in enumerate(chunker.chunk(iter_paragraphs(file_path)), 1):
+            yield {"id": i, "uid": chunk_uid(author, file_name, i), "text": text, "n_tokens": n}
+
+    def _stream_single_file(self, author, file_path, file_name, token_budget=None):
+        """Chunk a single file to CHUNKED_DIR/author/file_name.jsonl,
+        one record per line, never holding the whole book."""
+        chunked_file_path = CHUNKED_DIR / author / f"{file_name}.jsonl"
+        chunked_file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = chunked_file_path.with_name(chunked_file_path.name + ".tmp")
+
+        n = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self._iter_chunk_records(author, file_path, file_name, token_budget):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                n = record["id"]
+        tmp_path.replace(chunked_file_path)
 
-        text = re.sub(r"\[\d+\]", "", text)
+        print(f"✓ Saved {n} chunks to {chunked_file_path}")
+        return chunked_file_path, n
 
-        # Split by paragraphs
-        paragraphs = text.split("\n\n")
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
+    def _chunk_single_file(self, author, file_path, file_name, token_budget=None):
+        """Chunk a single file and save to CHUNKED_DIR"""
+        chunks = [
+            {k: v for k, v in record.items() if k != "uid"}
+            for record in self._iter_chunk_records(author, file_path, file_name, token_budget)
+        ]
 
         chunks_data = {
             "source_file": str(file_path),
             "author": author,
-            "total_chunks": len(paragraphs),
-            "chunks": [{"id": i, "text": para} for i, para in enumerate(paragraphs, 1)],
+            "total_chunks": len(chunks),
+            "chunks": chunks,
         }
 
         # Save chunks to CHUNKED_DIR/author_name/chunk_001.txt, etc.
@@ -53,4 +325,5 @@ class TextProcessor:
         with open(chunked_file_path, "w", encoding="utf-8") as f:
             json.dump(chunks_data, f, indent=2, ensure_ascii=False)
 
-        print(f"✓ Saved {len(paragraphs)} chunks to {chunked_file_path}")
+        print(f"✓ Saved {len(chunks)} chunks to {chunked_file_path}")
+        return chunked_file_path, len(chunks)
@@ -0,0 +1,286 @@
+"""Columnar (Parquet) store for chunks and pairs, with provenance.
+
+Chunks, raw/clean/rejected pairs and their variants each live in a
+pretty-printed JSON file that every script re-parses whole. The store
+mirrors them as Parquet, one file per source file, partitioned by author:
+
+    store/chunks/author=seneca/moral_letters.parquet
+    store/pairs/author=seneca/neutral_pairs.parquet
+    store/pairs/author=seneca/neutral_pairs_clean.parquet
+    ...
+
+    chunks   uid, id, source, text, n_chars, n_tokens, filter_hits
+             ("category:hit" list from the chunk filter), non_philosophical
+    pairs    uid, id, pair_set (file stem), status (raw | clean | rejected),
+             reject_reason, stoic_text, neutral_text, stoic_chars,
+             neutral_chars
+
+Each Parquet file records the JSON it was built from (path, size, mtime)
+in its schema metadata; chunk files also record the fingerprint of the
+chunk filter that produced filter_hits, so editing a marker list or regex
+makes them stale. Reads are memory-mapped and take filters, pushed
+down to partition pruning (author) and row-group statistics. The JSON
+files stay the source of truth for review and git: writers re-ingest
+after writing, and read_pairs() falls back to the JSON whenever the
+store copy is missing or older than the file.
+
+Usage:
+    store = DatasetStore()
+    store.sync()                                   # ingest new/changed files
+    store.pairs([("status", "=", "clean")], columns=["stoic_text"])
+    read_pairs(PROCESSED_DIR / "seneca" / "neutral_pairs.json")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from stoic_llm.config import CHUNKED_DIR, PROCESSED_DIR, SOURCES_CONFIG, STORE_DIR
+
+PARTITIONING = ds.partitioning(pa.schema([("author", pa.string())]), flavor="hive")
+
+CHUNK_SCHEMA = pa.schema(
+    [
+        ("uid", pa.string()),
+        ("id", pa.int64()),
+        ("source", pa.string()),
+        ("text", pa.string()),
+        ("n_chars", pa.int32()),
+        ("n_tokens", pa.int32()),
+        ("filter_hits", pa.list_(pa.string())),
+        ("non_philosophical", pa.bool_()),
+    ]
+)
+
+PAIR_SCHEMA = pa.schema(
+    [
+        ("uid", pa.string()),
+        ("id", pa.int64()),
+        ("pair_set", pa.string()),
+        ("status", pa.string()),
+        ("reject_reason", pa.string()),
+        ("stoic_text", pa.string()),
+        ("neutral_text", pa.string()),
+        ("stoic_chars", pa.int32()),
+        ("neutral_chars", pa.int32()),
+    ]
+)
+
+
+def pair_status(pair_set):
+    """Status of the pairs in a file, from its stem."""
+    if pair_set.endswith("_clean"):
+        return "clean"
+    if pair_set.endswith("_rejected"):
+        return "rejected"
+    return "raw"
+
+
+def _load_pairs_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data["pairs"] if isinstance(data, dict) else data
+
+
+def _author_names():
+    """author folder -> display name, from sources.json."""
+    if not SOURCES_CONFIG.exists():
+        return {}
+    with open(SOURCES_CONFIG) as f:
+        return {s["author_folder"]: s["author"] for s in json.load(f).values()}
+
+
+class DatasetStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+
+    # ---- layout + provenance -----------------------------------------------
+
+    def _file(self, table, author, name):
+        return self.root / table / f"author={author}" / f"{name}.parquet"
+
+    def _write(self, table, dest, source, extra=None):
+        st = Path(source).stat()
+        provenance = {
+            "source": str(source),
+            "source_size": str(st.st_size),
+            "source_mtime_ns": str(st.st_mtime_ns),
+            "ingested_at": datetime.now().isoformat(),
+            **(extra or {}),
+        }
+        table = table.replace_schema_metadata({k.encode(): v.encode() for k, v in provenance.items()})
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f"{dest.name}.tmp{os.getpid()}")
+        pq.write_table(table, tmp, row_group_size=256)
+        tmp.replace(dest)
+        return dest
+
+    def provenance(self, dest):
+        if not dest.exists():
+            return None
+        meta = pq.read_schema(dest).metadata or {}
+        return {k.decode(): v.decode() for k, v in meta.items()}
+
+    def is_current(self, dest, source, filter_fingerprint=None):
+        """True if dest was built from source as it is now (and, for chunk
+        files, with the chunk filter whose fingerprint is given)."""
+        prov = self.provenance(dest)
+        if prov is None or not Path(source).exists():
+            return False
+        if filter_fingerprint is not None and prov.get("filter_fingerprint") != filter_fingerprint:
+            return False
+        st = Path(source).stat()
+        return prov.get("source_size") == str(st.st_size) and prov.get(
+            "source_mtime_ns"
+        ) == str(st.st_mtime_ns)
+
+    # ---- ingest ------------------------------------------------------------
+
+    def ingest_chunks(self, path, author=None, author_name=None):
+        """Store a chunk file (.json or .jsonl), with the chunk filter's hits
+        per chunk. author defaults to the parent folder; author_name (for the
+        filter's surname check) to the name in sources.json."""
+        from stoic_llm.data.markers import scan_many
+        from stoic_llm.data.pair_generator import NeutralPairCreator, build_filter_matcher
+        from stoic_llm.data.processor import chunk_uid, read_chunks_file
+
+        path = Path(path)
+        author = author or path.parent.name
+        author_name = author_name or _author_names().get(author, author)
+        source = path.stem
+        chunks = read_chunks_file(path)["chunks"]
+        matcher = build_filter_matcher(author_name)
+        all_hits = scan_many(matcher, [c["text"] for c in chunks])
+
+        rows = []
+        for c, hits in zip(chunks, all_hits):
+            rows.append(
+                {
+                    "uid": c.get("uid") or chunk_uid(author, source, c["id"]),
+                    "id": c["id"],
+                    "source": source,
+                    "text": c["text"],
+                    "n_chars": len(c["text"]),
+                    "n_tokens": c.get("n_tokens"),
+                    "filter_hits": [f"{cat}:{h}" for cat, hs in hits.items() for h in hs],
+                    "non_philosophical": NeutralPairCreator._non_philosophical_verdict(hits),
+                }
+            )
+        table = pa.Table.from_pylist(rows, schema=CHUNK_SCHEMA)
+        return self._write(
+            table,
+            self._file("chunks", author, source),
+            path,
+            extra={"filter_fingerprint": matcher.fingerprint()},
+        )
+
+    def ingest_pairs(self, path, author=None):
+        """Store a pairs file ({"pairs": [...]} or a bare list); the file stem
+        is the pair_set and decides the status."""
+        path = Path(path)
+        author = author or path.parent.name
+        pair_set = path.stem
+        status = pair_status(pair_set)
+        rows = [
+            {
+                "uid": f"{author}/{pair_set}/{p.get('id')}",
+                "id": p.get("id"),
+                "pair_set": pair_set,
+                "status": status,
+                "reject_reason": p.get("_reject_reason"),
+                "stoic_text": p.get("stoic_text", ""),
+                "neutral_text": p.get("neutral_text", ""),
+                "stoic_chars": len(p.get("stoic_text", "")),
+                "neutral_chars": len(p.get("neutral_text", "")),
+            }
+            for p in _load_pairs_json(path)
+        ]
+        table = pa.Table.from_pylist(rows, schema=PAIR_SCHEMA)
+        return self._write(table, self._file("pairs", author, pair_set), path)
+
+    def sync(self, chunked_dir=CHUNKED_DIR, processed_dir=PROCESSED_DIR, force=False):
+        """Ingest every chunk and pairs file that is new or changed since
+        its last ingest (chunk files also when the chunk filter changed).
+        Returns {"ingested": [...], "current": n}."""
+        from stoic_llm.data.pair_generator import build_filter_matcher
+        from stoic_llm.data.processor import find_chunk_files
+
+        names = _author_names()
+        jobs = []
+        for author_dir in sorted(p for p in Path(chunked_dir).iterdir() if p.is_dir()):
+            author = author_dir.name
+            fingerprint = build_filter_matcher(names.get(author, author)).fingerprint()
+            for f in find_chunk_files(author_dir):
+                jobs.append(("chunks", f, self.ingest_chunks, fingerprint))
+        for author_dir in sorted(p for p in Path(processed_dir).iterdir() if p.is_dir()):
+            for f in sorted(author_dir.glob("neutral_pairs*.json")):
+                if f.name.endswith(".batch.json"):
+                    continue
+                jobs.append(("pairs", f, self.ingest_pairs, None))
+
+        ingested, current = [], 0
+        for table, f, ingest, fingerprint in jobs:
+            dest = self._file(table, f.parent.name, f.stem)
+            if not force and self.is_current(dest, f, fingerprint):
+                current += 1
+                continue
+            ingest(f)
+            ingested.append(str(f))
+            print(f"  ✓ {table}: {f.parent.name}/{f.name}")
+        return {"ingested": ingested, "current": current}
+
+    # ---- read --------------------------------------------------------------
+
+    def _read(self, table, filters=None, columns=None):
+        path = self.root / table
+        schema = CHUNK_SCHEMA if table == "chunks" else PAIR_SCHEMA
+        if not path.exists():
+            return schema.append(pa.field("author", pa.string())).empty_table()
+        return pq.read_table(
+            path,
+            columns=columns,
+            filters=filters,
+            memory_map=True,
+            partitioning=PARTITIONING,
+        )
+
+    def chunks(self, filters=None, columns=None):
+        """Chunk rows as a pyarrow Table. filters: pyarrow expression or
+        DNF list, e.g. [("author", "=", "seneca"), ("non_philosophical", "=", False)]."""
+        return self._read("chunks", filters, columns)
+
+    def pairs(self, filters=None, columns=None):
+        """Pair rows as a pyarrow Table, e.g. filters=[("status", "=", "clean")]."""
+        return self._read("pairs", filters, columns)
+
+    def pairs_for_file(self, path):
+        """Rows stored for one pairs JSON, or None if absent or stale."""
+        path = Path(path)
+        dest = self._file("pairs", path.parent.name, path.stem)
+        if not self.is_current(dest, path):
+            return None
+        return pq.read_table(dest, memory_map=True)
+
+
+def _as_pair(row):
+    pair = {"id": row["id"], "stoic_text": row["stoic_text"], "neutral_text": row["neutral_text"]}
+    if row["reject_reason"] is not None:
+        pair["_reject_reason"] = row["reject_reason"]
+    return pair
+
+
+def read_pairs(path, store=None):
+    """Pairs of a pairs JSON (raw, clean or rejected) as a list of dicts,
+    from the store when its copy is current, else from the JSON itself."""
+    store = store or DatasetStore()
+    table = store.pairs_for_file(path)
+    if table is None:
+        return _load_pairs_json(path)
+    return [_as_pair(r) for r in table.to_pylist()]
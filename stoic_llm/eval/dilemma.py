@@ -23,13 +23,11 @@ at: data/steering_vectors/{author}_clean.pt
 
 from __future__ import annotations
 
-import gc
 import json
 import math
 import time
 from pathlib import Path
 from typing import Optional
-from peft import PeftModel
 import torch
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]  # adjust if placed elsewhere
@@ -46,6 +44,53 @@ PROMPT_TEMPLATE = (
 )
 
 
+UNKNOWN_LABEL = "unknown"  # stream rows whose dilemma has no concept / stoic_stance
+
+
+def _stream_schema():
+    """One row per (item, condition) in run_stream's Parquet output."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("item_id", pa.string()),
+            ("concept", pa.string()),
+            ("stoic_stance", pa.string()),
+            ("condition", pa.string()),
+            ("layer", pa.int32()),
+            ("coeff", pa.float64()),
+            ("base_p_stoic", pa.float64()),
+            ("p_stoic", pa.float64()),
+            ("delta", pa.float64()),
+            ("delta_logit", pa.float64()),
+        ]
+    )
+
+
+def iter_dilemma_batches(path: Path, batch_size: int):
+    """Yield lists of dilemmas from a JSONL (or legacy JSON) file.
+
+    JSONL is read line by line, so only one batch is in memory.
+    """
+    path = Path(path)
+    if path.suffix != ".jsonl":
+        with open(path) as f:
+            dilemmas = json.load(f)["dilemmas"]
+        for i in range(0, len(dilemmas), batch_size):
+            yield dilemmas[i : i + batch_size]
+        return
+    batch = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
 class DilemmaEval:
     """Judge-free forced-choice evaluation of steering vectors."""
 
@@ -55,16 +100,39 @@ class DilemmaEval:
         self.model.eval()
         self._hook_handle = None
 
-        with open(dilemmas_path) as f:
-            payload = json.load(f)
-        self.dilemmas: list[dict] = payload["dilemmas"]
-        self.meta: dict = payload.get("meta", {})
+        # A .jsonl set (one dilemma per line) is NOT loaded here; run_stream()
+        # reads it in batches. The per-condition methods below need the
+        # in-memory .json set (see the dilemmas property).
+        self.dilemmas_path = Path(dilemmas_path)
+        self._dilemmas: Optional[list[dict]] = None
+        if self.dilemmas_path.suffix == ".jsonl":
+            self.meta: dict = {"stream": str(self.dilemmas_path)}
+        else:
+            with open(dilemmas_path) as f:
+                payload = json.load(f)
+            self._dilemmas = payload["dilemmas"]
+            self.meta = payload.get("meta", {})
 
         # Option-label token ids. Llama tokenizes " A" / " B" with leading
         # space as single tokens; fail loudly if that assumption breaks.
         self.tok_a = self._single_token_id(" A")
         self.tok_b = self._single_token_id(" B")
 
+    @property
+    def dilemmas(self) -> list[dict]:
+        """The in-memory dilemma set. A JSONL-backed instance has none:
+        fail loudly instead of returning empty results."""
+        if self._dilemmas is None:
+            raise ValueError(
+                f"{self.dilemmas_path} is a JSONL stream and is not loaded in memory; "
+                "use run_stream() / summarize_stream(), or pass a .json dilemma set."
+            )
+        return self._dilemmas
+
+    @dilemmas.setter
+    def dilemmas(self, dilemmas: list[dict]) -> None:
+        self._dilemmas = list(dilemmas)
+
     def _single_token_id(self, text: str) -> int:
         ids = self.tokenizer.encode(text, add_special_tokens=False)
         if len(ids) != 1:
@@ -104,6 +172,43 @@ class DilemmaEval:
         two = torch.stack([logits[self.tok_a], logits[self.tok_b]]).float()
         return torch.softmax(two, dim=0)[0].item()
 
+    @torch.no_grad()
+    def _p_first_label_batch(self, prompts: list[str]) -> list[float]:
+        """Batched _p_first_label: one forward pass over all prompts.
+
+        Right-padded, reading the logits at each row's last real token, so
+        positions match the unpadded single-prompt pass.
+        """
+        inputs = self.tokenizer(
+            prompts, return_tensors="pt", padding=True, padding_side="right"
+        ).to(self.model.device)
+        logits = self.model(**inputs).logits
+        last = inputs["attention_mask"].sum(dim=1) - 1
+        rows = logits[torch.arange(len(prompts)), last]
+        two = torch.stack([rows[:, self.tok_a], rows[:, self.tok_b]], dim=1).float()
+        return torch.softmax(two, dim=1)[:, 0].tolist()
+
+    @staticmethod
+    def _both_orders(dilemma: dict) -> tuple[str, str]:
+        """(stoic-is-A prompt, stoic-is-B prompt) for one dilemma."""
+        return (
+            PROMPT_TEMPLATE.format(
+                situation=dilemma["situation"],
+                option_a=dilemma["stoic"],
+                option_b=dilemma["nonstoic"],
+            ),
+            PROMPT_TEMPLATE.format(
+                situation=dilemma["situation"],
+                option_a=dilemma["nonstoic"],
+                option_b=dilemma["stoic"],
+            ),
+        )
+
+    def _p_stoic_batch(self, dilemmas: list[dict]) -> list[float]:
+        """p_stoic for a batch of dilemmas in one forward (both orders)."""
+        p = self._p_first_label_batch([q for d in dilemmas for q in self._both_orders(d)])
+        return [0.5 * (p[2 * j] + (1.0 - p[2 * j + 1])) for j in range(len(dilemmas))]
+
     def p_stoic(self, dilemma: dict) -> float:
         """Order-debiased P(stoic option): mean over both label orders."""
         p1 = self._p_first_label(
@@ -127,8 +232,9 @@ class DilemmaEval:
         vector: Optional[torch.Tensor] = None,
         layer_idx: Optional[int] = None,
         coefficient: float = 0.0,
+        dilemmas: Optional[list[dict]] = None,
     ) -> dict[str, float]:
-        """P(stoic) for every dilemma under one condition.
+        """P(stoic) for every dilemma (or just `dilemmas`) under one condition.
 
         vector=None -> unsteered baseline.
         """
@@ -137,7 +243,7 @@ class DilemmaEval:
             if steered:
                 self._register_hook(vector, layer_idx, coefficient)
             out: dict[str, float] = {}
-            for d in self.dilemmas:
+            for d in self.dilemmas if dilemmas is None else dilemmas:
                 out[d["id"]] = self.p_stoic(d)
             return out
         finally:
@@ -167,7 +273,8 @@ class DilemmaEval:
     def _bucketed(self, deltas_by_id: dict[str, float], key: str) -> dict[str, dict]:
         buckets: dict[str, list[float]] = {}
         for d in self.dilemmas:
-            buckets.setdefault(d[key], []).append(deltas_by_id[d["id"]])
+            if d["id"] in deltas_by_id:
+                buckets.setdefault(d[key], []).append(deltas_by_id[d["id"]])
         return {k: self._paired_stats(v) for k, v in buckets.items()}
 
     def run_all(self, configs: dict[str, dict]) -> dict:
@@ -248,6 +355,7 @@ class DilemmaEval:
         base_mean = sum(baseline.values()) / len(baseline)
 
         out = {"name": name, "layer": layer, "baseline_mean": base_mean, "by_coeff": {}}
+        lo_rows = []
         for c in coefficients:
             print(f"Trying coeff - {c}")
             steered = self.eval_condition(vector, layer, c)
@@ -261,6 +369,16 @@ class DilemmaEval:
                 "overall_logodds": self._paired_stats(list(d_lo.values())),
                 "by_stance": self._bucketed(d_p, "stoic_stance"),
             }
+            lo_rows.append([d_lo[d["id"]] for d in self.dilemmas])
+
+        # Resampling tests for every coefficient in one vectorized call, with
+        # Holm correction across the coefficients tried.
+        from stoic_llm.eval.stats import adjust_pvalues, as_rows, paired_tests
+
+        stats = paired_tests(lo_rows)
+        stats["perm_p_holm"] = adjust_pvalues(stats["perm_p"], "holm")
+        for c, row in as_rows(stats, coefficients).items():
+            out["by_coeff"][c]["resampling_logodds"] = row
         return out
 
     @staticmethod
@@ -278,6 +396,110 @@ class DilemmaEval:
             )
         return "\n".join(lines)
 
+    # ---- streaming: large JSONL dilemma sets, results to Parquet ----
+    def run_stream(
+        self,
+        configs: dict[str, dict],
+        out_path: Optional[Path] = None,
+        dilemmas_path: Optional[Path] = None,
+        batch_size: int = 16,
+    ) -> Path:
+        """Baseline + every condition over a JSONL dilemma stream.
+
+        configs: like run_all, but "coeff" may be a list (one condition per
+        coefficient, labelled "name@coeff"). Dilemmas are read batch_size at
+        a time; each batch is scored under every condition and its rows are
+        appended to a Parquet file as one row group, so memory is bounded
+        by the batch, not the set. Summarize with summarize_stream(path).
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        dilemmas_path = Path(dilemmas_path or self.dilemmas_path)
+        if out_path is None:
+            RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+            out_path = RESULTS_DIR / f"dilemma_stream_{time.strftime('%Y%m%d_%H%M%S')}.parquet"
+        out_path = Path(out_path)
+
+        conditions = []  # (label, vector, layer, coeff)
+        for name, cfg in configs.items():
+            layer = cfg["layer"]
+            loaded = torch.load(VECTORS_DIR / cfg["vector_file"], map_location="cpu")
+            vector = loaded[layer] if isinstance(loaded, dict) else loaded
+            coeffs = cfg["coeff"] if isinstance(cfg["coeff"], list) else [cfg["coeff"]]
+            for c in coeffs:
+                label = f"{name}@{c}" if len(coeffs) > 1 else name
+                conditions.append((label, vector, layer, c))
+
+        schema = _stream_schema()
+        t0, n_items = time.time(), 0
+        with pq.ParquetWriter(out_path, schema) as writer:
+            for batch in iter_dilemma_batches(dilemmas_path, batch_size):
+                base = self._p_stoic_batch(batch)
+                rows = {f.name: [] for f in schema}
+                for label, vector, layer, c in conditions:
+                    try:
+                        self._register_hook(vector, layer, c)
+                        steered = self._p_stoic_batch(batch)
+                    finally:
+                        self._remove_hook()
+                    for d, b, s in zip(batch, base, steered):
+                        rows["item_id"].append(str(d["id"]))
+                        # Missing labels get a sentinel so bucketing can sort them.
+                        rows["concept"].append(d.get("concept") or UNKNOWN_LABEL)
+                        rows["stoic_stance"].append(d.get("stoic_stance") or UNKNOWN_LABEL)
+                        rows["condition"].append(label)
+                        rows["layer"].append(layer)
+                        rows["coeff"].append(float(c))
+                        rows["base_p_stoic"].append(b)
+                        rows["p_stoic"].append(s)
+                        rows["delta"].append(s - b)
+                        rows["delta_logit"].append(self._logit(s) - self._logit(b))
+                writer.write_table(pa.table(rows, schema=schema))
+                n_items += len(batch)
+                print(f"  {n_items} dilemmas x {len(conditions)} conditions ...", end="\r")
+
+        print(f"\n✓ Streamed {n_items} dilemmas in {time.time() - t0:.1f}s -> {out_path}")
+        return out_path
+
+    @staticmethod
+    def summarize_stream(path: Path, n_boot: int = 10_000, n_perm: int = 10_000) -> dict:
+        """Per-condition paired stats (overall + stance/concept buckets) from
+        a run_stream Parquet file. Reads only the columns it needs."""
+        import numpy as np
+        import pyarrow.parquet as pq
+        from stoic_llm.eval.stats import adjust_pvalues, as_rows, paired_tests, bucketed_tests
+
+        table = pq.read_table(
+            path, columns=["item_id", "concept", "stoic_stance", "condition", "delta", "delta_logit"]
+        )
+        cond = table.column("condition").to_numpy(zero_copy_only=False)
+        items = table.column("item_id").to_numpy(zero_copy_only=False)
+        names = list(dict.fromkeys(cond.tolist()))
+        first = cond == names[0]
+        ids = items[first]
+        meta = {
+            key: np.array(
+                [UNKNOWN_LABEL if v is None else v for v in table.column(key).to_pylist()]
+            )[first]
+            for key in ("concept", "stoic_stance")
+        }
+
+        summary = {"n_dilemmas": len(ids), "conditions": names}
+        kw = {"n_boot": n_boot, "n_perm": n_perm}
+        for col in ("delta", "delta_logit"):
+            values = table.column(col).to_numpy()
+            # Every condition writes the same items in the same order.
+            D = np.stack([values[cond == n] for n in names])
+            stats = paired_tests(D, **kw)
+            stats["perm_p_holm"] = adjust_pvalues(stats["perm_p"], "holm")
+            summary[col] = {
+                "overall": as_rows(stats, names),
+                "by_stance": bucketed_tests(D, meta["stoic_stance"], names, **kw),
+                "by_concept": bucketed_tests(D, meta["concept"], names, **kw),
+            }
+        return summary
+
     @staticmethod
     def save_results(results: dict, out_dir: Path = RESULTS_DIR) -> Path:
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -322,13 +544,18 @@ class DilemmaEval:
 
 Reuses the full DilemmaEval machinery (p_stoic, both-order debiasing,
 paired stats, stance/concept buckets). The ONLY difference from CAA: there
-is no steering hook. The adapter is merged into the weights, so the
-"steered" condition is just a forward pass through the merged model.
+is no steering hook. The adapter is applied to the weights, so the
+"steered" condition is just a forward pass through the adapted model.
 
 The base-model baseline is computed ONCE, on the unmodified base, and is
 the SAME baseline the CAA run used — so the CAA-vs-LoRA comparison holds
 everything fixed except the intervention.
 
+Adapters are swapped on the ONE resident base (AdapterSwapper) instead of
+reloading the 3B checkpoint per author. mode="merged" (default) merges in
+place and unmerges bit-exactly afterwards; mode="unmerged" runs the LoRA
+layers through PEFT's set_adapter.
+
 Usage:
     from stoic_llm.eval.dilemma import DilemmaEval
     from stoic_llm.model import ModelLoader
@@ -346,58 +573,190 @@ Usage:
 
 
 class LoRADilemmaEval(DilemmaEval):
-    """Dilemma eval for LoRA adapters (merged weights, no hook)."""
+    """Dilemma eval for LoRA adapters (swapped on one base, no hook)."""
+
+    def __init__(self, base_model, tokenizer, dilemmas_path=None, mode: str = "merged"):
+        from stoic_llm.lora.swap import AdapterSwapper
 
-    def __init__(self, base_model, tokenizer, dilemmas_path=None, model_size: str = "3B"):
-        # Keep a handle to the pristine base so we can swap adapters in/out.
         kwargs = {"dilemmas_path": dilemmas_path} if dilemmas_path else {}
         super().__init__(base_model, tokenizer, **kwargs)
         self._base_model = base_model
-        self._base_state = "base"  # which model is currently in self.model
-        # Size of the fresh base _merged reloads per adapter; must match the
-        # base passed in above, or the baseline and merged runs use different
-        # models.
-        self._model_size = model_size
+        # One resident base; adapters are applied to it and removed again.
+        self._swapper = AdapterSwapper(base_model, mode=mode)
+
+    def heldout_ids(self, adapter_dirs: dict[str, str]) -> list[str]:
+        """Ids of the dilemmas any adapter's early stopping evaluated on.
+
+        DilemmaEarlyStopping records its held-out ids in the adapter's
+        training_report.json; when they were sampled from this eval's set,
+        keeping them would report on the items the checkpoint was picked
+        on. Returns the ids to exclude (sorted).
+        """
+        ours = self.dilemmas_path.resolve()
+        excluded: set[str] = set()
+        for adapter_dir in adapter_dirs.values():
+            report_path = Path(adapter_dir) / "training_report.json"
+            if not report_path.exists():
+                continue
+            with open(report_path) as f:
+                stopping = json.load(f).get("early_stopping") or {}
+            if stopping.get("heldout_path") and Path(stopping["heldout_path"]).resolve() == ours:
+                excluded.update(str(i) for i in stopping.get("heldout_ids", []))
+        return sorted(excluded)
+
+    def _without_heldout(self, adapter_dirs: dict[str, str]) -> tuple[list[dict], list[str]]:
+        """(dilemmas to report on, excluded held-out ids) for this run;
+        self.dilemmas itself is left untouched."""
+        excluded = self.heldout_ids(adapter_dirs)
+        if not excluded:
+            return self.dilemmas, excluded
+        dilemmas = [d for d in self.dilemmas if str(d["id"]) not in set(excluded)]
+        print(
+            f"Excluding {len(excluded)} early-stopping held-out dilemmas; "
+            f"{len(dilemmas)} remain"
+        )
+        return dilemmas, excluded
+
+    @staticmethod
+    def _heldout_note(dilemmas: list[dict]) -> str:
+        return (
+            f"Baseline and deltas cover only the {len(dilemmas)} dilemmas left after "
+            "excluding early-stopping held-out items; drop excluded_heldout_ids from "
+            "the CAA run before comparing."
+        )
 
-    # ---- override: "steered" = merged adapter, no hook ----
+    def eval_condition(self, vector=None, layer_idx=None, coefficient=0.0, dilemmas=None):
+        """Same as DilemmaEval, but the baseline always runs with adapters off."""
+        with self._swapper.base() as base:
+            self.model = base
+            try:
+                return super().eval_condition(vector, layer_idx, coefficient, dilemmas)
+            finally:
+                self.model = self._base_model
+
+    # ---- override: "steered" = adapted model, no hook ----
     @torch.no_grad()
-    def eval_condition_lora(self, merged_model) -> dict[str, float]:
-        """P(stoic) for every dilemma using an already-merged LoRA model."""
+    def eval_condition_lora(self, merged_model, dilemmas=None) -> dict[str, float]:
+        """P(stoic) for every dilemma (or just `dilemmas`) using a model that
+        already carries the adapter."""
         prev = self.model
         self.model = merged_model
         try:
-            return {d["id"]: self.p_stoic(d) for d in self.dilemmas}
+            return {d["id"]: self.p_stoic(d) for d in (self.dilemmas if dilemmas is None else dilemmas)}
         finally:
             self.model = prev  # restore base for the next condition / baseline
 
-    # ---- load + merge one adapter onto a FRESH copy of the base ----
-    def _merged(self, adapter_dir: str):
-        from stoic_llm.model import ModelLoader
-        from peft import PeftModel
+    # ---- mixed-adapter batches: baseline + every author in one forward ----
+    def eval_conditions_mixed(
+        self, multi, names: list[str], batch_size: int = 4, dilemmas=None
+    ) -> dict[str, dict[str, float]]:
+        """P(stoic) per dilemma (all, or just `dilemmas`) for every condition
+        in `names` at once.
+
+        Each forward carries batch_size dilemmas x 2 label orders x
+        len(names) rows; row adapters are applied by MultiLoRA, so the base
+        weights are read once per batch instead of once per author.
+        """
+        dilemmas = self.dilemmas if dilemmas is None else dilemmas
+        out: dict[str, dict[str, float]] = {n: {} for n in names}
+        for start in range(0, len(dilemmas), batch_size):
+            chunk = dilemmas[start : start + batch_size]
+            prompts, row_names = [], []
+            for d in chunk:
+                for prompt in self._both_orders(d):
+                    prompts += [prompt] * len(names)
+                    row_names += names
+            with multi.rows(row_names) as model:
+                self.model = model
+                try:
+                    p = self._p_first_label_batch(prompts)
+                finally:
+                    self.model = self._base_model
+            k = len(names)
+            for j, d in enumerate(chunk):
+                p1 = p[2 * k * j : 2 * k * j + k]  # stoic is A -> P(A)
+                p2 = p[2 * k * j + k : 2 * k * (j + 1)]  # stoic is B -> 1 - P(A)
+                for n, a, b in zip(names, p1, p2):
+                    out[n][d["id"]] = 0.5 * (a + (1.0 - b))
+        return out
+
+    def run_all_lora_mixed(self, adapter_dirs: dict[str, str], batch_size: int = 4) -> dict:
+        """run_all_lora, but baseline and all authors share each forward pass."""
+        from stoic_llm.lora.multi import MultiLoRA, BASE
+
+        t0 = time.time()
+        dilemmas, excluded = self._without_heldout(adapter_dirs)
+        multi = MultiLoRA(self._base_model, adapter_dirs)
+        names = [BASE, *adapter_dirs]
+        print(
+            f"Baseline + {len(adapter_dirs)} adapters over {len(dilemmas)} "
+            f"dilemmas x 2 orders (mixed batches) ..."
+        )
+        with self._swapper.base():
+            by_condition = self.eval_conditions_mixed(multi, names, batch_size, dilemmas)
+        baseline = by_condition.pop(BASE)
+
+        results = {
+            "meta": {
+                "n_dilemmas": len(dilemmas),
+                "method": "LoRA (mixed-adapter batches on one base, no hook)",
+                "adapter_dirs": {k: str(v) for k, v in adapter_dirs.items()},
+                "measurement": "P(stoic) = softmax over {A,B}, averaged over both label orders",
+                "note": "Baseline rows share each batch with the adapter rows."
+                + (f" {self._heldout_note(dilemmas)}" if excluded else ""),
+                "excluded_heldout_ids": excluded,
+            },
+            "baseline_p_stoic": baseline,
+            "baseline_mean": sum(baseline.values()) / len(baseline),
+            "philosophers": {
+                name: self._condition_result(steered, baseline)
+                for name, steered in by_condition.items()
+            },
+        }
+        results["meta"]["runtime_sec"] = round(time.time() - t0, 1)
+        return results
 
-        base = ModelLoader(self._model_size).load()[0]  # fresh base, no prior adapters
-        merged = PeftModel.from_pretrained(base, str(adapter_dir)).merge_and_unload()
-        merged.config.use_cache = True
-        return merged
+    def _condition_result(self, steered: dict, baseline: dict) -> dict:
+        deltas = {i: steered[i] - baseline[i] for i in steered}
+        deltas_lo = {
+            i: self._logit(steered[i]) - self._logit(baseline[i]) for i in steered
+        }
+        return {
+            "steered_p_stoic": steered,
+            "steered_mean": sum(steered.values()) / len(steered),
+            "per_item_delta": deltas,
+            "per_item_delta_logit": deltas_lo,
+            "overall": self._paired_stats(list(deltas.values())),
+            "overall_logodds": self._paired_stats(list(deltas_lo.values())),
+            "by_stance": self._bucketed(deltas, "stoic_stance"),
+            "by_concept": self._bucketed(deltas, "concept"),
+        }
 
     # ---- full run ----
     def run_all_lora(self, adapter_dirs: dict[str, str]) -> dict:
         t0 = time.time()
+        dilemmas, excluded = self._without_heldout(adapter_dirs)
 
-        # Baseline on the unmodified base — identical to the CAA run's baseline.
+        # Baseline on the unmodified base — the CAA run's baseline, over the
+        # same items unless early-stopping held-out ids were excluded.
         print(
-            f"Baseline (base model) over {len(self.dilemmas)} dilemmas x 2 orders ..."
+            f"Baseline (base model) over {len(dilemmas)} dilemmas x 2 orders ..."
         )
-        baseline = self.eval_condition()  # vector=None -> pure base
+        baseline = self.eval_condition(dilemmas=dilemmas)  # vector=None -> pure base
         base_mean = sum(baseline.values()) / len(baseline)
 
         results = {
             "meta": {
-                "n_dilemmas": len(self.dilemmas),
-                "method": "LoRA (merged weights, no hook)",
+                "n_dilemmas": len(dilemmas),
+                "method": f"LoRA ({self._swapper.mode} adapter on one resident base, no hook)",
                 "adapter_dirs": {k: str(v) for k, v in adapter_dirs.items()},
                 "measurement": "P(stoic) = softmax over {A,B}, averaged over both label orders",
-                "note": "Baseline computed on unmodified base; same baseline basis as CAA run.",
+                "note": (
+                    f"Baseline computed on unmodified base. {self._heldout_note(dilemmas)}"
+                    if excluded
+                    else "Baseline computed on unmodified base; same baseline basis as CAA run."
+                ),
+                "excluded_heldout_ids": excluded,
             },
             "baseline_p_stoic": baseline,
             "baseline_mean": base_mean,
@@ -405,35 +764,13 @@ class LoRADilemmaEval(DilemmaEval):
         }
 
         for name, adapter_dir in adapter_dirs.items():
-            print(f"{name}: merging {adapter_dir} ...")
-            merged = self._merged(adapter_dir)
-            try:
-                steered = self.eval_condition_lora(merged)
-            finally:
-                # _merged loads a FRESH base per author, so the merge never
-                # touches self._base_model or self.model — no adapter stacking.
-                # Drop the merged copy and reclaim memory. This runs on CPU
-                # (M4), so gc.collect() is what actually frees it;
-                # torch.cuda.empty_cache() is a no-op here, kept only for GPU.
-                del merged
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-
-            deltas = {i: steered[i] - baseline[i] for i in steered}
-            deltas_lo = {
-                i: self._logit(steered[i]) - self._logit(baseline[i]) for i in steered
-            }
-            results["philosophers"][name] = {
-                "steered_p_stoic": steered,
-                "steered_mean": sum(steered.values()) / len(steered),
-                "per_item_delta": deltas,
-                "per_item_delta_logit": deltas_lo,
-                "overall": self._paired_stats(list(deltas.values())),
-                "overall_logodds": self._paired_stats(list(deltas_lo.values())),
-                "by_stance": self._bucketed(deltas, "stoic_stance"),
-                "by_concept": self._bucketed(deltas, "concept"),
-            }
+            if name not in self._swapper.adapter_dirs:
+                self._swapper.register(name, adapter_dir)
+            # merged mode: unmerge on exit restores the base bit-exactly (or
+            # raises), so adapters never stack across authors.
+            with self._swapper.applied(name) as adapted:
+                steered = self.eval_condition_lora(adapted, dilemmas)
+            results["philosophers"][name] = self._condition_result(steered, baseline)
 
         results["meta"]["runtime_sec"] = round(time.time() - t0, 1)
         return results
@@ -76,11 +76,16 @@ class StoicJudge:
                 f"Unknown provider: {provider!r}. Use 'anthropic' or 'gemini'."
             )
 
-    def score(self, text: str, prompt: str = "") -> Dict:
+    @staticmethod
+    def _user_message(text: str, prompt: str = "") -> str:
         user_message = f"{STOIC_RUBRIC}\n\n"
         if prompt:
             user_message += f"PROMPT: {prompt}\n\n"
         user_message += f"TEXT TO EVALUATE:\n{text}"
+        return user_message
+
+    def score(self, text: str, prompt: str = "") -> Dict:
+        user_message = self._user_message(text, prompt)
 
         if self.provider == "anthropic":
             message = self.client.messages.create(
@@ -99,7 +104,11 @@ class StoicJudge:
             )
             response_text = response.text
 
-        # ---- everything below is unchanged, provider-agnostic ----
+        return self._parse_scores(response_text)
+
+    @staticmethod
+    def _parse_scores(response_text: str) -> Dict:
+        """Provider-agnostic: rubric JSON -> scores with an aggregate."""
         try:
             scores = json.loads(response_text)
         except json.JSONDecodeError:
@@ -115,10 +124,75 @@ class StoicJudge:
         scores["aggregate"] = sum(valid_scores) / len(valid_scores)
         return scores
 
+    def score_batch_job(
+        self, items: List[tuple], state_path: Path, poll_initial: float = 10.0
+    ) -> List[Optional[Dict]]:
+        """Score [(text, prompt), ...] as ONE Message Batch (anthropic only).
+
+        The batch id is persisted at state_path together with a hash of the
+        requests, so re-running after a restart resumes the same batch, and
+        a state file built from different items is refused. Items whose
+        request errored are left unscored (None); their scores so far stay
+        in the state file and re-running resubmits only the failed items.
+        """
+        from stoic_llm.batches import MessageBatchJob
+
+        if self.provider != "anthropic":
+            raise ValueError("Batch scoring is only available for provider='anthropic'.")
+        requests = {
+            str(i): {
+                "model": self.model,
+                "max_tokens": 300,
+                "messages": [{"role": "user", "content": self._user_message(text, prompt)}],
+            }
+            for i, (text, prompt) in enumerate(items)
+        }
+        payload = MessageBatchJob.payload_hash(requests)
+        job = MessageBatchJob(self.client, state_path, poll_initial=poll_initial)
+
+        state = job.load_state()
+        if state is not None and state.get("payload_sha256") != payload:
+            raise RuntimeError(
+                f"{state_path} holds a batch for different items; "
+                "delete it or use another state_path."
+            )
+        if state is None:
+            state = job.submit(requests, meta={"payload_sha256": payload, "scores": {}})
+        elif state.get("failed"):
+            print(f"↻ Resubmitting {len(state['failed'])} failed items from {state_path}")
+            state = job.submit(
+                {key: requests[key] for key in state["failed"]},
+                meta={"payload_sha256": payload, "scores": state["scores"]},
+            )
+        else:
+            print(f"↻ Resuming batch {state['batch_id']} from {state_path}")
+        job.wait(state["batch_id"])
+
+        scores = dict(state["scores"])
+        failed = []
+        for key, res in job.results(state).items():
+            if "error" in res:
+                print(f"⚠ Batch item {key} failed ({res['error']}) — left unscored.")
+                failed.append(key)
+            else:
+                scores[key] = self._parse_scores(res["text"])
+
+        if failed:
+            job.save_state({**state, "scores": scores, "failed": sorted(failed, key=int)})
+            print(
+                f"⚠ {len(failed)}/{len(items)} items unscored; state kept at {state_path}, "
+                "re-run to resubmit them."
+            )
+        else:
+            job.clear()
+        return [scores.get(str(i)) for i in range(len(items))]
+
     def evaluate_batch(
         self,
         outputs: List[Dict],
         delay: float = 0.5,
+        backend: str = "sync",
+        batch_state: Optional[Path] = None,
     ) -> List[Dict]:
         """
         Score a batch of outputs.
@@ -126,10 +200,20 @@ class StoicJudge:
         Args:
             outputs: List of {"prompt": str, "text": str, ...} dicts
             delay: Seconds between API calls to avoid rate limits
+            backend: "sync" (one call each) or "batch" (one Message Batch)
+            batch_state: Batch id file for backend="batch" (resumable)
 
         Returns:
             List of dicts with original data + scores
         """
+        if backend == "batch":
+            state = batch_state or JUDGES_DIR / "batch_outputs.json"
+            scores = self.score_batch_job(
+                [(item["text"], item.get("prompt", "")) for item in outputs], state
+            )
+            print(f"✓ Scored {sum(sc is not None for sc in scores)}/{len(outputs)} outputs (batch)")
+            return [{**item, "scores": sc} for item, sc in zip(outputs, scores)]
+
         results = []
         total = len(outputs)
 
@@ -162,7 +246,12 @@ class StoicJudge:
         unsteered_scores = self.score(unsteered_text, prompt)
         time.sleep(0.5)
         steered_scores = self.score(steered_text, prompt)
+        return self._comparison(
+            prompt, unsteered_text, steered_text, unsteered_scores, steered_scores
+        )
 
+    @staticmethod
+    def _comparison(prompt, unsteered_text, steered_text, unsteered_scores, steered_scores):
         dimensions = [
             "philosophical_depth",
             "stoic_alignment",
@@ -172,10 +261,11 @@ class StoicJudge:
         ]
 
         deltas = {}
-        for d in dimensions:
-            u = unsteered_scores.get(d, 0)
-            s = steered_scores.get(d, 0)
-            deltas[d] = s - u
+        if unsteered_scores is not None and steered_scores is not None:
+            for d in dimensions:
+                u = unsteered_scores.get(d, 0)
+                s = steered_scores.get(d, 0)
+                deltas[d] = s - u
 
         return {
             "prompt": prompt,
@@ -192,6 +282,8 @@ class StoicJudge:
         author: str = "unknown",
         metadata: Optional[Dict] = None,
         delay: float = 0.5,
+        backend: str = "sync",
+        batch_state: Optional[Path] = None,
     ) -> Dict:
         """
         Full evaluation: compare steered vs unsteered across multiple prompts.
@@ -203,6 +295,8 @@ class StoicJudge:
             author: Philosopher name for labeling
             metadata: Extra info (layer, coefficient, etc.)
             delay: Seconds between API calls
+            backend: "sync", or "batch" to score every steered and unsteered
+                output in one Message Batch (resumable via batch_state)
 
         Returns:
             Dict with per-prompt comparisons and aggregate summary
@@ -213,14 +307,29 @@ class StoicJudge:
             )
 
         comparisons = []
-        for i, (prompt, steered, unsteered) in enumerate(
-            zip(prompts, steered_outputs, unsteered_outputs), 1
-        ):
-            print(f"Evaluating prompt {i}/{len(prompts)}...")
-            comp = self.compare(prompt, unsteered, steered)
-            comparisons.append(comp)
-            if i < len(prompts):
-                time.sleep(delay)
+        if backend == "batch":
+            items = []
+            for prompt, steered, unsteered in zip(prompts, steered_outputs, unsteered_outputs):
+                items += [(unsteered, prompt), (steered, prompt)]
+            state = batch_state or JUDGES_DIR / f"batch_{author}.json"
+            scores = self.score_batch_job(items, state)
+            for i, (prompt, steered, unsteered) in enumerate(
+                zip(prompts, steered_outputs, unsteered_outputs)
+            ):
+                comparisons.append(
+                    self._comparison(
+                        prompt, unsteered, steered, scores[2 * i], scores[2 * i + 1]
+                    )
+                )
+        else:
+            for i, (prompt, steered, unsteered) in enumerate(
+                zip(prompts, steered_outputs, unsteered_outputs), 1
+            ):
+                print(f"Evaluating prompt {i}/{len(prompts)}...")
+                comp = self.compare(prompt, unsteered, steered)
+                comparisons.append(comp)
+                if i < len(prompts):
+                    time.sleep(delay)
 
         # Aggregate
         dimensions = [
@@ -235,10 +344,17 @@ class StoicJudge:
         avg_unsteered = {}
         avg_deltas = {}
 
+        # Batch items that errored are unscored (None) and left out of the means.
+        steered_scored = [c["steered"]["scores"] for c in comparisons if c["steered"]["scores"]]
+        unsteered_scored = [c["unsteered"]["scores"] for c in comparisons if c["unsteered"]["scores"]]
+        paired = [c["deltas"] for c in comparisons if c["deltas"]]
+        if not paired:
+            raise RuntimeError("No prompt has both outputs scored; nothing to aggregate.")
+
         for d in dimensions:
-            steered_vals = [c["steered"]["scores"].get(d, 0) for c in comparisons]
-            unsteered_vals = [c["unsteered"]["scores"].get(d, 0) for c in comparisons]
-            delta_vals = [c["deltas"].get(d, 0) for c in comparisons]
+            steered_vals = [sc.get(d, 0) for sc in steered_scored]
+            unsteered_vals = [sc.get(d, 0) for sc in unsteered_scored]
+            delta_vals = [dl.get(d, 0) for dl in paired]
 
             avg_steered[d] = sum(steered_vals) / len(steered_vals)
             avg_unsteered[d] = sum(unsteered_vals) / len(unsteered_vals)
@@ -247,6 +363,7 @@ class StoicJudge:
         result = {
             "author": author,
             "num_prompts": len(prompts),
+            "num_unscored": len(comparisons) - len(paired),
             "comparisons": comparisons,
             "avg_steered": avg_steered,
             "avg_unsteered": avg_unsteered,
@@ -0,0 +1,195 @@
+"""First-order steering-effect estimator for layer / coefficient selection.
+
+A coefficient sweep measures Δlog-odds(P(stoic)) at c = 0.11, 0.2, ... one
+full pass over the dilemmas per (layer, coefficient). To first order,
+
+    Δlog-odds(c) ≈ c * d logit(P(stoic)) / dc  at c = 0,
+
+and that derivative is the gradient of the dilemma log-odds w.r.t. the MLP
+output at layer L, dotted with the layer-L steering vector. We get it for
+EVERY candidate layer and EVERY item from one forward + one backward pass
+per batch: each hooked layer adds c[L, item] * v_L with c = 0 (so the
+forward is the unsteered baseline) and autograd returns d/dc.
+
+The result is a layer x item sensitivity table. It is a shortlist, not a
+measurement: check it against a measured sweep with rank_agreement()
+before trusting it for a new vector set.
+
+Usage:
+    est = SteeringSensitivity(model, tokenizer)
+    table = est.estimate(vectors)                 # {layer: tensor}
+    print(est.summarize(table, coefficient=0.11))
+    measured = est.measure_layers(vectors, coefficient=0.11)
+    print(est.rank_agreement(table, measured))
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+
+import torch
+
+from stoic_llm.eval.dilemma import DilemmaEval
+
+
+def _ranks(xs: list[float]) -> list[float]:
+    """Ranks with ties averaged (1-based)."""
+    order = sorted(range(len(xs)), key=lambda i: xs[i])
+    ranks = [0.0] * len(xs)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and xs[order[j + 1]] == xs[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def spearman(xs: list[float], ys: list[float]) -> float:
+    """Spearman rank correlation; nan if fewer than 3 points or no spread."""
+    if len(xs) != len(ys) or len(xs) < 3:
+        return float("nan")
+    rx, ry = _ranks(xs), _ranks(ys)
+    mx, my = sum(rx) / len(rx), sum(ry) / len(ry)
+    cov = sum((a - mx) * (b - my) for a, b in zip(rx, ry))
+    sx = math.sqrt(sum((a - mx) ** 2 for a in rx))
+    sy = math.sqrt(sum((b - my) ** 2 for b in ry))
+    return cov / (sx * sy) if sx > 0 and sy > 0 else float("nan")
+
+
+class SteeringSensitivity(DilemmaEval):
+    """d logit(P(stoic)) / d coefficient at every candidate layer, per item."""
+
+    @contextmanager
+    def _zero_coefficient_hooks(self, vectors: dict, row_item: torch.Tensor, n_items: int):
+        """Hook every layer with output + c[item] * v; yields {layer: c}."""
+        dtype = next(self.model.parameters()).dtype
+        coeffs, handles = {}, []
+
+        def make_hook(c, v):
+            def hook(_module, _inputs, output):
+                return output + (c[row_item][:, None, None] * v).to(output.dtype)
+
+            return hook
+
+        try:
+            for layer, vec in vectors.items():
+                c = torch.zeros(n_items, requires_grad=True)
+                coeffs[layer] = c
+                target = self.model.model.layers[layer].mlp
+                handles.append(
+                    target.register_forward_hook(make_hook(c, vec.float().to(self.model.device)))
+                )
+            yield coeffs
+        finally:
+            for h in handles:
+                h.remove()
+
+    def _batch_sensitivity(self, dilemmas: list[dict], vectors: dict) -> dict[int, list[float]]:
+        prompts = [p for d in dilemmas for p in self._both_orders(d)]
+        inputs = self.tokenizer(
+            prompts, return_tensors="pt", padding=True, padding_side="right"
+        ).to(self.model.device)
+        row_item = torch.arange(len(dilemmas)).repeat_interleave(2)
+
+        with self._zero_coefficient_hooks(vectors, row_item, len(dilemmas)) as coeffs:
+            logits = self.model(**inputs).logits
+            last = inputs["attention_mask"].sum(dim=1) - 1
+            rows = logits[torch.arange(len(prompts)), last].float()
+            lo = rows[:, self.tok_a] - rows[:, self.tok_b]  # log-odds of label A
+            p_a = torch.sigmoid(lo)
+            # Same debiasing as p_stoic: stoic is A in even rows, B in odd rows.
+            p = 0.5 * (p_a[0::2] + (1.0 - p_a[1::2]))
+            target = torch.log(p) - torch.log1p(-p)  # logit(P(stoic)) per item
+            layers = list(coeffs)
+            # Items are independent, so d(sum)/dc[L, i] = d logit(p_i)/dc[L, i].
+            grads = torch.autograd.grad(target.sum(), [coeffs[L] for L in layers])
+        return {L: g.tolist() for L, g in zip(layers, grads)}
+
+    def estimate(self, vectors: dict, layers: list[int] | None = None, batch_size: int = 4) -> dict:
+        """Sensitivity table: {layer: {item_id: d logit(P(stoic)) / dc}}.
+
+        vectors: {layer: tensor} steering vectors (Exp-8+ format).
+        """
+        layers = sorted(vectors) if layers is None else layers
+        vectors = {L: vectors[L] for L in layers}
+        t0 = time.time()
+        print(
+            f"Sensitivity at layers {layers} over {len(self.dilemmas)} dilemmas "
+            f"x 2 orders (one forward + backward per batch) ..."
+        )
+        table: dict[int, dict[str, float]] = {L: {} for L in layers}
+        for start in range(0, len(self.dilemmas), batch_size):
+            chunk = self.dilemmas[start : start + batch_size]
+            grads = self._batch_sensitivity(chunk, vectors)
+            for L in layers:
+                for d, g in zip(chunk, grads[L]):
+                    table[L][d["id"]] = g
+
+        return {
+            "layers": layers,
+            "sensitivity": table,
+            "mean": {L: sum(v.values()) / len(v) for L, v in table.items()},
+            "runtime_sec": round(time.time() - t0, 1),
+        }
+
+    def measure_layers(self, vectors: dict, coefficient: float, layers: list[int] | None = None) -> dict:
+        """Measured Δlog-odds per layer/item at one coefficient (the slow path)."""
+        layers = sorted(vectors) if layers is None else layers
+        baseline = self.eval_condition()
+        measured = {}
+        for L in layers:
+            print(f"Measuring layer {L}, coeff {coefficient} ...")
+            steered = self.eval_condition(vectors[L], L, coefficient)
+            measured[L] = {
+                i: self._logit(steered[i]) - self._logit(baseline[i]) for i in steered
+            }
+        return measured
+
+    @staticmethod
+    def rank_agreement(table: dict, measured: dict) -> dict:
+        """Spearman between estimated slopes and a measured sweep.
+
+        layer_rho: across layers, mean slope vs mean measured Δlog-odds.
+        item_rho:  within each layer, per-item slope vs per-item Δlog-odds.
+        """
+        layers = [L for L in table["layers"] if L in measured]
+        est_means = [table["mean"][L] for L in layers]
+        meas_means = [sum(measured[L].values()) / len(measured[L]) for L in layers]
+        item_rho = {}
+        for L in layers:
+            ids = list(measured[L])
+            item_rho[L] = spearman(
+                [table["sensitivity"][L][i] for i in ids], [measured[L][i] for i in ids]
+            )
+        return {
+            "layers": layers,
+            "layer_rho": spearman(est_means, meas_means),
+            "item_rho": item_rho,
+        }
+
+    @staticmethod
+    def summarize(table: dict, coefficient: float = 0.11) -> str:
+        """Layers ranked by |mean slope|, with the linear Δlog-odds prediction."""
+        lines = [
+            f"{'layer':>5} {'mean slope':>11} {'pred Δlo @' + format(coefficient, 'g'):>14} "
+            f"{'+items':>7} {'-items':>7}",
+        ]
+        ranked = sorted(table["layers"], key=lambda L: -abs(table["mean"][L]))
+        for L in ranked:
+            vals = table["sensitivity"][L].values()
+            lines.append(
+                f"{L:>5} {table['mean'][L]:>+11.3f} {coefficient * table['mean'][L]:>+14.3f} "
+                f"{sum(1 for v in vals if v > 0):>7} {sum(1 for v in vals if v < 0):>7}"
+            )
+        lines += [
+            "",
+            "First-order (c -> 0) estimate: use it to shortlist layers, then run",
+            "DilemmaEval.sweep_coefficients on the shortlist. Large coefficients",
+            "leave the linear regime, so check rank_agreement() on a measured sweep.",
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,175 @@
+"""Vectorized paired statistics for dilemma deltas.
+
+Takes a whole (conditions x items) delta matrix — philosophers, or every
+coefficient of a sweep — and returns, per condition, in one call:
+
+    paired t          mean / (std / sqrt(n)); p via scipy if installed
+    sign test         exact two-sided binomial, ties dropped
+    bootstrap CI      percentile CI of the mean, n_boot item resamples
+    permutation p     paired sign-flip test of the mean, n_perm flips
+
+Resamples are shared across conditions (same item draws for every row), so
+the cost is a few (conditions x items) @ (items x resamples) matmuls,
+chunked to bound memory. adjust_pvalues() applies Holm or
+Benjamini-Hochberg across all conditions (philosophers x coefficients).
+
+Usage:
+    names, ids, D = delta_matrix(results)              # saved dilemma JSON
+    table = as_rows(paired_tests(D), names)
+    buckets = bucketed_tests(D, [dilemmas[i]["concept"] for i in ids], names)
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# Resample rows processed per chunk in bootstrap/permutation (memory bound:
+# chunk x n_items floats).
+RESAMPLE_CHUNK = 1000
+
+
+def _sign_test(deltas: np.ndarray, tol: float) -> dict[str, np.ndarray]:
+    """Exact two-sided binomial sign test per row, same rule as sign_test.py."""
+    pos = (deltas > tol).sum(axis=1)
+    neg = (deltas < -tol).sum(axis=1)
+    n = pos + neg
+    k = np.maximum(pos, neg)
+
+    n_max = int(n.max()) if n.size else 0
+    log_fact = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n_max + 1)))])
+    grid = np.arange(n_max + 1)[None, :]  # (1, n_max + 1)
+    nn = n[:, None]
+    valid = (grid >= k[:, None]) & (grid <= nn)
+    safe = np.minimum(grid, nn)
+    log_pmf = log_fact[nn] - log_fact[safe] - log_fact[nn - safe] - nn * math.log(2)
+    tail = np.where(valid, np.exp(log_pmf), 0.0).sum(axis=1)
+    p = np.where(n > 0, np.minimum(2 * tail, 1.0), 1.0)
+    return {"pos": pos, "neg": neg, "ties": deltas.shape[1] - n, "sign_p": p}
+
+
+def _t_pvalue(t: np.ndarray, df: int) -> np.ndarray | None:
+    try:
+        from scipy import stats as sps
+    except ImportError:
+        return None
+    return 2 * sps.t.sf(np.abs(t), df)
+
+
+def paired_tests(
+    deltas,
+    n_boot: int = 10_000,
+    n_perm: int = 10_000,
+    ci: float = 0.95,
+    tol: float = 1e-9,
+    seed: int = 0,
+) -> dict[str, np.ndarray]:
+    """All paired tests for every row of a (conditions x items) delta matrix.
+
+    Returns a dict of length-`conditions` arrays. NaN deltas are not
+    supported — drop those items before building the matrix.
+    """
+    D = np.atleast_2d(np.asarray(deltas, dtype=np.float64))
+    n_cond, n = D.shape
+    rng = np.random.default_rng(seed)
+
+    mean = D.mean(axis=1)
+    std = D.std(axis=1, ddof=1) if n > 1 else np.zeros(n_cond)
+    se = std / math.sqrt(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(se > 0, mean / se, np.nan)
+
+    # Bootstrap: resample items with replacement as multinomial counts, so the
+    # resampled means are one matmul per chunk.
+    boot = np.empty((n_cond, n_boot))
+    for start in range(0, n_boot, RESAMPLE_CHUNK):
+        b = min(RESAMPLE_CHUNK, n_boot - start)
+        counts = rng.multinomial(n, np.full(n, 1.0 / n), size=b)  # (b, n)
+        boot[:, start : start + b] = D @ counts.T / n
+    alpha = (1.0 - ci) / 2
+    lo, hi = np.quantile(boot, [alpha, 1.0 - alpha], axis=1)
+
+    # Permutation: under H0 (no effect) each paired delta's sign is
+    # exchangeable, so flip signs at random and compare |mean|.
+    exceed = np.zeros(n_cond)
+    for start in range(0, n_perm, RESAMPLE_CHUNK):
+        b = min(RESAMPLE_CHUNK, n_perm - start)
+        signs = rng.choice(np.array([-1.0, 1.0]), size=(b, n))
+        perm_means = D @ signs.T / n  # (n_cond, b)
+        exceed += (np.abs(perm_means) >= np.abs(mean)[:, None] - 1e-12).sum(axis=1)
+    perm_p = (exceed + 1) / (n_perm + 1)
+
+    out = {
+        "n": np.full(n_cond, n),
+        "mean_delta": mean,
+        "std": std,
+        "t_stat": t,
+        "p_value": _t_pvalue(t, n - 1) if n > 1 else None,
+        "ci_low": lo,
+        "ci_high": hi,
+        "perm_p": perm_p,
+    }
+    out.update(_sign_test(D, tol))
+    return out
+
+
+def adjust_pvalues(p, method: str = "holm") -> np.ndarray:
+    """Family-wise (Holm) or false-discovery (Benjamini-Hochberg) adjustment.
+
+    `p` may be any shape; the whole array is one family.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    flat = p.ravel()
+    m = flat.size
+    order = np.argsort(flat)
+    ranked = flat[order]
+    if method == "holm":
+        adj = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method in ("bh", "fdr_bh"):
+        adj = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown method {method!r}. Use 'holm' or 'bh'.")
+    out = np.empty(m)
+    out[order] = np.minimum(adj, 1.0)
+    return out.reshape(p.shape)
+
+
+def bucketed_tests(deltas, labels: list[str], names: list, **kwargs) -> dict[str, dict]:
+    """paired_tests per item bucket (e.g. concept, stoic_stance).
+
+    labels[j] is the bucket of item j (column j). Returns
+    {bucket: {name: row}} with the same row fields as as_rows().
+    """
+    D = np.atleast_2d(np.asarray(deltas, dtype=np.float64))
+    labels = np.asarray(labels)
+    return {
+        bucket: as_rows(paired_tests(D[:, labels == bucket], **kwargs), names)
+        for bucket in sorted(set(labels.tolist()))
+    }
+
+
+def as_rows(stats: dict, names: list) -> dict:
+    """{name: {field: float}} — JSON-ready, one row per condition."""
+    rows = {}
+    for i, name in enumerate(names):
+        rows[name] = {
+            k: (None if v is None else v[i].item()) for k, v in stats.items()
+        }
+    return rows
+
+
+def delta_matrix(results: dict, key: str = "per_item_delta_logit"):
+    """(names, item_ids, matrix) from a saved DilemmaEval/LoRADilemmaEval run.
+
+    Falls back to per_item_delta (P-space) when log-odds deltas are absent.
+    """
+    names = list(results["philosophers"])
+    first = results["philosophers"][names[0]]
+    ids = list(first.get(key, first["per_item_delta"]))
+    rows = []
+    for name in names:
+        r = results["philosophers"][name]
+        d = r.get(key, r["per_item_delta"])
+        rows.append([d[i] for i in ids])
+    return names, ids, np.array(rows, dtype=np.float64)
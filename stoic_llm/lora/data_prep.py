@@ -1,22 +1,107 @@
+import hashlib
 import json
+import os
+import shutil
 from pathlib import Path
-from stoic_llm.config import PROCESSED_DIR, LORA_TRAINING_DIR
+import numpy as np
+from stoic_llm.config import PROCESSED_DIR, LORA_TRAINING_DIR, TOKENIZED_CACHE_DIR
+from stoic_llm.data.store import read_pairs
+
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _tokenizer_fingerprint(tokenizer):
+    """Changes whenever the vocab/merges/normalizer change, not just the name."""
+    h = hashlib.sha256(type(tokenizer).__name__.encode())
+    h.update(str(getattr(tokenizer, "name_or_path", "")).encode())
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        spec = json.loads(backend.to_str())
+        # truncation/padding are call-time state, not part of the vocab
+        spec.pop("truncation", None)
+        spec.pop("padding", None)
+        h.update(json.dumps(spec, sort_keys=True).encode())
+    else:
+        h.update(json.dumps(tokenizer.get_vocab(), sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def read_texts(path):
+    """Training texts from a LoRA .jsonl ({"text"} per line) or a chunked
+    .json ({"chunks": [...]}, list[dict], or list[str])."""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            return [json.loads(line)["text"] for line in f if line.strip()]
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["chunks"]
+    texts = [d["text"] if isinstance(d, dict) else d for d in data]
+    return [t for t in texts if isinstance(t, str) and t.strip()]
+
+
+def example_hash(text):
+    """Stable id of one training example (its exact text)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_version(hashes):
+    """Order-independent version tag of a set of examples."""
+    h = hashlib.sha256()
+    for e in sorted(set(hashes)):
+        h.update(e.encode())
+    return h.hexdigest()[:12]
+
+
+class TokenizedCorpus:
+    """Memory-mapped pre-tokenized texts: one flat token array + offsets.
+
+    Indexing returns {"input_ids": ...} like a tokenized datasets.Dataset
+    row, so it plugs into Trainer and the LM collators directly; the token
+    slice itself is a zero-copy view of the mmap.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.tokens = np.load(self.cache_dir / "tokens.npy", mmap_mode="r")
+        self.offsets = np.load(self.cache_dir / "offsets.npy", mmap_mode="r")
+        with open(self.cache_dir / "meta.json") as f:
+            self.meta = json.load(f)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def ids(self, i):
+        """Token ids of text i as a zero-copy view."""
+        return self.tokens[self.offsets[i] : self.offsets[i + 1]]
+
+    def __getitem__(self, i):
+        return {"input_ids": self.ids(i).tolist()}
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
 
 
 class LoRADataPrep:
-    def __init__(self, output_dir=LORA_TRAINING_DIR):
+    def __init__(self, output_dir=LORA_TRAINING_DIR, cache_dir=TOKENIZED_CACHE_DIR):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
+        self.cache_dir = Path(cache_dir)
 
     def prepare_author_data(self, author_name):
         """Convert Stoic texts to training format for one author"""
         pairs_file = PROCESSED_DIR / author_name / "neutral_pairs.json"
 
-        with open(pairs_file) as f:
-            data = json.load(f)
-
         training_data = []
-        for pair in data["pairs"]:
+        for pair in read_pairs(pairs_file):
             training_data.append({"text": pair["stoic_text"]})
 
         return training_data
@@ -38,3 +123,61 @@ class LoRADataPrep:
         authors = ["marcus_aurelius", "seneca", "epictetus"]
         for author in authors:
             self.save_training_data(author)
+
+    def example_hashes(self, author_name, source=None):
+        """Per-example hashes, in the same order as tokenized_cache rows."""
+        source = Path(source or self.output_dir / f"{author_name}_train.jsonl")
+        return [example_hash(t) for t in read_texts(source)]
+
+    def tokenized_cache(self, author_name, tokenizer, max_length=512, source=None):
+        """Pre-tokenized corpus for one author, built once and memory-mapped.
+
+        Keyed by tokenizer fingerprint, max_length and the source file's
+        content hash, so repeated trainings and hyperparameter runs skip
+        tokenization entirely, and any change to the data or tokenizer
+        builds a new entry. source defaults to {author}_train.jsonl.
+        """
+        source = Path(source or self.output_dir / f"{author_name}_train.jsonl")
+        key = hashlib.sha256(
+            f"{_tokenizer_fingerprint(tokenizer)}:{max_length}:{_file_hash(source)}".encode()
+        ).hexdigest()[:16]
+        entry = self.cache_dir / author_name / key
+        if (entry / "meta.json").exists():
+            print(f"✓ Tokenized cache hit for {author_name} ({key})")
+            return TokenizedCorpus(entry)
+
+        texts = read_texts(source)
+        encoded = tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+        lengths = [len(ids) for ids in encoded]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        dtype = np.int32 if len(tokenizer) < 2**31 else np.int64
+        tokens = np.fromiter(
+            (t for ids in encoded for t in ids), dtype=dtype, count=int(offsets[-1])
+        )
+
+        # Write to a temp dir and rename, so a crash never leaves a
+        # half-written entry that looks like a cache hit.
+        tmp = entry.with_name(f"{key}.tmp{os.getpid()}")
+        tmp.mkdir(parents=True, exist_ok=True)
+        np.save(tmp / "tokens.npy", tokens)
+        np.save(tmp / "offsets.npy", offsets)
+        with open(tmp / "meta.json", "w") as f:
+            json.dump(
+                {
+                    "author": author_name,
+                    "source": str(source),
+                    "tokenizer": str(getattr(tokenizer, "name_or_path", "")),
+                    "max_length": max_length,
+                    "n_texts": len(encoded),
+                    "n_tokens": int(offsets[-1]),
+                },
+                f,
+                indent=2,
+            )
+        try:
+            tmp.rename(entry)
+        except OSError:
+            shutil.rmtree(tmp)  # another process won the race; use its entry
+        print(f"✅ Cached {len(encoded)} tokenized texts for {author_name} -> {entry}")
+        return TokenizedCorpus(entry)
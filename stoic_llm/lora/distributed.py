@@ -0,0 +1,111 @@
+"""Single-node, multi-process CPU data parallelism for LoRA training.
+
+One PyTorch process does not use a many-core box well: intra-op threading
+flattens out long before the core count, while independent processes each
+running a few threads keep scaling. Here each worker:
+
+    - is pinned to its own contiguous slice of the available cores
+      (os.sched_setaffinity, Linux) and sets torch.set_num_threads to the
+      slice size, so workers never fight over cores;
+    - joins a gloo process group and trains through HF Trainer's DDP path,
+      which shards the data with a DistributedSampler and all-reduces only
+      parameters that require grad — the LoRA factors, not the frozen base.
+
+Every worker holds its own copy of the base, so memory grows with the
+worker count.
+
+Usage:
+    trainer = LoRATrainer("1B")
+    report = trainer.train_author_ddp("seneca", num_workers=4)
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+
+
+def available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def worker_cores(rank: int, world_size: int, cores: list[int] | None = None) -> list[int]:
+    """Contiguous core slice for one worker (at least one core, shared if
+    there are more workers than cores)."""
+    cores = available_cores() if cores is None else cores
+    per = len(cores) // world_size
+    if per == 0:
+        return [cores[rank % len(cores)]]
+    return cores[rank * per : (rank + 1) * per]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _worker(rank, world_size, port, cores, model_size, author_name, dirs, train_kwargs, results):
+    import torch
+    import torch.distributed as dist
+
+    mine = worker_cores(rank, world_size, cores)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, mine)
+    torch.set_num_threads(len(mine))
+    os.environ.update(
+        MASTER_ADDR="127.0.0.1",
+        MASTER_PORT=str(port),
+        RANK=str(rank),
+        LOCAL_RANK=str(rank),
+        WORLD_SIZE=str(world_size),
+        LOCAL_WORLD_SIZE=str(world_size),
+        OMP_NUM_THREADS=str(len(mine)),
+    )
+
+    from stoic_llm.lora.trainer import LoRATrainer
+
+    trainer = LoRATrainer(model_size, output_dir=dirs["output_dir"], data_dir=dirs["data_dir"])
+    trainer.data_prep.cache_dir = dirs["cache_dir"]
+    try:
+        report = trainer.train_author(author_name, distributed=True, **train_kwargs)
+        report.update(rank=rank, world_size=world_size, threads=len(mine), cores=mine)
+        results.put((rank, report))
+    finally:
+        if dist.is_initialized():
+            dist.destroy_process_group()
+
+
+def run_data_parallel(
+    model_size,
+    author_name,
+    num_workers,
+    output_dir,
+    data_dir,
+    cache_dir,
+    cores=None,
+    **train_kwargs,
+):
+    """Spawn num_workers training processes; returns their reports by rank."""
+    import torch.multiprocessing as mp
+
+    cores = available_cores() if cores is None else cores
+    print(
+        f"\n🖥️  {num_workers} gloo workers over {len(cores)} cores "
+        f"({max(1, len(cores) // num_workers)} threads each)"
+    )
+    results = mp.get_context("spawn").SimpleQueue()
+    dirs = {"output_dir": output_dir, "data_dir": data_dir, "cache_dir": cache_dir}
+    mp.spawn(
+        _worker,
+        args=(num_workers, _free_port(), cores, model_size, author_name, dirs, train_kwargs, results),
+        nprocs=num_workers,
+        join=True,
+    )
+    reports = {}
+    while not results.empty():
+        rank, report = results.get()
+        reports[rank] = report
+    return [reports[r] for r in sorted(reports)]
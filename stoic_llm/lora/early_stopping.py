@@ -0,0 +1,171 @@
+"""Dilemma-based early stopping for LoRA training.
+
+Adapters trained a fixed 3 epochs and were only judged afterwards by a
+separate LoRADilemmaEval run that reloaded the base and merged the adapter.
+This callback runs the same forced-choice measurement DURING training, on
+the in-memory PeftModel (no merge, no reload):
+
+    every eval_steps    P(stoic) on a fixed held-out dilemma subset, both
+                        option orders, batched (DilemmaEval._p_stoic_batch)
+    baseline            the same subset with the adapter disabled, computed
+                        once at train start and cached
+    log                 mean ΔP(stoic) and mean Δlog-odds vs the baseline
+    stop                when the metric has not improved by min_delta for
+                        `patience` evaluations; optionally roll the adapter
+                        back to its best evaluation
+
+The subset is sampled from dilemmas_path, by default the same set the
+final LoRA dilemma eval reports on. Its ids are recorded in summary()
+(and so in training_report.json), and LoRADilemmaEval drops them from
+the final eval so the checkpoint is never chosen on the reported items.
+Pass a separate held-out file as dilemmas_path to avoid the overlap
+altogether.
+
+Usage:
+    trainer.train_author("seneca", early_stopping={"eval_steps": 25})
+    # or directly:
+    Trainer(..., callbacks=[DilemmaEarlyStopping(tokenizer, eval_steps=25)])
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import torch
+from transformers import TrainerCallback
+
+from stoic_llm.eval.dilemma import DILEMMAS_PATH, DilemmaEval
+
+
+class DilemmaEarlyStopping(TrainerCallback):
+    """Forced-choice dilemma eval every N steps; stop when it plateaus."""
+
+    METRICS = ("mean_delta_logit", "mean_delta")
+
+    def __init__(
+        self,
+        tokenizer,
+        dilemmas_path=DILEMMAS_PATH,
+        eval_steps=50,
+        n_items=24,
+        batch_size=8,
+        patience=3,
+        min_delta=0.01,
+        metric="mean_delta_logit",
+        restore_best=True,
+        seed=0,
+    ):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Choose from: {list(self.METRICS)}")
+        self.tokenizer = tokenizer
+        self.dilemmas_path = dilemmas_path
+        self.eval_steps = eval_steps
+        self.n_items = n_items
+        self.batch_size = batch_size
+        self.patience = patience
+        self.min_delta = min_delta
+        self.metric = metric
+        self.restore_best = restore_best
+        self.seed = seed
+
+        self.history: list[dict] = []
+        self.best: dict | None = None
+        self.stopped_step: int | None = None
+        self._evaluator = None
+        self._items: list[dict] = []
+        self._baseline: list[float] = []
+        self._best_state: dict | None = None
+        self._bad_evals = 0
+
+    def _p_stoic(self, model) -> list[float]:
+        was_training = model.training
+        model.eval()
+        try:
+            out = []
+            for start in range(0, len(self._items), self.batch_size):
+                out += self._evaluator._p_stoic_batch(self._items[start : start + self.batch_size])
+            return out
+        finally:
+            model.train(was_training)
+
+    def on_train_begin(self, args, state, control, model=None, **kwargs):
+        self._evaluator = DilemmaEval(model, self.tokenizer, self.dilemmas_path)
+        model.train()  # DilemmaEval.__init__ switches to eval mode
+        dilemmas = self._evaluator.dilemmas
+        k = min(self.n_items, len(dilemmas))
+        self._items = random.Random(self.seed).sample(dilemmas, k)
+
+        # Baseline = base model on the same subset, adapter switched off.
+        disabled = model.disable_adapter() if hasattr(model, "disable_adapter") else nullcontext()
+        with disabled:
+            self._baseline = self._p_stoic(model)
+        print(
+            f"  Dilemma early stopping: {k} held-out items every {self.eval_steps} steps, "
+            f"baseline mean P(stoic) {sum(self._baseline) / k:.3f}"
+        )
+
+    def on_step_end(self, args, state, control, model=None, **kwargs):
+        if state.global_step % self.eval_steps != 0:
+            return control
+        t0 = time.time()
+        p = self._p_stoic(model)
+        logit = self._evaluator._logit
+        deltas = [s - b for s, b in zip(p, self._baseline)]
+        deltas_logit = [logit(s) - logit(b) for s, b in zip(p, self._baseline)]
+        entry = {
+            "step": state.global_step,
+            "epoch": state.epoch,
+            "mean_p_stoic": sum(p) / len(p),
+            "mean_delta": sum(deltas) / len(deltas),
+            "mean_delta_logit": sum(deltas_logit) / len(deltas_logit),
+            "eval_sec": round(time.time() - t0, 2),
+        }
+        self.history.append(entry)
+        state.log_history.append({f"dilemma_{k}": v for k, v in entry.items() if k != "epoch"})
+
+        value = entry[self.metric]
+        if self.best is None or value > self.best[self.metric] + self.min_delta:
+            self.best = entry
+            self._bad_evals = 0
+            if self.restore_best:
+                self._best_state = {
+                    n: prm.detach().clone()
+                    for n, prm in model.named_parameters()
+                    if prm.requires_grad
+                }
+        else:
+            self._bad_evals += 1
+        print(
+            f"  step {state.global_step}: ΔP(stoic) {entry['mean_delta']:+.4f}, "
+            f"Δlog-odds {entry['mean_delta_logit']:+.4f} "
+            f"(best {self.best[self.metric]:+.4f} @ step {self.best['step']}, "
+            f"{self._bad_evals}/{self.patience} without improvement)"
+        )
+        if self._bad_evals >= self.patience:
+            self.stopped_step = state.global_step
+            control.should_training_stop = True
+            print(f"  ⏹ {self.metric} plateaued; stopping at step {state.global_step}")
+        return control
+
+    def on_train_end(self, args, state, control, model=None, **kwargs):
+        if self.restore_best and self._best_state is not None and self.best is not None:
+            if self.history and self.history[-1]["step"] != self.best["step"]:
+                params = dict(model.named_parameters())
+                with torch.no_grad():
+                    for n, value in self._best_state.items():
+                        params[n].copy_(value)
+                print(f"  ↺ restored adapter from step {self.best['step']}")
+        self._best_state = None
+
+    def summary(self) -> dict:
+        return {
+            "metric": self.metric,
+            "heldout_path": str(Path(self.dilemmas_path).resolve()),
+            "heldout_ids": [d["id"] for d in self._items],
+            "best": self.best,
+            "stopped_step": self.stopped_step,
+            "history": self.history,
+        }
@@ -0,0 +1,123 @@
+"""Mixed-adapter batching: a different LoRA adapter per batch row.
+
+S-LoRA/Punica-style serving for our three authors. Every adapter's
+low-rank factors are stacked per target module (q_proj / v_proj), with
+index 0 reserved for the plain base (all-zero factors). A forward hook on
+each target Linear gathers the factors named by each row and applies
+
+    y[b] = W x[b] + B[ids[b]] @ (A[ids[b]] @ x[b])
+
+with two batched matmuls on top of the SHARED base weights. So one forward
+can run baseline + every author on the same prompts, instead of one full
+pass per adapter.
+
+Usage:
+    multi = MultiLoRA(base, {"marcus": "models/lora_marcus_clean", ...})
+    with multi.rows(["base", "marcus", "seneca"]):
+        logits = base(**batch).logits     # row i uses adapter i
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import torch
+
+from stoic_llm.lora.swap import load_lora_factors
+
+BASE = "base"  # reserved row name: no adapter
+
+
+class MultiLoRA:
+    """Stacked LoRA factors for several adapters on one frozen base."""
+
+    def __init__(self, base_model, adapter_dirs: dict | None = None):
+        self.base_model = base_model
+        self.names: list[str] = [BASE]
+        self._factors: dict[str, dict] = {}
+        # module_name -> (A: (n, r, in), B: (n, out, r)); scaling folded into B
+        self._stacks: dict[str, tuple[torch.Tensor, torch.Tensor]] = {}
+        self._row_ids: torch.Tensor | None = None
+        for name, adapter_dir in (adapter_dirs or {}).items():
+            self.add_adapter(name, adapter_dir)
+
+    def add_adapter(self, name: str, adapter_dir) -> None:
+        if name == BASE or name in self._factors:
+            raise ValueError(f"Adapter name {name!r} is reserved or already loaded.")
+        self._factors[name] = load_lora_factors(adapter_dir)
+        self.names.append(name)
+        self._restack()
+
+    def _target(self, module_name: str):
+        """The plain Linear for module_name (unwraps a PEFT LoRA layer)."""
+        module = self.base_model.get_submodule(module_name)
+        return getattr(module, "base_layer", module)
+
+    def _restack(self) -> None:
+        modules = sorted(set().union(*(f.keys() for f in self._factors.values())))
+        self._stacks = {}
+        for module_name in modules:
+            weight = self._target(module_name).weight
+            out_dim, in_dim = weight.shape
+            rank = max(
+                f[module_name]["A"].shape[0]
+                for f in self._factors.values()
+                if module_name in f
+            )
+            # Adapters with a smaller rank (or no factor here) are zero-padded,
+            # which contributes nothing — same as the base row at index 0.
+            A = torch.zeros(len(self.names), rank, in_dim)
+            B = torch.zeros(len(self.names), out_dim, rank)
+            for i, name in enumerate(self.names[1:], 1):
+                f = self._factors[name].get(module_name)
+                if f is None:
+                    continue
+                r = f["A"].shape[0]
+                A[i, :r] = f["A"].float()
+                B[i, :, :r] = f["B"].float() * f["scaling"]
+            self._stacks[module_name] = (
+                A.to(device=weight.device, dtype=weight.dtype),
+                B.to(device=weight.device, dtype=weight.dtype),
+            )
+
+    def _make_hook(self, module_name: str):
+        A, B = self._stacks[module_name]
+
+        def hook(_module, inputs, output):
+            ids = self._row_ids
+            x = inputs[0]
+            if ids.shape[0] != x.shape[0]:
+                raise ValueError(
+                    f"{len(ids)} adapter rows set but batch has {x.shape[0]} rows."
+                )
+            low = torch.bmm(x, A[ids].transpose(1, 2))  # (batch, seq, r)
+            return output + torch.bmm(low, B[ids].transpose(1, 2))
+
+        return hook
+
+    @contextmanager
+    def rows(self, adapter_names: list[str]):
+        """Attach the per-row adapters for the duration of the block.
+
+        adapter_names[i] is the adapter for batch row i ("base" = none).
+        """
+        unknown = set(adapter_names) - set(self.names)
+        if unknown:
+            raise KeyError(f"Unknown adapters {sorted(unknown)}. Have: {self.names}")
+        device = next(iter(self._stacks.values()))[0].device if self._stacks else "cpu"
+        self._row_ids = torch.tensor(
+            [self.names.index(n) for n in adapter_names], device=device
+        )
+        handles = []
+        try:
+            for module_name in self._stacks:
+                handles.append(
+                    self._target(module_name).register_forward_hook(
+                        self._make_hook(module_name)
+                    )
+                )
+            yield self.base_model
+        finally:
+            for h in handles:
+                h.remove()
+            self._row_ids = None
@@ -0,0 +1,336 @@
+"""Train several LoRA adapters at once on one shared frozen base.
+
+Every adapter only trains r-rank factors on q_proj / v_proj, so training
+authors (or rank / alpha variants of one author) one after another repeats
+the same frozen-base forward and backward N times. Here each batch holds
+rows for every adapter, tagged with an adapter id, and a forward hook on
+each target Linear adds only that row's own adapter:
+
+    y[b] = W x[b] + scaling_k * B_k @ (A_k @ x[b])     k = adapter_ids[b]
+
+The loss is the sum of each adapter's own mean token loss. Rows never
+interact (the base is frozen and attention is per row), so one backward
+gives every adapter exactly the gradient it would get training alone. Each
+adapter then steps its own AdamW + linear schedule and writes its own
+PEFT-format checkpoints, loadable by LoRARunner / AdapterSwapper / PeftModel.
+
+Usage:
+    trainer = MultiLoRATrainer("1B")
+    trainer.train_adapters({
+        "seneca_r8":  {"author": "seneca", "r": 8},
+        "seneca_r16": {"author": "seneca", "r": 16, "lora_alpha": 64},
+        "epictetus":  {"author": "epictetus"},
+    })
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import shutil
+import time
+from contextlib import contextmanager
+
+import torch
+import torch.nn.functional as F
+
+from stoic_llm.lora.swap import LORA_A_SUFFIX, LORA_B_SUFFIX
+from stoic_llm.lora.trainer import LoRATrainer, peak_rss_mb
+
+
+class MultiLoRATrainer(LoRATrainer):
+    """Concurrent LoRA training: one frozen base, per-row adapter tags."""
+
+    def _adapter_specs(self, adapters, learning_rate):
+        """Normalize adapters (author list or {name: spec}) to full specs."""
+        if not isinstance(adapters, dict):
+            adapters = {author: {} for author in adapters}
+        base = self._get_lora_config()
+        specs = {}
+        for name, spec in adapters.items():
+            spec = dict(spec)
+            specs[name] = {
+                "author": spec.pop("author", name),
+                "r": spec.pop("r", base.r),
+                "lora_alpha": spec.pop("lora_alpha", base.lora_alpha),
+                "lora_dropout": spec.pop("lora_dropout", base.lora_dropout),
+                "target_modules": sorted(spec.pop("target_modules", base.target_modules)),
+                "learning_rate": spec.pop("learning_rate", learning_rate),
+            }
+            if spec:
+                raise ValueError(f"Unknown options for adapter {name!r}: {sorted(spec)}")
+        return specs
+
+    @staticmethod
+    def _init_factors(model, spec, seed):
+        """Fresh trainable factors, initialized like PEFT (kaiming A, zero B)."""
+        torch.manual_seed(seed)
+        factors = {}
+        for module_name, module in model.named_modules():
+            if not isinstance(module, torch.nn.Linear):
+                continue
+            if module_name.rsplit(".", 1)[-1] not in spec["target_modules"]:
+                continue
+            out_dim, in_dim = module.weight.shape
+            device = module.weight.device
+            A = torch.empty(spec["r"], in_dim, device=device)
+            torch.nn.init.kaiming_uniform_(A, a=math.sqrt(5))
+            B = torch.zeros(out_dim, spec["r"], device=device)
+            factors[module_name] = {
+                "A": torch.nn.Parameter(A),
+                "B": torch.nn.Parameter(B),
+            }
+        if not factors:
+            raise ValueError(f"No Linear modules match {spec['target_modules']}.")
+        return factors
+
+    @contextmanager
+    def _hooked(self, model, specs, factors, state):
+        """Attach the per-row adapter hooks; state["groups"] holds, per step,
+        [(adapter_name, row_index_tensor)] for the current batch."""
+
+        def make_hook(module_name):
+            def hook(_module, inputs, output):
+                x = inputs[0]
+                for name, rows in state["groups"]:
+                    f = factors[name].get(module_name)
+                    if f is None:
+                        continue
+                    spec = specs[name]
+                    xs = x.index_select(0, rows).to(f["A"].dtype)
+                    xs = F.dropout(xs, spec["lora_dropout"], training=state["training"])
+                    part = (xs @ f["A"].T) @ f["B"].T * (spec["lora_alpha"] / spec["r"])
+                    output = output.index_add(0, rows, part.to(output.dtype))
+                return output
+
+            return hook
+
+        module_names = sorted(set().union(*(f.keys() for f in factors.values())))
+        handles = [
+            model.get_submodule(m).register_forward_hook(make_hook(m)) for m in module_names
+        ]
+        try:
+            yield
+        finally:
+            for h in handles:
+                h.remove()
+
+    def _collate(self, rows, device):
+        """Right-pad tagged rows [(adapter_id, token_ids)] into one batch."""
+        longest = max(len(ids) for _, ids in rows)
+        pad_id = self.tokenizer.pad_token_id
+        input_ids = torch.full((len(rows), longest), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(rows), longest), dtype=torch.long)
+        for i, (_, ids) in enumerate(rows):
+            input_ids[i, : len(ids)] = torch.as_tensor(ids, dtype=torch.long)
+            attention_mask[i, : len(ids)] = 1
+        labels = input_ids.masked_fill(attention_mask == 0, -100)
+        adapter_ids = torch.tensor([k for k, _ in rows])
+        return {
+            "input_ids": input_ids.to(device),
+            "attention_mask": attention_mask.to(device),
+            "labels": labels.to(device),
+            "adapter_ids": adapter_ids.to(device),
+        }
+
+    @staticmethod
+    def _batches(n_items, batch_size, epochs, seed):
+        """Shuffled index batches over `epochs` passes of one adapter's data."""
+        for epoch in range(epochs):
+            gen = torch.Generator().manual_seed(seed + epoch)
+            order = torch.randperm(n_items, generator=gen).tolist()
+            for start in range(0, n_items, batch_size):
+                yield order[start : start + batch_size]
+
+    def _save_adapter(self, out_dir, spec, factors):
+        """Write factors in PEFT's adapter format (adapter_config + safetensors)."""
+        from peft import LoraConfig
+        from safetensors.torch import save_file
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        LoraConfig(
+            r=spec["r"],
+            lora_alpha=spec["lora_alpha"],
+            target_modules=spec["target_modules"],
+            lora_dropout=spec["lora_dropout"],
+            bias="none",
+            task_type="CAUSAL_LM",
+            base_model_name_or_path=self.model_name,
+        ).save_pretrained(str(out_dir))
+        state = {}
+        for module_name, f in factors.items():
+            prefix = f"base_model.model.{module_name}"
+            state[prefix + LORA_A_SUFFIX] = f["A"].detach().cpu().contiguous()
+            state[prefix + LORA_B_SUFFIX] = f["B"].detach().cpu().contiguous()
+        save_file(state, str(out_dir / "adapter_model.safetensors"), metadata={"format": "pt"})
+
+    def _checkpoint(self, name, spec, factors, optimizer, scheduler, step, save_total_limit):
+        ckpt_dir = self.output_dir / name / f"checkpoint-{step}"
+        self._save_adapter(ckpt_dir, spec, factors)
+        torch.save(optimizer.state_dict(), ckpt_dir / "optimizer.pt")
+        torch.save(scheduler.state_dict(), ckpt_dir / "scheduler.pt")
+        with open(ckpt_dir / "trainer_state.json", "w") as f:
+            json.dump({"global_step": step, "adapter": name, **spec}, f, indent=2)
+
+        old = sorted(
+            (self.output_dir / name).glob("checkpoint-*"),
+            key=lambda p: int(p.name.split("-")[-1]),
+        )
+        for stale in old[:-save_total_limit]:
+            shutil.rmtree(stale)
+
+    def train_adapters(
+        self,
+        adapters,
+        epochs=3,
+        batch_size=2,
+        learning_rate=2e-4,
+        device="cpu",
+        block_size=512,
+        max_steps=-1,
+        save_steps=50,
+        save_total_limit=2,
+        logging_steps=10,
+        max_grad_norm=1.0,
+        seed=42,
+        base_model=None,
+    ):
+        """Train every adapter concurrently; one forward/backward per step.
+
+        adapters: author names, or {name: spec} where spec may set author,
+        r, lora_alpha, lora_dropout, target_modules and learning_rate
+        (defaults from _get_lora_config). batch_size is rows PER ADAPTER;
+        each adapter runs its own epochs over its own data and leaves the
+        batch when done. Adapters are saved to output_dir/<name>.
+        """
+        specs = self._adapter_specs(adapters, learning_rate)
+        names = list(specs)
+        print(f"\n🏛️ Training {len(names)} LoRA adapters concurrently on {device}: {names}")
+
+        model = base_model if base_model is not None else self._load_base(device)
+        model.requires_grad_(False)
+        model.eval()  # frozen base; LoRA dropout is applied in the hooks
+
+        factors, optimizers, schedulers, streams = {}, {}, {}, {}
+        for k, name in enumerate(names):
+            spec = specs[name]
+            factors[name] = self._init_factors(model, spec, seed + k)
+            params = [p for f in factors[name].values() for p in (f["A"], f["B"])]
+            corpus = self.data_prep.tokenized_cache(
+                spec["author"], self.tokenizer, max_length=block_size
+            )
+            total = math.ceil(len(corpus) / batch_size) * epochs
+            if max_steps > 0:
+                total = min(total, max_steps)
+            optimizers[name] = torch.optim.AdamW(
+                params, lr=spec["learning_rate"], weight_decay=0.0
+            )
+            # Same linear decay as Trainer's default, over this adapter's steps.
+            schedulers[name] = torch.optim.lr_scheduler.LambdaLR(
+                optimizers[name], lambda s, t=total: max(0.0, (t - s) / t)
+            )
+            streams[name] = (corpus, self._batches(len(corpus), batch_size, epochs, seed + k), total)
+            n_params = sum(p.numel() for p in params)
+            print(
+                f"  {name}: author={spec['author']} r={spec['r']} alpha={spec['lora_alpha']} "
+                f"| {len(corpus)} passages, {total} steps, {n_params:,} trainable params"
+            )
+
+        steps = dict.fromkeys(names, 0)
+        losses = {name: [] for name in names}
+        real_tokens = 0
+        state = {"groups": [], "training": True}
+        t0 = time.time()
+        global_step = 0
+
+        with self._hooked(model, specs, factors, state):
+            while True:
+                rows, active = [], []
+                for k, name in enumerate(names):
+                    corpus, stream, total = streams[name]
+                    if steps[name] >= total:
+                        continue
+                    idx = next(stream, None)
+                    if idx is None:
+                        continue
+                    active.append(name)
+                    rows += [(k, corpus.ids(i).tolist()) for i in idx]
+                if not rows:
+                    break
+
+                batch = self._collate(rows, model.device)
+                ids = batch["adapter_ids"]
+                state["groups"] = [
+                    (name, (ids == names.index(name)).nonzero(as_tuple=True)[0])
+                    for name in active
+                ]
+                logits = model(
+                    input_ids=batch["input_ids"], attention_mask=batch["attention_mask"]
+                ).logits
+                token_loss = F.cross_entropy(
+                    logits[:, :-1].float().transpose(1, 2),
+                    batch["labels"][:, 1:],
+                    ignore_index=-100,
+                    reduction="none",
+                )  # (rows, seq - 1)
+                counted = (batch["labels"][:, 1:] != -100).float()
+
+                # Each adapter's loss only touches its own factors, so the
+                # summed backward yields every adapter's solo gradient.
+                step_losses = {}
+                for name, rows_k in state["groups"]:
+                    n_tok = counted[rows_k].sum().clamp(min=1)
+                    step_losses[name] = token_loss[rows_k].sum() / n_tok
+                sum(step_losses.values()).backward()
+
+                for name in active:
+                    params = [p for f in factors[name].values() for p in (f["A"], f["B"])]
+                    torch.nn.utils.clip_grad_norm_(params, max_grad_norm)
+                    optimizers[name].step()
+                    schedulers[name].step()
+                    optimizers[name].zero_grad(set_to_none=True)
+                    steps[name] += 1
+                    losses[name].append(step_losses[name].item())
+                    if steps[name] % save_steps == 0:
+                        self._checkpoint(
+                            name, specs[name], factors[name], optimizers[name],
+                            schedulers[name], steps[name], save_total_limit,
+                        )
+
+                real_tokens += int(batch["attention_mask"].sum())
+                global_step += 1
+                if global_step % logging_steps == 0:
+                    recent = ", ".join(
+                        f"{n}={sum(losses[n][-logging_steps:]) / len(losses[n][-logging_steps:]):.4f}"
+                        for n in active
+                    )
+                    print(f"  step {global_step}: loss {recent}")
+
+        runtime = time.time() - t0
+        reports = {}
+        for name in names:
+            out_dir = self.output_dir / name
+            self._save_adapter(out_dir, specs[name], factors[name])
+            self.tokenizer.save_pretrained(str(out_dir))
+            tail = losses[name][-logging_steps:]
+            reports[name] = {
+                "author": specs[name]["author"],
+                "r": specs[name]["r"],
+                "lora_alpha": specs[name]["lora_alpha"],
+                "steps": steps[name],
+                "final_loss": sum(tail) / len(tail) if tail else float("nan"),
+            }
+            print(f"✅ {name}: {steps[name]} steps, loss {reports[name]['final_loss']:.4f} -> {out_dir}")
+
+        summary = {
+            "adapters": reports,
+            "shared_steps": global_step,
+            "train_runtime": runtime,
+            "tokens_per_sec": real_tokens / runtime if runtime > 0 else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        print(
+            f"  {global_step} shared steps in {runtime:.1f}s, "
+            f"{summary['tokens_per_sec']:.0f} real tokens/sec, peak RSS {summary['peak_rss_mb']:.0f} MB"
+        )
+        return summary
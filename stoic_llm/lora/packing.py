@@ -0,0 +1,106 @@
+"""Sequence packing for LoRA training.
+
+Passages are 300-1000 chars (~70-250 tokens), and
+DataCollatorForLanguageModeling pads every batch to its longest member, so
+a large share of each CPU step is spent on pad tokens. Packing concatenates
+the tokenized passages, EOS-separated, into fixed block_size blocks.
+
+Passages must not attend to each other inside a block, so the collator
+builds a block-diagonal causal mask (additive float, which both the sdpa
+and eager attention paths honor), resets position_ids at each passage, and
+masks the label of each passage's first token (it would otherwise be
+predicted from the previous passage).
+"""
+
+from __future__ import annotations
+
+import random
+
+import torch
+
+PAD_SEGMENT = -1  # segment id of padding at the tail of the last block
+
+
+def pack_sequences(token_lists: list[list[int]], eos_id: int, block_size: int = 512) -> list[dict]:
+    """Concatenate EOS-terminated sequences into block_size blocks.
+
+    A passage longer than the remaining room continues in the next block as
+    a new segment (it cannot attend back across the block boundary). Each
+    block is {"input_ids", "segment_ids", "position_ids"}; only the final
+    block can carry padding (segment PAD_SEGMENT).
+    """
+    blocks, ids, segs, pos = [], [], [], []
+    seg = 0
+    for tokens in token_lists:
+        tokens = list(tokens) + [eos_id]
+        while tokens:
+            room = block_size - len(ids)
+            piece, tokens = tokens[:room], tokens[room:]
+            ids += piece
+            segs += [seg] * len(piece)
+            pos += list(range(len(piece)))
+            seg += 1
+            if len(ids) == block_size:
+                blocks.append({"input_ids": ids, "segment_ids": segs, "position_ids": pos})
+                ids, segs, pos = [], [], []
+    if ids:
+        n_pad = block_size - len(ids)
+        blocks.append(
+            {
+                "input_ids": ids + [eos_id] * n_pad,
+                "segment_ids": segs + [PAD_SEGMENT] * n_pad,
+                "position_ids": pos + [0] * n_pad,
+            }
+        )
+    return blocks
+
+
+class PackedCollator:
+    """Collate packed blocks into per-passage-masked training batches."""
+
+    def __init__(self, dtype: torch.dtype = torch.float32):
+        self.dtype = dtype
+
+    def __call__(self, features: list[dict]) -> dict:
+        input_ids = torch.tensor([f["input_ids"] for f in features])
+        seg = torch.tensor([f["segment_ids"] for f in features])
+        position_ids = torch.tensor([f["position_ids"] for f in features])
+
+        n = input_ids.shape[1]
+        causal = torch.ones(n, n, dtype=torch.bool).tril()
+        same = seg[:, :, None] == seg[:, None, :]
+        allowed = same & causal & (seg != PAD_SEGMENT)[:, None, :]
+        # Pad rows would attend to nothing (NaN softmax); let them see
+        # themselves. Their labels are masked anyway.
+        allowed |= torch.eye(n, dtype=torch.bool)
+        mask = torch.zeros(allowed.shape, dtype=self.dtype)
+        mask.masked_fill_(~allowed, torch.finfo(self.dtype).min)
+
+        labels = input_ids.clone()
+        labels[position_ids == 0] = -100  # passage starts: no in-passage context
+        labels[seg == PAD_SEGMENT] = -100
+        return {
+            "input_ids": input_ids,
+            "attention_mask": mask[:, None],
+            "position_ids": position_ids,
+            "labels": labels,
+        }
+
+
+def pad_fraction_padded(lengths: list[int], batch_size: int, seed: int = 0) -> float:
+    """Pad share under pad-to-longest batching (the unpacked collator),
+    over one shuffled epoch."""
+    order = list(lengths)
+    random.Random(seed).shuffle(order)
+    real = padded = 0
+    for i in range(0, len(order), batch_size):
+        batch = order[i : i + batch_size]
+        real += sum(batch)
+        padded += max(batch) * len(batch)
+    return 1.0 - real / padded if padded else 0.0
+
+
+def pad_fraction_packed(blocks: list[dict]) -> float:
+    total = sum(len(b["segment_ids"]) for b in blocks)
+    pads = sum(s == PAD_SEGMENT for b in blocks for s in b["segment_ids"])
+    return pads / total if total else 0.0
@@ -1,4 +1,7 @@
+import time
 import torch
+from collections import OrderedDict
+from contextlib import nullcontext
 from transformers import AutoModelForCausalLM, AutoTokenizer
 from peft import PeftModel
 from stoic_llm.model import MODELS
@@ -6,7 +9,9 @@ from stoic_llm.config import MODELS_DIR, DEVICE
 
 
 class LoRARunner:
-    def __init__(self, model_size="1B", lora_models_dir=MODELS_DIR):
+    def __init__(
+        self, model_size="1B", lora_models_dir=MODELS_DIR, adapter_budget_mb=256
+    ):
         cfg = MODELS[model_size]
         self.base_model_name = cfg["name"]
         self.lora_models_dir = lora_models_dir / model_size
@@ -22,18 +27,74 @@ class LoRARunner:
 
         self.current_model = None
         self.current_author = None
+        self._multi = None  # MultiLoRA for mixed-author batches, built lazily
+
+        # Adapters loaded into the ONE PeftModel, least recently used first:
+        # author -> adapter bytes. Evicted past adapter_budget_mb.
+        self.adapter_budget_mb = adapter_budget_mb
+        self._adapters = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "switch_ms": 0.0}
+
+    def _adapter_bytes(self, author_name):
+        marker = f".{author_name}."
+        return sum(
+            p.numel() * p.element_size()
+            for n, p in self.current_model.named_parameters()
+            if "lora_" in n and marker in n
+        )
 
     def load_author_model(self, author_name):
-        """Load LoRA adapter for specific author"""
+        """Make author_name the active adapter.
+
+        Loaded adapters stay resident in one PeftModel, so switching back to
+        one is a set_adapter() call, not a disk read. The least recently
+        used adapters are dropped once their total exceeds
+        adapter_budget_mb (the active one is never dropped).
+        """
         if self.current_author == author_name:
+            self._adapters.move_to_end(author_name)
+            self.cache_stats["hits"] += 1
             return
 
-        print(f"Loading LoRA adapter for {author_name}...")
-        lora_path = self.lora_models_dir / author_name
+        t0 = time.perf_counter()
+        if author_name in self._adapters:
+            self.cache_stats["hits"] += 1
+        else:
+            self.cache_stats["misses"] += 1
+            print(f"Loading LoRA adapter for {author_name}...")
+            lora_path = str(self.lora_models_dir / author_name)
+            if self.current_model is None:
+                self.current_model = PeftModel.from_pretrained(
+                    self.base_model, lora_path, adapter_name=author_name
+                )
+            else:
+                self.current_model.load_adapter(lora_path, adapter_name=author_name)
+            self._adapters[author_name] = self._adapter_bytes(author_name)
+            print(f"✅ Loaded {author_name} adapter")
 
-        self.current_model = PeftModel.from_pretrained(self.base_model, str(lora_path))
+        self.current_model.set_adapter(author_name)
         self.current_author = author_name
-        print(f"✅ Loaded {author_name} adapter")
+        self._adapters.move_to_end(author_name)
+
+        budget = self.adapter_budget_mb * 1024 * 1024
+        while sum(self._adapters.values()) > budget and len(self._adapters) > 1:
+            old, _ = self._adapters.popitem(last=False)
+            self.current_model.delete_adapter(old)
+            self.cache_stats["evictions"] += 1
+            print(f"  evicted {old} adapter (budget {self.adapter_budget_mb} MB)")
+        self.cache_stats["switch_ms"] = (time.perf_counter() - t0) * 1000
+
+    def cache_info(self):
+        """Adapter cache state: hit/miss/eviction counts, resident adapters
+        (least recently used first) and their memory."""
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            **self.cache_stats,
+            "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0,
+            "resident": list(self._adapters),
+            "resident_mb": sum(self._adapters.values()) / (1024 * 1024),
+            "budget_mb": self.adapter_budget_mb,
+        }
 
     def generate(
         self,
@@ -58,3 +119,51 @@ class LoRARunner:
 
         generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
         return generated_text
+
+    def generate_mixed(
+        self,
+        author_names,
+        prompts,
+        do_sample=True,
+        temperature=0.7,
+        **generate_kwargs,
+    ):
+        """Generate for a batch where each row names its own author.
+
+        author_names[i] is the adapter for prompts[i] ("base" = no adapter).
+        All rows share one generate call on the base weights; the per-row
+        q_proj/v_proj deltas are applied by MultiLoRA.
+        """
+        from stoic_llm.lora.multi import MultiLoRA, BASE
+
+        if len(author_names) != len(prompts):
+            raise ValueError("author_names and prompts must have the same length.")
+
+        if self._multi is None:
+            self._multi = MultiLoRA(self.base_model)
+        for author in dict.fromkeys(author_names):
+            if author != BASE and author not in self._multi.names:
+                self._multi.add_adapter(author, self.lora_models_dir / author)
+
+        inputs = self.tokenizer(
+            prompts, return_tensors="pt", padding=True, padding_side="left"
+        )
+
+        gen = {"do_sample": do_sample}
+        if do_sample:
+            gen["temperature"] = temperature
+
+        gen.setdefault("max_new_tokens", 150)
+        gen.update(generate_kwargs)
+
+        # A single-author PeftModel wraps the same base modules; switch its
+        # adapter off so only the per-row deltas apply.
+        peft_off = (
+            self.current_model.disable_adapter()
+            if isinstance(self.current_model, PeftModel)
+            else nullcontext()
+        )
+        with peft_off, self._multi.rows(list(author_names)) as model:
+            outputs = model.generate(**inputs, **gen)
+
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
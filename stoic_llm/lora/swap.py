@@ -0,0 +1,184 @@
+"""Swap LoRA adapters on ONE resident base model.
+
+Reloading the 3B base per adapter (the old LoRADilemmaEval._merged) re-reads
+the full checkpoint from disk and briefly holds two copies of the weights.
+An adapter is only r=8 factors on q_proj/v_proj, so swapping it should cost
+a few hundred milliseconds, not a model load.
+
+Two modes:
+    "unmerged" — wrap the base in ONE PeftModel, load_adapter() each author,
+                 switch with set_adapter(). Base weights are never touched.
+    "merged"   — add scaling * B @ A into the Linear weights in place, then
+                 unmerge by subtracting the same delta. fp16 rounding means
+                 (W + d) - d != W for a few elements, so merge() records
+                 exactly those elements and unmerge() patches them back. The
+                 restored weights are checked bit-exactly against a digest.
+
+Usage:
+    swapper = AdapterSwapper(base, mode="merged")
+    swapper.register("seneca", "models/lora_seneca_clean")
+    with swapper.applied("seneca"):
+        ...  # swapper.model now carries the adapter
+    # base is bit-identical to before
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import torch
+
+LORA_A_SUFFIX = ".lora_A.weight"
+LORA_B_SUFFIX = ".lora_B.weight"
+
+
+def load_lora_factors(adapter_dir) -> dict[str, dict]:
+    """Read a saved PEFT LoRA adapter without touching any model.
+
+    Returns {module_name: {"A": (r, in), "B": (out, r), "scaling": float}},
+    where module_name is relative to the base model (e.g.
+    "model.layers.3.self_attn.q_proj"), so it resolves with
+    base.get_submodule(module_name).
+    """
+    from peft.utils import load_peft_weights
+
+    adapter_dir = Path(adapter_dir)
+    with open(adapter_dir / "adapter_config.json") as f:
+        cfg = json.load(f)
+    r, alpha = cfg["r"], cfg["lora_alpha"]
+    scaling = alpha / (r**0.5) if cfg.get("use_rslora") else alpha / r
+
+    state = load_peft_weights(str(adapter_dir), device="cpu")
+    factors: dict[str, dict] = {}
+    for key, tensor in state.items():
+        if key.endswith(LORA_A_SUFFIX):
+            name, part = key[: -len(LORA_A_SUFFIX)], "A"
+        elif key.endswith(LORA_B_SUFFIX):
+            name, part = key[: -len(LORA_B_SUFFIX)], "B"
+        else:
+            continue
+        name = name.removeprefix("base_model.model.")
+        factors.setdefault(name, {"scaling": scaling})[part] = tensor
+
+    incomplete = [n for n, f in factors.items() if "A" not in f or "B" not in f]
+    if incomplete:
+        raise ValueError(f"{adapter_dir}: missing A or B factor for {incomplete}")
+    return factors
+
+
+def _digest(weight: torch.Tensor) -> str:
+    """Hash of the raw bytes, so 'restored' means bit-identical, not allclose."""
+    raw = weight.detach().contiguous().view(torch.uint8).cpu().numpy()
+    return hashlib.blake2b(raw.tobytes(), digest_size=16).hexdigest()
+
+
+class AdapterSwapper:
+    """Keep one base model resident and apply adapters to it in turn."""
+
+    def __init__(self, base_model, mode: str = "merged"):
+        if mode not in ("merged", "unmerged"):
+            raise ValueError(f"Unknown mode {mode!r}. Use 'merged' or 'unmerged'.")
+        self.base_model = base_model
+        self.mode = mode
+        self.adapter_dirs: dict[str, str] = {}
+        self._factors: dict[str, dict] = {}  # merged mode: name -> factors
+        self._peft_model = None  # unmerged mode: one PeftModel, many adapters
+        self._merged_state = None  # (name, {module: (digest, idx, orig_vals)})
+
+    @property
+    def model(self):
+        """The model to run forward passes on for the active adapter."""
+        return self._peft_model if self._peft_model is not None else self.base_model
+
+    def register(self, name: str, adapter_dir) -> None:
+        """Load an adapter's low-rank factors (small) once, keyed by name."""
+        t0 = time.time()
+        if self.mode == "merged":
+            self._factors[name] = load_lora_factors(adapter_dir)
+        else:
+            from peft import PeftModel
+
+            if self._peft_model is None:
+                self._peft_model = PeftModel.from_pretrained(
+                    self.base_model, str(adapter_dir), adapter_name=name
+                )
+                self._peft_model.eval()
+            else:
+                self._peft_model.load_adapter(str(adapter_dir), adapter_name=name)
+        self.adapter_dirs[name] = str(adapter_dir)
+        print(f"✓ Registered adapter {name} ({time.time() - t0:.2f}s)")
+
+    # ---- merged mode: in-place merge with exact unmerge ----
+    @torch.no_grad()
+    def merge(self, name: str) -> None:
+        if self._merged_state is not None:
+            raise RuntimeError(
+                f"Adapter {self._merged_state[0]!r} is still merged; unmerge() first."
+            )
+        records = {}
+        for module_name, f in self._factors[name].items():
+            weight = self.base_model.get_submodule(module_name).weight
+            delta = self._delta(f, weight)
+            digest = _digest(weight)
+            original = weight.clone()
+            weight.add_(delta)
+            # Elements where subtracting the delta will NOT round back to the
+            # original. Usually a small fraction; store only those.
+            off = (weight - delta).ne(original).nonzero(as_tuple=True)
+            records[module_name] = (digest, off, original[off])
+            del original
+        self._merged_state = (name, records)
+
+    @torch.no_grad()
+    def unmerge(self) -> None:
+        if self._merged_state is None:
+            return
+        name, records = self._merged_state
+        for module_name, (digest, off, orig_vals) in records.items():
+            weight = self.base_model.get_submodule(module_name).weight
+            weight.sub_(self._delta(self._factors[name][module_name], weight))
+            weight[off] = orig_vals
+            if _digest(weight) != digest:
+                raise RuntimeError(
+                    f"Unmerging {name!r} did not restore {module_name} bit-exactly."
+                )
+        self._merged_state = None
+
+    @staticmethod
+    def _delta(f: dict, weight: torch.Tensor) -> torch.Tensor:
+        # Compute in float32, cast once, so merge and unmerge use the same delta.
+        delta = (f["B"].float() @ f["A"].float()) * f["scaling"]
+        return delta.to(device=weight.device, dtype=weight.dtype)
+
+    # ---- common entry point ----
+    @contextmanager
+    def applied(self, name: str):
+        """Activate one adapter for the duration of the block."""
+        if name not in self.adapter_dirs:
+            raise KeyError(f"Adapter {name!r} not registered. Have: {list(self.adapter_dirs)}")
+        t0 = time.time()
+        if self.mode == "merged":
+            self.merge(name)
+        else:
+            self._peft_model.set_adapter(name)
+        print(f"  {name}: adapter applied in {1000 * (time.time() - t0):.0f} ms")
+        try:
+            yield self.model
+        finally:
+            if self.mode == "merged":
+                self.unmerge()
+
+    @contextmanager
+    def base(self):
+        """Run the pristine base (adapters disabled in unmerged mode)."""
+        if self._merged_state is not None:
+            raise RuntimeError("An adapter is merged; cannot run the base.")
+        if self._peft_model is None:
+            yield self.base_model
+        else:
+            with self._peft_model.disable_adapter():
+                yield self._peft_model
@@ -1,3 +1,7 @@
+import json
+import random
+import resource
+import sys
 import torch
 from transformers import (
     AutoModelForCausalLM,
@@ -6,22 +10,73 @@ from transformers import (
     Trainer,
     DataCollatorForLanguageModeling,
 )
-from peft import LoraConfig, get_peft_model
-from datasets import load_dataset
+from peft import LoraConfig, PeftModel, get_peft_model
+from datasets import Dataset
 from stoic_llm.model import MODELS
+from stoic_llm.lora.data_prep import LoRADataPrep, dataset_version
+from stoic_llm.lora.packing import (
+    PackedCollator,
+    pack_sequences,
+    pad_fraction_packed,
+    pad_fraction_padded,
+)
+from stoic_llm.lora.swap import _digest
 from stoic_llm.config import MODELS_DIR, LORA_TRAINING_DIR, DEVICE
 
+DATASET_MANIFEST = "dataset_manifest.json"
+
+
+# Named training profiles. dtype None keeps the model's configured dtype.
+# "low_memory" is for 3B on CPU: bf16 weights (half of float32, without
+# float16's overflow) under CPU bf16 autocast, recomputed decoder
+# activations in backward, and 8-bit optimizer state.
+TRAINING_PROFILES = {
+    "default": {
+        "dtype": None,
+        "bf16": False,
+        "gradient_checkpointing": False,
+        "optim": "adamw_torch",
+    },
+    "low_memory": {
+        "dtype": torch.bfloat16,
+        "bf16": True,
+        "gradient_checkpointing": True,
+        "optim": "adamw_bnb_8bit",
+    },
+}
+
+
+def _resolve_optim(optim):
+    """bitsandbytes optimizers are optional; fall back to Adafactor, whose
+    factored second moments are the closest low-memory state in torch."""
+    if "bnb" in optim or optim.startswith("paged"):
+        try:
+            import bitsandbytes  # noqa: F401
+        except ImportError:
+            print(f"  bitsandbytes not installed; using adafactor instead of {optim}")
+            return "adafactor"
+    return optim
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
 
 class LoRATrainer:
     def __init__(
         self, model_size="1B", output_dir=MODELS_DIR, data_dir=LORA_TRAINING_DIR
     ):
         cfg = MODELS[model_size]
+        self.model_size = model_size
         self.model_name = cfg["name"]
         self.model_dtype = cfg["dtype"]
         self.output_dir = output_dir
         self.data_dir = data_dir
         self.output_dir.mkdir(exist_ok=True, parents=True)
+        self.data_prep = LoRADataPrep(output_dir=data_dir)
 
         print(f"Loading model: {self.model_name} ({model_size})")
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
@@ -38,68 +93,306 @@ class LoRATrainer:
             task_type="CAUSAL_LM",
         )
 
+    def _load_base(self, device="cpu", profile="default"):
+        dtype = TRAINING_PROFILES[profile]["dtype"] or self.model_dtype
+        return AutoModelForCausalLM.from_pretrained(
+            self.model_name,
+            torch_dtype=dtype,
+        ).to(device)
+
+    def _select_examples(self, author_dir, hashes, incremental, replay_fraction, seed=42):
+        """Row indices to train on, plus the manifest entry for this run.
+
+        Fresh runs use every row. Incremental runs use rows whose hash is
+        not in the adapter's manifest, plus replay_fraction of the old rows
+        still in the data (so the adapter keeps rehearsing them).
+        """
+        manifest_path = author_dir / DATASET_MANIFEST
+        previous = None
+        if incremental:
+            if not (author_dir / "adapter_config.json").exists():
+                raise FileNotFoundError(f"No adapter to continue from in {author_dir}")
+            if not manifest_path.exists():
+                raise FileNotFoundError(
+                    f"{manifest_path} missing: train once with incremental=False first"
+                )
+            with open(manifest_path) as f:
+                previous = json.load(f)
+
+        seen = set(previous["example_hashes"]) if previous else set()
+        new = [i for i, h in enumerate(hashes) if h not in seen]
+        old = [i for i, h in enumerate(hashes) if h in seen]
+        n_replay = round(replay_fraction * len(old)) if new else 0
+        replay = sorted(random.Random(seed).sample(old, n_replay))
+        removed = len(seen - set(hashes))
+        if removed:
+            # LoRA cannot unlearn; flag it so a full retrain can be scheduled.
+            print(f"  ⚠️ {removed} previously trained examples are no longer in the data")
+
+        run = {
+            "dataset_version": dataset_version(hashes),
+            "incremental": incremental,
+            "from_version": previous["dataset_version"] if previous else None,
+            "new_examples": len(new),
+            "replayed_examples": len(replay),
+            "removed_examples": removed,
+        }
+        manifest = {
+            "dataset_version": run["dataset_version"],
+            "example_hashes": sorted(seen | set(hashes)),
+            "history": (previous["history"] if previous else []) + [run],
+        }
+        return sorted(new + replay), run, manifest
+
     def train_author(
-        self, author_name, epochs=3, batch_size=2, learning_rate=2e-4, device="cpu"
+        self,
+        author_name,
+        epochs=3,
+        batch_size=2,
+        learning_rate=2e-4,
+        device="cpu",
+        packed=False,
+        block_size=512,
+        max_steps=-1,
+        base_model=None,
+        distributed=False,
+        profile="default",
+        early_stopping=None,
+        incremental=False,
+        replay_fraction=0.1,
     ):
-        """Train LoRA adapter for one author"""
-        print(f"\n🏛️ Training LoRA for {author_name} on {device}...")
+        """Train LoRA adapter for one author.
 
-        model = AutoModelForCausalLM.from_pretrained(
-            self.model_name,
-            torch_dtype=self.model_dtype,
-        ).to(device)
+        base_model: an already-loaded base to attach the adapter to. The
+        adapter is removed again after saving (unload, no merge) and the
+        base weights are checked to be bit-identical, so the same base can
+        train the next author. None loads a fresh base for this call.
+
+        packed=True concatenates passages into block_size blocks with
+        per-passage attention masking (see stoic_llm.lora.packing) instead
+        of padding every batch to its longest passage.
 
-        lora_config = self._get_lora_config()
-        model = get_peft_model(model, lora_config)
+        distributed=True runs as one rank of a gloo data-parallel job (the
+        process group env is set by stoic_llm.lora.distributed); use
+        train_author_ddp() rather than setting it directly.
 
-        print("Trainable parameters:")
-        model.print_trainable_parameters()
+        profile: a TRAINING_PROFILES name ("default", "low_memory"). The
+        report records the profile, peak RSS and mean step time, and is
+        saved next to the adapter as training_report.json.
 
-        data_file = self.data_dir / f"{author_name}_train.jsonl"
-        dataset = load_dataset("json", data_files=str(data_file))
+        early_stopping: kwargs for DilemmaEarlyStopping (e.g.
+        {"eval_steps": 25, "patience": 3}) to evaluate held-out dilemmas
+        during training and stop on a plateau; epochs becomes a cap.
 
-        def tokenize(examples):
-            return self.tokenizer(
-                examples["text"],
-                truncation=True,
-                max_length=512,
+        incremental=True continues from the adapter already saved for this
+        author and trains only on examples whose hash it has not seen, plus
+        replay_fraction of the old examples. The adapter dir's
+        dataset_manifest.json records the example hashes and the dataset
+        version each run trained on.
+        """
+        if profile not in TRAINING_PROFILES:
+            raise ValueError(
+                f"Unknown profile '{profile}'. Choose from: {list(TRAINING_PROFILES)}"
             )
+        prof = TRAINING_PROFILES[profile]
+        print(f"\n🏛️ Training LoRA for {author_name} on {device} ({profile} profile)...")
 
-        tokenized_dataset = dataset.map(tokenize, batched=True, remove_columns=["text"])
+        author_output_dir = self.output_dir / author_name
 
-        data_collator = DataCollatorForLanguageModeling(
-            tokenizer=self.tokenizer, mlm=False
+        # Pre-tokenized, memory-mapped; only tokenizes on the first run for
+        # this (tokenizer, max_length, data file).
+        corpus = self.data_prep.tokenized_cache(
+            author_name, self.tokenizer, max_length=block_size
         )
-
-        author_output_dir = self.output_dir / author_name
-        training_args = TrainingArguments(
-            output_dir=str(author_output_dir),
-            num_train_epochs=epochs,
-            per_device_train_batch_size=batch_size,
-            save_steps=50,
-            logging_steps=10,
-            learning_rate=learning_rate,
-            save_total_limit=2,
-            fp16=False,
-            report_to="none",
+        indices, run, manifest = self._select_examples(
+            author_output_dir,
+            self.data_prep.example_hashes(author_name),
+            incremental,
+            replay_fraction,
+        )
+        print(
+            f"  dataset {run['dataset_version']}: {len(indices)} of {len(corpus)} examples "
+            f"({run['new_examples']} new, {run['replayed_examples']} replayed)"
         )
+        if not indices:
+            print(f"✓ {author_name} adapter already covers dataset {run['dataset_version']}")
+            return {"profile": profile, "skipped": True, **run}
+
+        shared = base_model is not None
+        model = base_model if shared else self._load_base(device, profile)
+        if shared:
+            base_digests = {n: _digest(p) for n, p in model.named_parameters()}
+
+        try:
+            if incremental:
+                model = PeftModel.from_pretrained(model, str(author_output_dir), is_trainable=True)
+            else:
+                model = get_peft_model(model, self._get_lora_config())
+
+            print("Trainable parameters:")
+            model.print_trainable_parameters()
+
+            all_lengths = corpus.lengths
+            lengths = [int(all_lengths[i]) for i in indices]
+            real_tokens = sum(lengths)
+
+            if packed:
+                blocks = pack_sequences(
+                    (corpus.ids(i).tolist() for i in indices),
+                    eos_id=self.tokenizer.eos_token_id,
+                    block_size=block_size,
+                )
+                train_dataset = Dataset.from_list(blocks)
+                data_collator = PackedCollator(dtype=model.dtype)
+                pad_fraction = pad_fraction_packed(blocks)
+                real_tokens += len(lengths)  # one EOS separator per passage
+            else:
+                train_dataset = (
+                    corpus if len(indices) == len(corpus) else torch.utils.data.Subset(corpus, indices)
+                )
+                data_collator = DataCollatorForLanguageModeling(
+                    tokenizer=self.tokenizer, mlm=False
+                )
+                pad_fraction = pad_fraction_padded(lengths, batch_size)
+
+            training_args = TrainingArguments(
+                output_dir=str(author_output_dir),
+                num_train_epochs=epochs,
+                max_steps=max_steps,
+                per_device_train_batch_size=batch_size,
+                save_steps=50,
+                logging_steps=10,
+                learning_rate=learning_rate,
+                save_total_limit=2,
+                fp16=False,
+                bf16=prof["bf16"],
+                gradient_checkpointing=prof["gradient_checkpointing"],
+                # non-reentrant checkpointing works with a frozen base (inputs
+                # that don't require grad) without enable_input_require_grads
+                gradient_checkpointing_kwargs={"use_reentrant": False},
+                optim=_resolve_optim(prof["optim"]),
+                report_to="none",
+                # packed blocks carry segment_ids, which the collator consumes
+                remove_unused_columns=not packed,
+                # Only the LoRA factors require grad, so DDP all-reduces adapter
+                # gradients and nothing from the frozen base.
+                ddp_backend="gloo" if distributed else None,
+                ddp_find_unused_parameters=False if distributed else None,
+                # gloo DDP and CPU bf16 autocast both need the CPU accelerator state
+                use_cpu=device == "cpu" and (distributed or prof["bf16"]),
+            )
+
+            callbacks = []
+            if early_stopping is not None:
+                from stoic_llm.lora.early_stopping import DilemmaEarlyStopping
 
-        trainer = Trainer(
-            model=model,
-            args=training_args,
-            train_dataset=tokenized_dataset["train"],
-            data_collator=data_collator,
+                stopper = DilemmaEarlyStopping(self.tokenizer, **early_stopping)
+                callbacks.append(stopper)
+
+            trainer = Trainer(
+                model=model,
+                args=training_args,
+                train_dataset=train_dataset,
+                data_collator=data_collator,
+                callbacks=callbacks,
+            )
+
+            print(f"Starting training for {author_name}...")
+            result = trainer.train()
+            metrics = result.metrics
+
+            if trainer.is_world_process_zero():
+                model.save_pretrained(str(author_output_dir))
+                self.tokenizer.save_pretrained(str(author_output_dir))
+                with open(author_output_dir / DATASET_MANIFEST, "w") as f:
+                    json.dump(manifest, f, indent=2)
+        finally:
+            if shared and isinstance(model, PeftModel):
+                # Strip the LoRA layers (no merge) even when training failed,
+                # so the next author starts from the plain base. unload()
+                # leaves peft_config behind, which the next get_peft_model
+                # would treat as an existing adapter.
+                restored = model.unload()
+                if prof["gradient_checkpointing"]:
+                    restored.gradient_checkpointing_disable()
+                if hasattr(restored, "peft_config"):
+                    del restored.peft_config
+
+        # Real (non-pad) tokens per second of training; on a max_steps run
+        # only the fraction of the epoch actually seen counts.
+        epochs_seen = metrics.get("epoch", epochs)
+        if shared:
+            changed = [
+                n for n, p in restored.named_parameters() if _digest(p) != base_digests[n]
+            ]
+            if changed or len(base_digests) != len(dict(restored.named_parameters())):
+                raise RuntimeError(
+                    f"Base weights changed while training {author_name}: {changed[:5]}"
+                )
+            print("  ✓ adapter removed; base weights bit-identical")
+
+        report = {
+            "profile": profile,
+            **run,
+            "packed": packed,
+            "pad_fraction": pad_fraction,
+            "tokens_per_sec": real_tokens * epochs_seen / metrics["train_runtime"],
+            "train_runtime": metrics["train_runtime"],
+            "step_time_sec": metrics["train_runtime"] / max(result.global_step, 1),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if early_stopping is not None:
+            report["early_stopping"] = stopper.summary()
+        print(
+            f"  pad fraction {report['pad_fraction']:.1%}, "
+            f"{report['tokens_per_sec']:.0f} real tokens/sec "
+            f"({'packed' if packed else 'padded'}), {report['step_time_sec']:.2f}s/step, "
+            f"peak RSS {report['peak_rss_mb']:.0f} MB"
         )
+        if trainer.is_world_process_zero():
+            with open(author_output_dir / "training_report.json", "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"✅ LoRA adapter saved to {author_output_dir}")
+        return report
 
-        print(f"Starting training for {author_name}...")
-        trainer.train()
+    def train_author_ddp(self, author_name, num_workers=2, **train_kwargs):
+        """Train one author with num_workers CPU processes (gloo DDP).
 
-        model.save_pretrained(str(author_output_dir))
-        self.tokenizer.save_pretrained(str(author_output_dir))
+        Each worker is pinned to its own slice of cores and sets
+        torch.set_num_threads to match. The tokenized cache is built here
+        first so workers only memory-map it. Returns rank 0's report;
+        its tokens_per_sec is the whole job's throughput (the epoch
+        progress it is computed from is global).
+        """
+        from stoic_llm.lora.distributed import run_data_parallel
 
-        print(f"✅ LoRA adapter saved to {author_output_dir}")
+        self.data_prep.tokenized_cache(
+            author_name, self.tokenizer, max_length=train_kwargs.get("block_size", 512)
+        )
+        reports = run_data_parallel(
+            self.model_size,
+            author_name,
+            num_workers,
+            output_dir=self.output_dir,
+            data_dir=self.data_dir,
+            cache_dir=self.data_prep.cache_dir,
+            **train_kwargs,
+        )
+        return reports[0]
 
-    def train_all_authors(self, device="cpu"):
+    def train_all_authors(self, device="cpu", shared_base=True, **train_kwargs):
+        """Train every author in one process.
+
+        shared_base=True loads the base ONCE and attaches/removes a fresh
+        adapter per author instead of reloading the checkpoint each time.
+        """
+        profile = train_kwargs.get("profile", "default")
+        base = self._load_base(device, profile) if shared_base else None
+        reports = {}
         for author in ["marcus_aurelius", "seneca", "epictetus"]:
-            self.train_author(author, device=device)
+            reports[author] = self.train_author(
+                author, device=device, base_model=base, **train_kwargs
+            )
             print(f"\n{'='*70}\n")
+        print(f"Peak RSS over all authors: {peak_rss_mb():.0f} MB")
+        return reports
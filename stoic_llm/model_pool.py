@@ -0,0 +1,222 @@
+"""Process pool of model workers that share ONE copy of the weights.
+
+Running several scripts side by side (or several DDP-style workers) gives
+each process its own ModelLoader.load(), so N workers hold N copies of
+the model — 12 GB each for the 3B in float32. Here the parent loads the
+model once and moves every parameter and buffer into shared memory
+(module.share_memory()); spawned workers receive the model through
+torch.multiprocessing, which passes shared tensors as handles to the same
+pages, so workers add only their own activations and Python state, not
+another copy of the weights.
+
+Each worker is pinned to its own slice of the cores with a matching
+torch.set_num_threads (as in stoic_llm.lora.distributed), so throughput
+scales with workers instead of threads fighting over cores.
+
+Tasks are module-level functions fn(model, tokenizer, item, **kwargs);
+extract_task, dilemma_task and generate_task cover activation extraction,
+forced-choice dilemma scoring and generation. Hooks a task registers stay
+in its worker, but the weights are shared: a task must never modify them
+in place (no merge_and_unload, no in-place edits of parameters).
+
+Usage:
+    model, tokenizer = ModelLoader("3B").load()
+    with SharedModelPool(model, tokenizer, num_workers=4) as pool:
+        acts = pool.map(extract_task, texts, layers=[8, 12])
+        p = pool.map(dilemma_task, batches, vector=v, layer_idx=8, coefficient=4.0)
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import traceback
+
+from stoic_llm.config import GEN_KWARGS
+from stoic_llm.lora.distributed import available_cores, worker_cores
+
+_worker_cache: dict = {}
+
+
+def _worker(rank, num_workers, cores, model, tokenizer, tasks, results):
+    import torch
+
+    mine = worker_cores(rank, num_workers, cores)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, mine)
+    torch.set_num_threads(len(mine))
+    os.environ["OMP_NUM_THREADS"] = str(len(mine))
+    model.eval()
+    results.put(("ready", rank, {"pid": os.getpid(), "threads": len(mine), "cores": mine}))
+
+    while (job := tasks.get()) is not None:
+        task_id, fn, item, kwargs = job
+        try:
+            with torch.no_grad():
+                out = fn(model, tokenizer, item, **kwargs)
+            results.put(("ok", task_id, out))
+        except Exception:
+            results.put(("error", task_id, f"worker {rank}: {traceback.format_exc()}"))
+
+
+def _cached(key, build):
+    """Per-worker memo for task state (e.g. a DilemmaEval) across tasks."""
+    if key not in _worker_cache:
+        _worker_cache[key] = build()
+    return _worker_cache[key]
+
+
+def _process_memory(pid):
+    """{rss, pss, private} MB from /proc/<pid>/smaps_rollup, or None."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+
+    def mb(*keys):
+        return round(sum(int(fields[k].split()[0]) for k in keys if k in fields) / 1024, 1)
+
+    return {
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "private_mb": mb("Private_Clean", "Private_Dirty"),
+    }
+
+
+class SharedModelPool:
+    """Worker processes running tasks against one shared-memory model."""
+
+    def __init__(self, model, tokenizer, num_workers=None, cores=None, poll_interval=1.0):
+        """
+        Args:
+            model: a CPU model, e.g. from ModelLoader.load(); its weights are
+                moved into shared memory in place
+            num_workers: defaults to one per 4 available cores
+            cores: CPU ids to split between workers (default: all available)
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.cores = available_cores() if cores is None else list(cores)
+        self.num_workers = num_workers or max(1, len(self.cores) // 4)
+        self.poll_interval = poll_interval
+        self.workers: list = []
+        self.info: dict[int, dict] = {}
+        self._ids = itertools.count()
+
+    def start(self):
+        import torch.multiprocessing as mp
+
+        if next(self.model.parameters()).device.type != "cpu":
+            raise ValueError("SharedModelPool needs a CPU model")
+        self.model.share_memory()
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        print(
+            f"\n🖥️  {self.num_workers} model workers over {len(self.cores)} cores "
+            f"({max(1, len(self.cores) // self.num_workers)} threads each), one shared copy of the weights"
+        )
+        for rank in range(self.num_workers):
+            p = ctx.Process(
+                target=_worker,
+                args=(rank, self.num_workers, self.cores, self.model, self.tokenizer, self._tasks, self._results),
+                daemon=True,
+            )
+            p.start()
+            self.workers.append(p)
+        while len(self.info) < self.num_workers:
+            kind, rank, info = self._get()
+            self.info[rank] = info
+        print(f"✓ {self.num_workers} workers ready")
+        return self
+
+    def _get(self):
+        while True:
+            try:
+                return self._results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                dead = [p.pid for p in self.workers if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Model worker(s) {dead} exited unexpectedly")
+
+    def map(self, fn, items, **kwargs):
+        """[fn(model, tokenizer, item, **kwargs) for item in items], run
+        across the workers; results in input order. fn must be a
+        module-level function (it is pickled to the workers)."""
+        ids = []
+        for item in items:
+            task_id = next(self._ids)
+            self._tasks.put((task_id, fn, item, kwargs))
+            ids.append(task_id)
+        out, errors = {}, []
+        # Drain every result of this call before raising, so a failed task
+        # never leaves stale results for the next map().
+        for done in range(1, len(ids) + 1):
+            kind, task_id, value = self._get()
+            if kind == "error":
+                errors.append(value)
+            else:
+                out[task_id] = value
+            print(f"  [{done}/{len(ids)}] tasks done", end="\r")
+        print()
+        if errors:
+            raise RuntimeError(f"{len(errors)} task(s) failed; first:\n{errors[0]}")
+        return [out[i] for i in ids]
+
+    def memory(self):
+        """{"parent": ..., rank: ...} with RSS / PSS / private MB per process
+        (Linux). Shared weights show up in RSS but not in private."""
+        report = {"parent": _process_memory(os.getpid())}
+        for rank, info in sorted(self.info.items()):
+            report[rank] = _process_memory(info["pid"])
+        return report
+
+    def close(self):
+        for _ in self.workers:
+            self._tasks.put(None)
+        for p in self.workers:
+            p.join(timeout=30)
+            if p.is_alive():
+                p.terminate()
+        self.workers, self.info = [], {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---- tasks -----------------------------------------------------------------
+
+
+def extract_task(model, tokenizer, text, layers):
+    """Mean-pooled MLP output per layer for one text ({layer: tensor})."""
+    from stoic_llm.steering.extractor import ActivationExtractor
+
+    return ActivationExtractor(model, tokenizer).extract_activations_multi(text, layers)
+
+
+def dilemma_task(model, tokenizer, dilemmas, vector=None, layer_idx=None, coefficient=0.0):
+    """p_stoic for a batch of dilemmas (one forward, both label orders),
+    optionally steered with coefficient * vector at layer_idx."""
+    from stoic_llm.eval.dilemma import DilemmaEval
+
+    ev = _cached("dilemma_eval", lambda: DilemmaEval(model, tokenizer))
+    try:
+        if vector is not None:
+            ev._register_hook(vector, layer_idx, coefficient)
+        return ev._p_stoic_batch(dilemmas)
+    finally:
+        ev._remove_hook()
+
+
+def generate_task(model, tokenizer, prompt, **gen_kwargs):
+    """Greedy continuation of one prompt (GEN_KWARGS unless overridden)."""
+    inputs = tokenizer(prompt, return_tensors="pt")
+    output = model.generate(
+        **inputs, pad_token_id=tokenizer.pad_token_id, **{**GEN_KWARGS, **gen_kwargs}
+    )
+    return tokenizer.decode(output[0][inputs["input_ids"].shape[1] :], skip_special_tokens=True)
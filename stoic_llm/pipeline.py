@@ -0,0 +1,308 @@
+"""Incremental, content-addressed pipeline runner.
+
+Every stage declares the files it reads and writes. The runner keeps a
+manifest of content hashes and reruns a stage only when it is stale:
+
+    never run        no manifest entry
+    params changed   the stage's params differ from the recorded ones
+    input changed    an input's sha256 differs from the one it last ran on
+    output missing   an output was deleted
+    output modified  an output no longer matches what the stage wrote
+
+Dependencies come from the declarations (a stage that reads a path another
+stage writes runs after it) plus explicit deps. Because staleness is
+decided from content, a rerun upstream stage that writes byte-identical
+outputs does not invalidate anything downstream. Independent stages run
+in parallel in a thread pool; stages naming the same `lock` (e.g. one
+shared model) never overlap.
+
+Usage:
+    p = Pipeline(PIPELINE_MANIFEST)
+    p.add(Stage("chunk:seneca", chunk_fn, inputs=[txt], outputs=[jsonl]))
+    p.add(Stage("pairs:seneca", pairs_fn, inputs=[jsonl], outputs=[pairs]))
+    p.run()                      # everything stale
+    p.run(["pairs:seneca"])      # a target and whatever it needs
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from stoic_llm.config import PROJECT_ROOT
+
+
+class Stage:
+    """One unit of work: fn() reads `inputs` and writes `outputs`."""
+
+    def __init__(
+        self,
+        name,
+        fn,
+        inputs=(),
+        outputs=(),
+        deps=(),
+        params=None,
+        lock=None,
+        always_run=False,
+    ):
+        """
+        Args:
+            fn: callable with no arguments; raise to fail the stage
+            inputs / outputs: files or directories (directories are hashed
+                over every file inside)
+            deps: extra stage names to run first (for non-file inputs)
+            params: JSON-serializable settings; a change makes the stage stale
+            lock: stages with the same lock name never run concurrently
+            always_run: run every time (e.g. a conditional download; its
+                outputs' hashes still decide whether dependents rerun)
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = [Path(p).resolve() for p in inputs]
+        self.outputs = [Path(p).resolve() for p in outputs]
+        self.deps = list(deps)
+        self.params = params or {}
+        self.lock = lock
+        self.always_run = always_run
+
+
+def command(*argv, cwd=PROJECT_ROOT):
+    """Stage fn that runs a script, e.g. command("scripts/run_sweep.py", "1B")."""
+
+    def run():
+        subprocess.run([sys.executable, *map(str, argv)], cwd=cwd, check=True)
+
+    return run
+
+
+class Pipeline:
+    def __init__(self, manifest_path, max_workers=4):
+        self.manifest_path = Path(manifest_path)
+        self.max_workers = max_workers
+        self.stages: dict[str, Stage] = {}
+        self._manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
+
+    def add(self, stage):
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name '{stage.name}'")
+        self.stages[stage.name] = stage
+        return stage
+
+    # ---- manifest + hashing ------------------------------------------------
+
+    def _load_manifest(self):
+        if not self.manifest_path.exists():
+            return {"stages": {}, "file_hashes": {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f, indent=2)
+        tmp.replace(self.manifest_path)
+
+    def _file_hash(self, path):
+        # Re-hash only when size or mtime moved since the last time.
+        st = path.stat()
+        cache = self._manifest["file_hashes"]
+        key = str(path.resolve())
+        with self._manifest_lock:
+            hit = cache.get(key)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while block := f.read(1 << 20):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._manifest_lock:
+            cache[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def content_hash(self, path):
+        """sha256 of a file, of every file under a directory, or None if missing."""
+        path = Path(path)
+        if path.is_file():
+            return self._file_hash(path)
+        if path.is_dir():
+            h = hashlib.sha256()
+            for p in sorted(q for q in path.rglob("*") if q.is_file()):
+                h.update(f"{p.relative_to(path)}\0{self._file_hash(p)}\n".encode())
+            return h.hexdigest()
+        return None
+
+    def _hashes(self, paths):
+        return {str(p): self.content_hash(p) for p in paths}
+
+    # ---- graph -------------------------------------------------------------
+
+    def dependencies(self, name):
+        """Stages that must finish before `name`: explicit deps plus every
+        stage writing a path that `name` reads (or a parent/child of it)."""
+        stage = self.stages[name]
+        deps = set(stage.deps)
+        for other in self.stages.values():
+            if other.name == name:
+                continue
+            for out in other.outputs:
+                for inp in stage.inputs:
+                    if inp == out or out in inp.parents or inp in out.parents:
+                        deps.add(other.name)
+        unknown = deps - set(self.stages)
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {sorted(unknown)}")
+        return deps
+
+    def _graph(self, targets):
+        deps = {name: self.dependencies(name) for name in self.stages}
+        selected, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in selected:
+                selected.add(name)
+                todo.extend(deps[name])
+        # cycle check (Kahn)
+        indegree = {n: len(deps[n] & selected) for n in selected}
+        queue = [n for n, d in indegree.items() if d == 0]
+        seen = 0
+        while queue:
+            n = queue.pop()
+            seen += 1
+            for m in selected:
+                if n in deps[m]:
+                    indegree[m] -= 1
+                    if indegree[m] == 0:
+                        queue.append(m)
+        if seen != len(selected):
+            raise ValueError("Pipeline has a dependency cycle")
+        return {n: deps[n] & selected for n in selected}
+
+    # ---- staleness ---------------------------------------------------------
+
+    def stale_reason(self, name, input_hashes=None):
+        """Why stage `name` must run, or None if it is up to date."""
+        stage = self.stages[name]
+        if stage.always_run:
+            return "always run"
+        entry = self._manifest["stages"].get(name)
+        if entry is None:
+            return "never run"
+        if entry.get("params") != json.loads(json.dumps(stage.params)):
+            return "params changed"
+        input_hashes = input_hashes or self._hashes(stage.inputs)
+        if set(entry["inputs"]) != set(input_hashes) or set(entry["outputs"]) != {
+            str(p) for p in stage.outputs
+        }:
+            return "declared inputs/outputs changed"
+        for path, digest in input_hashes.items():
+            if entry["inputs"].get(path) != digest:
+                return f"input changed: {path}"
+        for path, digest in self._hashes(stage.outputs).items():
+            if digest is None:
+                return f"output missing: {path}"
+            if entry["outputs"].get(path) != digest:
+                return f"output modified: {path}"
+        return None
+
+    # ---- execution ---------------------------------------------------------
+
+    def _execute(self, stage, input_hashes):
+        lock = self._locks.setdefault(stage.lock, threading.Lock()) if stage.lock else None
+        t0 = time.time()
+        if lock:
+            with lock:
+                stage.fn()
+        else:
+            stage.fn()
+        duration = time.time() - t0
+        output_hashes = self._hashes(stage.outputs)
+        missing = [p for p, d in output_hashes.items() if d is None]
+        if missing:
+            raise RuntimeError(f"declared outputs not written: {missing}")
+        with self._manifest_lock:
+            self._manifest["stages"][stage.name] = {
+                "params": json.loads(json.dumps(stage.params)),
+                "inputs": input_hashes,
+                "outputs": output_hashes,
+                "finished_at": datetime.now().isoformat(),
+                "duration_sec": round(duration, 2),
+            }
+            self._save_manifest()
+        return duration
+
+    def run(self, targets=None, force=(), dry_run=False):
+        """Run stale stages among `targets` (default: all) and everything
+        they need. force: stage names to rerun regardless. Returns
+        {stage: "ran" | "fresh" | "failed" | "blocked" | "would run"}.
+        """
+        graph = self._graph(targets or list(self.stages))
+        force = set(force)
+        status: dict[str, str] = {}
+        pending = set(graph)
+        running = {}
+        print(f"Pipeline: {len(graph)} stages, manifest {self.manifest_path}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    deps = graph[name]
+                    if any(status.get(d) in ("failed", "blocked") for d in deps):
+                        status[name] = "blocked"
+                        pending.discard(name)
+                        print(f"  ⊘ {name}: blocked by a failed dependency")
+                        continue
+                    if not all(d in status for d in deps):
+                        continue
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    if dry_run and any(status[d] == "would run" for d in deps):
+                        status[name] = "would run"
+                        print(f"  ▷ {name}: upstream would run")
+                        continue
+                    input_hashes = self._hashes(stage.inputs)
+                    reason = "forced" if name in force else self.stale_reason(name, input_hashes)
+                    if reason is None:
+                        status[name] = "fresh"
+                        print(f"  ↷ {name}: up to date")
+                    elif dry_run:
+                        status[name] = "would run"
+                        print(f"  ▷ {name}: {reason}")
+                    else:
+                        print(f"  ▶ {name}: {reason}")
+                        running[pool.submit(self._execute, stage, input_hashes)] = name
+                if not running:
+                    if pending and not any(
+                        all(d in status for d in graph[n]) for n in pending
+                    ):
+                        raise RuntimeError(f"Pipeline stuck on {sorted(pending)}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        duration = future.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        print(f"  ✗ {name}: {type(e).__name__}: {e}")
+                    else:
+                        status[name] = "ran"
+                        print(f"  ✓ {name} ({duration:.1f}s)")
+
+        if not dry_run:
+            with self._manifest_lock:
+                self._save_manifest()  # keep the file-hash cache from fresh checks
+        counts = {s: sum(1 for v in status.values() if v == s) for s in sorted(set(status.values()))}
+        print("Pipeline done: " + ", ".join(f"{n} {s}" for s, n in counts.items()))
+        return status
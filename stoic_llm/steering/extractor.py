@@ -1,7 +1,13 @@
-import json
+from itertools import islice
 from pathlib import Path
 from contextlib import contextmanager
 import torch
+from stoic_llm.data.store import read_pairs
+
+
+class _EarlyExit(Exception):
+    """Raised from a hook to stop the forward pass once the layer we need
+    has run."""
 
 
 @contextmanager
@@ -31,9 +37,7 @@ class ActivationExtractor:
         self.tokenizer = tokenizer
 
     def load_pairs(self, pairs_file):
-        with open(pairs_file) as f:
-            data = json.load(f)
-        pairs = data["pairs"] if isinstance(data, dict) else data
+        pairs = read_pairs(pairs_file)
         print(f"Loaded {len(pairs)} pairs from {pairs_file}")
         return pairs
 
@@ -74,12 +78,59 @@ class ActivationExtractor:
         """Single-layer convenience wrapper."""
         return self.extract_activations_multi(text, [layer_idx])[layer_idx]
 
-    def compute_layered_steering_vectors(self, pairs_file, layers):
+    def iter_pooled_activations(self, texts, layer_idx, batch_size=16, max_length=512):
+        """
+        Mean-pooled MLP output at layer_idx for a stream of texts, batched.
+
+        The forward pass stops right after layer_idx (the layers above it
+        are never run) and padding is masked out of the mean, so each row
+        matches extract_activations(text, layer_idx). Yields one
+        (batch, hidden_dim) float32 CPU tensor per batch, in input order.
+        """
+        tokenizer = self.tokenizer
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        captured = {}
+
+        def hook_fn(module, inp, out):
+            captured["out"] = out.detach()
+            raise _EarlyExit
+
+        padding_side = tokenizer.padding_side
+        tokenizer.padding_side = "right"
+        texts = iter(texts)
+        handles = []
+        try:
+            with _hooks(handles):
+                handles.append(self._mlp_module(layer_idx).register_forward_hook(hook_fn))
+                while batch := list(islice(texts, batch_size)):
+                    inputs = tokenizer(
+                        batch,
+                        return_tensors="pt",
+                        padding=True,
+                        truncation=True,
+                        max_length=max_length,
+                    ).to(self.model.device)
+                    try:
+                        with torch.no_grad():
+                            self.model(**inputs)
+                    except _EarlyExit:
+                        pass
+                    out = captured.pop("out")
+                    mask = inputs["attention_mask"].unsqueeze(-1).to(out.dtype)
+                    yield ((out * mask).sum(dim=1) / mask.sum(dim=1)).float().cpu()
+        finally:
+            tokenizer.padding_side = padding_side
+
+    def compute_layered_steering_vectors(self, pairs_file, layers, pool=None):
         """
         Compute a steering vector at EACH layer in `layers`, from the same
         contrastive pairs. One forward pass per text (not per text * layer),
         so building all 7 sweep layers costs the same as building one.
 
+        pool: a started SharedModelPool (stoic_llm.model_pool) to spread the
+        forward passes over its workers; the result is the same.
+
         Returns: dict {layer_idx: steering_vector(hidden_dim,)}
         """
         pairs = self.load_pairs(pairs_file)
@@ -89,10 +140,22 @@ class ActivationExtractor:
             f"\nComputing steering vectors at layers {layers} "
             f"from {len(pairs)} pairs..."
         )
-        for i, pair in enumerate(pairs, 1):
+        if pool is not None:
+            from stoic_llm.model_pool import extract_task
+
+            texts = [t for p in pairs for t in (p["stoic_text"], p["neutral_text"])]
+            acts = pool.map(extract_task, texts, layers=layers)
+            activations = zip(acts[0::2], acts[1::2])
+        else:
+            activations = (
+                (
+                    self.extract_activations_multi(pair["stoic_text"], layers),
+                    self.extract_activations_multi(pair["neutral_text"], layers),
+                )
+                for pair in pairs
+            )
+        for i, (stoic, neutral) in enumerate(activations, 1):
             print(f"Processing pair {i}/{len(pairs)}...", end="\r")
-            stoic = self.extract_activations_multi(pair["stoic_text"], layers)
-            neutral = self.extract_activations_multi(pair["neutral_text"], layers)
             for L in layers:
                 diff = stoic[L] - neutral[L]
                 sums[L] = diff if sums[L] is None else sums[L] + diff
@@ -0,0 +1,139 @@
+"""Pick which chunks to pay for neutral rewrites, from their activations.
+
+create_pairs used to sample candidate chunks at random. Here every
+candidate chunk goes through the model once (batched, stopped right after
+the target layer) and is scored by its projection on a steering direction:
+
+    direction   an existing vector file ({layer: vector}) or a bootstrap
+                from a small seed pairs file (mean stoic - neutral)
+    score       <mean-pooled MLP output, unit direction>
+    strategy    "top"  highest projection first (the chunks that carry the
+                       direction most strongly)
+                "mmr"  maximal marginal relevance: trade the projection
+                       against cosine similarity to chunks already picked,
+                       so the selection covers more of the corpus
+
+Only the selected chunks are sent for rewriting, so the vector is built
+from the most informative pairs for the same API budget.
+
+Usage:
+    selector = ChunkSelector(extractor, layer_idx=8, direction=direction)
+    selected = selector.select(chunks, k=63, strategy="mmr", diversity=0.3)
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import torch
+
+STRATEGIES = ("top", "mmr")
+
+
+def load_direction(source, layer_idx, extractor=None):
+    """Steering direction at layer_idx from a vector file (.pt, {layer:
+    vector}) or, bootstrapped, from a pairs file (.json) via extractor."""
+    source = Path(source)
+    if source.suffix == ".pt":
+        loaded = torch.load(source, map_location="cpu", weights_only=True)
+        vector = loaded[layer_idx] if isinstance(loaded, dict) else loaded
+    else:
+        if extractor is None:
+            raise ValueError("Bootstrapping a direction from pairs needs an extractor")
+        vector = extractor.compute_layered_steering_vectors(str(source), [layer_idx])[layer_idx]
+    return vector.float().cpu()
+
+
+class ChunkSelector:
+    def __init__(self, extractor, layer_idx, direction, batch_size=16, max_length=512):
+        self.extractor = extractor
+        self.layer_idx = layer_idx
+        direction = torch.as_tensor(direction, dtype=torch.float32)
+        self.direction = direction / direction.norm()
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    def score(self, chunks):
+        """(projections, pooled activations) for chunks, streamed in batches.
+        Activations are kept as float16 for the diversity step."""
+        scores, feats = [], []
+        texts = (c["text"] for c in chunks)
+        done = 0
+        for pooled in self.extractor.iter_pooled_activations(
+            texts, self.layer_idx, batch_size=self.batch_size, max_length=self.max_length
+        ):
+            scores.append((pooled @ self.direction).numpy())
+            feats.append(pooled.numpy().astype(np.float16))
+            done += len(pooled)
+            print(f"Scored {done}/{len(chunks)} chunks...", end="\r")
+        print()
+        if not scores:
+            return np.zeros(0, dtype=np.float32), np.zeros((0, len(self.direction)), np.float16)
+        return np.concatenate(scores), np.concatenate(feats)
+
+    @staticmethod
+    def rank_mmr(scores, feats, k, diversity=0.3):
+        """Greedy MMR order: argmax (1 - diversity) * relevance - diversity *
+        max cosine similarity to the picks so far. Relevance is the
+        projection min-max scaled to [0, 1]; similarity uses mean-centred
+        activations (raw ones share a large common component)."""
+        n = len(scores)
+        k = min(k, n)
+        if k == 0:
+            return []
+        span = scores.max() - scores.min()
+        relevance = (scores - scores.min()) / span if span > 0 else np.ones(n)
+        x = feats.astype(np.float32)
+        x -= x.mean(axis=0)
+        x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-8
+
+        picked = [int(np.argmax(relevance))]
+        max_sim = x @ x[picked[0]]
+        available = np.ones(n, dtype=bool)
+        available[picked[0]] = False
+        while len(picked) < k:
+            mmr = (1 - diversity) * relevance - diversity * max_sim
+            mmr[~available] = -np.inf
+            i = int(np.argmax(mmr))
+            picked.append(i)
+            available[i] = False
+            max_sim = np.maximum(max_sim, x @ x[i])
+        return picked
+
+    def select(self, chunks, k, strategy="mmr", diversity=0.3):
+        """Score all chunks and return (selected chunks, report)."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'. Choose from: {list(STRATEGIES)}")
+        chunks = list(chunks)
+        scores, feats = self.score(chunks)
+        if strategy == "top":
+            order = [int(i) for i in np.argsort(-scores, kind="stable")[:k]]
+        else:
+            order = self.rank_mmr(scores, feats, k, diversity)
+
+        selected = [chunks[i] for i in order]
+        report = {
+            "layer": self.layer_idx,
+            "strategy": strategy,
+            "diversity": diversity if strategy == "mmr" else None,
+            "k": k,
+            "n_scored": len(chunks),
+            "score_mean_all": float(scores.mean()) if len(scores) else None,
+            "score_mean_selected": float(scores[order].mean()) if order else None,
+            "selected": [
+                {"id": chunks[i]["id"], "rank": r, "score": float(scores[i])}
+                for r, i in enumerate(order, 1)
+            ],
+            "scores": {str(c["id"]): float(s) for c, s in zip(chunks, scores)},
+        }
+        return selected, report
+
+    @staticmethod
+    def save_report(report, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Saved chunk selection ({len(report['selected'])} chunks) to {path}")